@@ -0,0 +1,64 @@
+import statistics
+import time
+from typing import Callable, Dict
+
+import orjson
+
+
+def measure(
+    fn: Callable[[], object], number: int = 1000, repeat: int = 5
+) -> Dict[str, float]:
+    """Time ``fn`` and return per-call statistics in microseconds."""
+    # warm up caches and lazily built serializers
+    for _ in range(min(number, 50)):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "max_us": max(samples),
+    }
+
+
+def report(name: str, stats: Dict[str, float], baseline: Dict[str, float] = None):
+    line = (
+        f"{name:<40} median {stats['median_us']:>10.1f} us"
+        f"  min {stats['min_us']:>10.1f} us"
+    )
+    if baseline:
+        line += f"  x{baseline['median_us'] / stats['median_us']:.2f}"
+    print(line)
+
+
+def webhook_user_event(user_id: str, username: str, realm: str, client_id: str) -> dict:
+    """Keycloak admin event announcing a new user, as the webhook extension posts it."""
+    return {
+        "realmName": realm,
+        "operationType": "CREATE",
+        "resourceType": "USER",
+        "time": int(time.time() * 1000),
+        "authDetails": {
+            "userId": user_id,
+            "username": username,
+            "realmId": realm,
+            "clientId": client_id,
+            "ipAddress": "127.0.0.1",
+        },
+        "representation": orjson.dumps(
+            {
+                "id": user_id,
+                "username": username,
+                "firstName": "Load",
+                "lastName": username,
+                "email": f"{username}@example.com",
+                "enabled": True,
+                "createdTimestamp": int(time.time() * 1000),
+            }
+        ).decode(),
+    }
@@ -0,0 +1,104 @@
+"""Cost of resolving a request's dependencies from the ``Container``.
+
+Every request resolves the authentication service (``JWTAuthMiddleware``), the
+endpoint's service and one unit of work. ``FactoryContainer`` rebuilds the
+previous graph, where the services and the usecases behind them were built per
+request. The infrastructure resources are replaced, nothing connects. Run from
+the repository root:
+
+    python -m benchmarks.dependency_injection
+"""
+
+from dependency_injector import providers
+
+from benchmarks.common import measure, report
+from internal.domains.services import AuthenticationSVC, CommentSVC, PostSVC, UserSVC
+from internal.domains.usecases import (
+    AuthenticationUC,
+    AuthorizationUC,
+    CommentUC,
+    PostUC,
+    UserUC,
+)
+from internal.patterns import Container
+
+
+class FactoryContainer(Container):
+    """The graph before the usecases and services were singletons."""
+
+    post_uc = providers.Factory(PostUC)
+    comment_uc = providers.Factory(CommentUC)
+    user_uc = providers.Factory(UserUC)
+    authentication_uc = providers.Factory(
+        AuthenticationUC,
+        external_authentication_svc=Container.external_authentication_svc,
+    )
+    authorization_uc = providers.Factory(
+        AuthorizationUC,
+        external_authorization_svc=Container.external_rebac_authorization_svc,
+    )
+
+    post_svc = providers.Factory(
+        PostSVC,
+        relational_db_uow_factory=Container.relational_db_uow.provider,
+        post_uc=post_uc,
+        comment_uc=comment_uc,
+        user_uc=user_uc,
+        authorization_uc=authorization_uc,
+    )
+    comment_svc = providers.Factory(
+        CommentSVC,
+        relational_db_uow_factory=Container.relational_db_uow.provider,
+        comment_uc=comment_uc,
+        post_uc=post_uc,
+        user_uc=user_uc,
+        authorization_uc=authorization_uc,
+    )
+    user_svc = providers.Factory(
+        UserSVC,
+        relational_db_uow_factory=Container.relational_db_uow.provider,
+        user_uc=user_uc,
+        post_uc=post_uc,
+        comment_uc=comment_uc,
+        authorization_uc=authorization_uc,
+    )
+    authentication_svc = providers.Factory(
+        AuthenticationSVC,
+        relational_db_uow_factory=Container.relational_db_uow.provider,
+        authentication_uc=authentication_uc,
+        user_uc=user_uc,
+    )
+
+
+def build(container_cls):
+    container = container_cls()
+    # the resources would connect, their instances are opaque to the graph
+    container.relational_db_scoped_session.override(providers.Object(None))
+    container.external_authentication_svc.override(providers.Object(None))
+    container.external_rebac_authorization_svc.override(providers.Object(None))
+    return container
+
+
+def request(container):
+    def resolve():
+        container.authentication_svc()
+        container.post_svc()
+        container.relational_db_uow()
+
+    return resolve
+
+
+def main():
+    before, after = build(FactoryContainer), build(Container)
+
+    # the services are shared, the unit of work is not
+    assert after.post_svc() is after.post_svc()
+    assert after.relational_db_uow() is not after.relational_db_uow()
+
+    baseline = measure(request(before), number=20000)
+    report("request: factories", baseline)
+    report("request: singletons", measure(request(after), number=20000), baseline)
+
+
+if __name__ == "__main__":
+    main()
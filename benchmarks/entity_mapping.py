@@ -0,0 +1,100 @@
+"""Cost of mapping a 100 row ``GET /v1/posts`` page from ORM rows to entities.
+
+Compares the previous ``model_validate`` mapping with the validation-free
+``from_trusted`` one of ``PostModelMapper``, alone and as part of the whole list
+page (mapping, resources and encoding), in CPU time and in memory allocated. Run
+from the repository root:
+
+    python -m benchmarks.entity_mapping
+"""
+
+import tracemalloc
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Callable, List
+
+from benchmarks.common import measure, report
+from benchmarks.response_serialization import PAGE_SIZE
+from internal.controllers.http.resources import GetPostResourceV1
+from internal.controllers.responses import DataJSONResponse, DataResponse
+from internal.controllers.responses.success_code import get_post_success
+from internal.domains.entities import PostEntity
+from internal.infrastructures.relational_db.postgres.models import (
+    Post,
+    PostModelMapper,
+)
+
+
+def build_rows() -> List[Post]:
+    now = datetime.now(tz=UTC)
+    owner_id = uuid.uuid4()
+    return [
+        Post(
+            id_=uuid.uuid4(),
+            text_content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+            * 4,
+            created_at=now - timedelta(minutes=idx),
+            updated_at=now,
+            version=idx,
+            comment_count=idx * 3,
+            owner_id=owner_id,
+        )
+        for idx in range(PAGE_SIZE)
+    ]
+
+
+def validate_page(rows: List[Post]) -> List[PostEntity]:
+    return [PostEntity.model_validate(obj=row) for row in rows]
+
+
+def construct_page(rows: List[Post]) -> List[PostEntity]:
+    return [PostModelMapper.to_entity(model=row) for row in rows]
+
+
+def render_page(
+    rows: List[Post], to_entities: Callable[[List[Post]], List[PostEntity]]
+) -> DataJSONResponse:
+    resources = [
+        GetPostResourceV1().from_entity(entity=post) for post in to_entities(rows)
+    ]
+    res = DataResponse(data=resources, count=PAGE_SIZE, message=get_post_success)
+    return DataJSONResponse(status_code=200, content=res)
+
+
+def allocated_kib(fn: Callable[[], object]) -> float:
+    """Peak memory allocated by one call of ``fn``, in KiB."""
+    fn()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    rows = build_rows()
+    assert [post.model_dump() for post in validate_page(rows)] == [
+        post.model_dump() for post in construct_page(rows)
+    ], "mappers disagree"
+    assert (
+        render_page(rows, validate_page).body == render_page(rows, construct_page).body
+    ), "pages disagree"
+
+    cases = [
+        ("mapping", lambda fn: lambda: fn(rows)),
+        ("page", lambda fn: lambda: render_page(rows, fn)),
+    ]
+    for name, bind in cases:
+        old, new = bind(validate_page), bind(construct_page)
+        baseline = measure(old, number=200)
+        report(f"{name}: model_validate", baseline)
+        report(f"{name}: from_trusted", measure(new, number=200), baseline=baseline)
+        print(
+            f"{name}: allocated {allocated_kib(old):.1f} KiB -> "
+            f"{allocated_kib(new):.1f} KiB per page"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Request mix of the load test and per-route latency bookkeeping."""
+
+import hashlib
+import hmac
+import random
+import statistics
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+import orjson
+
+from benchmarks.common import webhook_user_event
+
+WEBHOOK_PATH = "/v1/authentication/webhook/events-synchronization"
+
+# operation -> weight, in requests per 100
+DEFAULT_MIX = {
+    "feed_read": 70,
+    "post_create": 10,
+    "comment_create": 15,
+    "cascade_delete": 5,
+}
+
+# posts that comments are written on, the most recent ones
+MAX_HOT_POSTS = 1024
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    # nearest-rank, as utils.health_utils, whose import would pull the
+    # application's logging setup into the load generator
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(q * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def parse_mix(raw: Optional[str]) -> Dict[str, int]:
+    """``feed_read=70,post_create=10`` -> weights, unknown operations rejected."""
+    if not raw:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in raw.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {name!r}, expected one of {OPERATIONS}"
+            )
+        mix[name] = int(weight)
+    return mix
+
+
+class Recorder:
+    """Latency of every request, by route template, while ``enabled``."""
+
+    def __init__(self):
+        self.enabled = False
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        # operation -> requests that never got a response (timeouts, resets)
+        self.transport_errors: Dict[str, int] = {}
+
+    def record(self, route: str, latency: float, status_code: int):
+        if not self.enabled:
+            return
+        self.latencies.setdefault(route, []).append(latency)
+        statuses = self.statuses.setdefault(route, {})
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+        if status_code >= 400:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def record_transport_error(self, operation: str):
+        if self.enabled:
+            self.transport_errors[operation] = (
+                self.transport_errors.get(operation, 0) + 1
+            )
+
+    def summary(self, elapsed_seconds: float) -> dict:
+        routes = {}
+        every_latency: List[float] = []
+        for route, latencies in sorted(self.latencies.items()):
+            every_latency.extend(latencies)
+            routes[route] = self._stats(
+                latencies=sorted(latencies),
+                errors=self.errors.get(route, 0),
+                elapsed_seconds=elapsed_seconds,
+            )
+            routes[route]["statuses"] = self.statuses[route]
+        return {
+            "transport_errors": self.transport_errors,
+            "routes": routes,
+            "total": self._stats(
+                latencies=sorted(every_latency),
+                errors=sum(self.errors.values()),
+                elapsed_seconds=elapsed_seconds,
+            ),
+        }
+
+    @staticmethod
+    def _stats(latencies: List[float], errors: int, elapsed_seconds: float) -> dict:
+        count = len(latencies)
+        return {
+            "count": count,
+            "errors": errors,
+            "throughput_rps": count / elapsed_seconds if elapsed_seconds else 0.0,
+            "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50_ms": _percentile(latencies, 0.50) * 1000,
+            "p95_ms": _percentile(latencies, 0.95) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+            "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+
+class VirtualUser:
+    """One authenticated user with the posts it owns."""
+
+    def __init__(self, id_: str, username: str, token: str):
+        self.id_ = id_
+        self.username = username
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.posts: Deque[str] = deque()
+
+
+class LoadContext:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, seed: int):
+        self.client = client
+        self.recorder = recorder
+        self.random = random.Random(seed)
+        self.users: List[VirtualUser] = []
+        self.hot_posts: Deque[str] = deque(maxlen=MAX_HOT_POSTS)
+
+    async def request(
+        self,
+        route: str,
+        method: str,
+        url: str,
+        user: Optional[VirtualUser] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(
+            method, url, headers=user.headers if user else None, **kwargs
+        )
+        self.recorder.record(
+            route=route,
+            latency=time.perf_counter() - started,
+            status_code=response.status_code,
+        )
+        return response
+
+
+async def create_user(
+    ctx: LoadContext,
+    mint: Callable[[str, str], str],
+    webhook_secret: str,
+    realm: str,
+    client_id: str,
+) -> VirtualUser:
+    """Register a user the way Keycloak does, through the signed webhook."""
+    user_id = str(uuid.uuid4())
+    username = f"load-{user_id[:8]}"
+    body = orjson.dumps(
+        webhook_user_event(
+            user_id=user_id, username=username, realm=realm, client_id=client_id
+        )
+    )
+    signature = hmac.new(webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+    response = await ctx.client.post(
+        WEBHOOK_PATH,
+        content=body,
+        headers={"Content-Type": "application/json", "X-Keycloak-Signature": signature},
+    )
+    response.raise_for_status()
+    user = VirtualUser(id_=user_id, username=username, token=mint(user_id, username))
+    ctx.users.append(user)
+    return user
+
+
+async def feed_read(ctx: LoadContext, user: VirtualUser):
+    await ctx.request(
+        route="GET /v1/posts",
+        method="GET",
+        url="/v1/posts",
+        user=user,
+        params={"limit": 20, "sort_field": "updated_at", "sort_order": "DESC"},
+    )
+
+
+async def post_create(ctx: LoadContext, user: VirtualUser) -> Optional[str]:
+    response = await ctx.request(
+        route="POST /v1/posts",
+        method="POST",
+        url="/v1/posts",
+        user=user,
+        json={"text_content": f"Load test post {ctx.random.random():.6f} " * 8},
+    )
+    if response.status_code >= 400:
+        return None
+    post_id = response.json()["data"][0]["id_"]
+    user.posts.append(post_id)
+    ctx.hot_posts.append(post_id)
+    return post_id
+
+
+async def comment_create(ctx: LoadContext, user: VirtualUser):
+    if not ctx.hot_posts:
+        await post_create(ctx=ctx, user=user)
+        if not ctx.hot_posts:
+            return
+    await ctx.request(
+        route="POST /v1/comments",
+        method="POST",
+        url="/v1/comments",
+        user=user,
+        json={
+            "text_content": f"Load test comment {ctx.random.random():.6f}",
+            "post_id": ctx.random.choice(ctx.hot_posts),
+        },
+    )
+
+
+async def cascade_delete(ctx: LoadContext, user: VirtualUser):
+    """Delete one of the user's posts, with the comments written on it."""
+    if not user.posts:
+        await post_create(ctx=ctx, user=user)
+        if not user.posts:
+            return
+    post_id = user.posts.popleft()
+    try:
+        ctx.hot_posts.remove(post_id)
+    except ValueError:
+        pass
+    await ctx.request(
+        route="DELETE /v1/posts/{post_id}",
+        method="DELETE",
+        url=f"/v1/posts/{post_id}",
+        user=user,
+    )
+
+
+Operation = Callable[[LoadContext, VirtualUser], Awaitable[object]]
+
+OPERATIONS: Dict[str, Operation] = {
+    "feed_read": feed_read,
+    "post_create": post_create,
+    "comment_create": comment_create,
+    "cascade_delete": cascade_delete,
+}
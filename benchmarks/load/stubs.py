@@ -0,0 +1,228 @@
+"""Local stand-ins for Keycloak and OpenFGA.
+
+Both speak just enough of the real HTTP APIs for the application's clients:
+
+- ``JWKSIssuer`` mints RS256 tokens and its app serves the realm's certs and
+  OpenID configuration, which is all the Keycloak client fetches to validate a
+  token.
+- ``FakeOpenFGA`` keeps relationship tuples in memory and answers checks for
+  the sample authorization model (``authorization_model_versions``): the
+  ``can_*`` relations are granted by a direct tuple or by ``is_owner``.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+import orjson
+import uvicorn
+from jwcrypto import jwk, jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# OpenFGA clients validate both ids as ULIDs
+STORE_ID = "01JBENCHST0RE000000000000A"
+AUTHORIZATION_MODEL_ID = "01JBENCHM0DE1000000000000A"
+
+_GRANTED_BY = ("is_owner", "is_super_admin")
+
+
+def _json(content: object, status_code: int = 200) -> Response:
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+class JWKSIssuer:
+    def __init__(
+        self,
+        base_url: str,
+        realm: str,
+        client_id: str,
+        key_json: Optional[str] = None,
+    ):
+        self.base_url = base_url
+        self.realm = realm
+        self.client_id = client_id
+        if key_json is None:
+            self._key = jwk.JWK.generate(kty="RSA", size=2048, kid=uuid.uuid4().hex)
+        else:
+            self._key = jwk.JWK.from_json(key_json)
+        self._certs = {"keys": [self._key.export_public(as_dict=True)]}
+
+    @property
+    def issuer(self) -> str:
+        return f"{self.base_url}/realms/{self.realm}"
+
+    def export_key(self) -> str:
+        """Private key as JSON, to share the issuer with another process."""
+        return self._key.export_private()
+
+    def mint(self, sub: str, username: str, ttl_seconds: int = 3600) -> str:
+        now = int(time.time())
+        token = jwt.JWT(
+            header={"alg": "RS256", "typ": "JWT", "kid": self._key.key_id},
+            claims={
+                "exp": now + ttl_seconds,
+                "iat": now,
+                "jti": uuid.uuid4().hex,
+                "iss": self.issuer,
+                "aud": "account",
+                "sub": sub,
+                "typ": "Bearer",
+                "azp": self.client_id,
+                "scope": "openid profile email",
+                "preferred_username": username,
+            },
+        )
+        token.make_signed_token(self._key)
+        return token.serialize()
+
+    def app(self) -> Starlette:
+        async def certs(request: Request) -> Response:
+            return _json(self._certs)
+
+        async def well_known(request: Request) -> Response:
+            return _json(
+                {
+                    "issuer": self.issuer,
+                    "jwks_uri": f"{self.issuer}/protocol/openid-connect/certs",
+                    "token_endpoint": f"{self.issuer}/protocol/openid-connect/token",
+                    "id_token_signing_alg_values_supported": ["RS256"],
+                }
+            )
+
+        return Starlette(
+            routes=[
+                Route("/realms/{realm}/protocol/openid-connect/certs", certs),
+                Route("/realms/{realm}/.well-known/openid-configuration", well_known),
+            ]
+        )
+
+
+class FakeOpenFGA:
+    def __init__(self, api_token: str):
+        self._api_token = api_token
+        self._tuples: Set[Tuple[str, str, str]] = set()
+
+    def check(self, user: str, relation: str, object_: str) -> bool:
+        if (user, relation, object_) in self._tuples:
+            return True
+        return relation.startswith("can_") and any(
+            (user, granted_by, object_) in self._tuples for granted_by in _GRANTED_BY
+        )
+
+    @staticmethod
+    def _keys(body: dict, field: str) -> List[Tuple[str, str, str]]:
+        return [
+            (key["user"], key["relation"], key["object"])
+            for key in (body.get(field) or {}).get("tuple_keys", [])
+        ]
+
+    def _authorized(self, request: Request) -> bool:
+        return request.headers.get("authorization") == f"Bearer {self._api_token}"
+
+    def app(self) -> Starlette:
+        async def write(request: Request) -> Response:
+            if not self._authorized(request=request):
+                return _json({"code": "unauthenticated"}, status_code=401)
+            body = orjson.loads(await request.body())
+            self._tuples.update(self._keys(body=body, field="writes"))
+            self._tuples.difference_update(self._keys(body=body, field="deletes"))
+            return _json({})
+
+        async def check(request: Request) -> Response:
+            if not self._authorized(request=request):
+                return _json({"code": "unauthenticated"}, status_code=401)
+            key = orjson.loads(await request.body())["tuple_key"]
+            allowed = self.check(
+                user=key["user"], relation=key["relation"], object_=key["object"]
+            )
+            return _json({"allowed": allowed, "resolution": ""})
+
+        async def batch_check(request: Request) -> Response:
+            if not self._authorized(request=request):
+                return _json({"code": "unauthenticated"}, status_code=401)
+            body = orjson.loads(await request.body())
+            result: Dict[str, dict] = {}
+            for item in body["checks"]:
+                key = item["tuple_key"]
+                result[item["correlation_id"]] = {
+                    "allowed": self.check(
+                        user=key["user"],
+                        relation=key["relation"],
+                        object_=key["object"],
+                    )
+                }
+            return _json({"result": result})
+
+        async def read_authorization_model(request: Request) -> Response:
+            if not self._authorized(request=request):
+                return _json({"code": "unauthenticated"}, status_code=401)
+            return _json(
+                {
+                    "authorization_model": {
+                        "id": request.path_params["model_id"],
+                        "schema_version": "1.1",
+                        "type_definitions": [],
+                    }
+                }
+            )
+
+        return Starlette(
+            routes=[
+                Route("/stores/{store_id}/write", write, methods=["POST"]),
+                Route("/stores/{store_id}/check", check, methods=["POST"]),
+                Route("/stores/{store_id}/batch-check", batch_check, methods=["POST"]),
+                Route(
+                    "/stores/{store_id}/authorization-models/{model_id}",
+                    read_authorization_model,
+                ),
+            ]
+        )
+
+
+async def _serve(apps: List[Tuple[Starlette, int]]):
+    servers = [
+        uvicorn.Server(
+            uvicorn.Config(
+                app=app,
+                host="127.0.0.1",
+                port=port,
+                log_level="warning",
+                lifespan="off",
+            )
+        )
+        for app, port in apps
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def run_stubs(
+    keycloak_port: int,
+    openfga_port: int,
+    realm: str,
+    client_id: str,
+    key_json: str,
+    openfga_token: str,
+):
+    """Serve both stand-ins until the process is terminated.
+
+    Meant to run in its own process, so the stand-ins never compete with the
+    load generator for its event loop.
+    """
+    issuer = JWKSIssuer(
+        base_url=f"http://127.0.0.1:{keycloak_port}",
+        realm=realm,
+        client_id=client_id,
+        key_json=key_json,
+    )
+    openfga = FakeOpenFGA(api_token=openfga_token)
+    asyncio.run(
+        _serve(apps=[(issuer.app(), keycloak_port), (openfga.app(), openfga_port)])
+    )
@@ -0,0 +1,56 @@
+"""Cost of routing a stdlib record (e.g. a SQLAlchemy echo line) to loguru.
+
+Compares the frame-walking InterceptHandler with its fast mode, and fast mode
+with a sampled logger. Records go to a list sink so only the interception is
+measured. The stack here is shallow; the frame walk grows with the depth of the
+logging call. Run from the repository root:
+
+    python -m benchmarks.log_intercept
+"""
+
+import logging
+
+from loguru import logger
+
+from benchmarks.common import measure, report
+from utils.logger_utils import InterceptHandler
+
+STATEMENT = "SELECT posts.id, posts.text_content FROM posts WHERE posts.id = $1::UUID"
+
+
+def bench(handler: InterceptHandler) -> dict:
+    stdlib_logger = logging.getLogger("sqlalchemy.engine.Engine")
+    stdlib_logger.handlers = [handler]
+    stdlib_logger.propagate = False
+    stdlib_logger.setLevel(logging.INFO)
+    return measure(lambda: stdlib_logger.info(STATEMENT), number=5000)
+
+
+def main():
+    captured = []
+    logger.remove()
+    logger.add(lambda message: captured.append(message.record), format="{message}")
+
+    baseline = bench(InterceptHandler(fast=False))
+    report("frame walking", baseline)
+    report("fast", bench(InterceptHandler(fast=True)), baseline=baseline)
+    report(
+        "fast, sqlalchemy.engine sampled at 10%",
+        bench(InterceptHandler(sample_rates={"sqlalchemy.engine": 0.1})),
+        baseline=baseline,
+    )
+
+    # both modes must attribute the record to the same origin
+    captured.clear()
+    for fast in (False, True):
+        handler = InterceptHandler(fast=fast)
+        logging.getLogger("sqlalchemy.engine.Engine").handlers = [handler]
+        logging.getLogger("sqlalchemy.engine.Engine").info(STATEMENT)
+    slow_record, fast_record = captured[-2:]
+    assert fast_record["name"] == "sqlalchemy.engine.Engine"
+    assert fast_record["file"].name == slow_record["file"].name
+    assert fast_record["line"] == slow_record["line"]
+
+
+if __name__ == "__main__":
+    main()
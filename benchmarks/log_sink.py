@@ -0,0 +1,53 @@
+"""Caller-side cost of logging through the ECS sinks.
+
+Run with ``python -m benchmarks.log_sink``. The sinks write to /dev/null, the
+numbers are what the event loop pays per ``logger.exception(...)`` call. With
+``diagnose``/``backtrace`` on, loguru renders an annotated traceback on the
+calling thread that the ECS sinks never use.
+"""
+
+import os
+
+from loguru import logger
+
+from benchmarks.common import measure, report
+from utils.logger_utils import AsyncECSLogSink, ECSLogSink, LogOverflowPolicy
+
+
+def log_error():
+    try:
+        raise ValueError("benchmark")
+    except ValueError:
+        logger.exception("Failed to get post")
+
+
+def run(sink, diagnose: bool) -> dict:
+    logger.remove()
+    logger.add(
+        sink,
+        level="INFO",
+        format="{message}",
+        backtrace=diagnose,
+        diagnose=diagnose,
+        catch=True,
+    )
+    logger.info("warm up")
+    return measure(log_error, number=2000)
+
+
+def main():
+    with open(os.devnull, "w") as devnull:
+        baseline = run(ECSLogSink(sink=devnull), diagnose=True)
+        report("ECSLogSink, diagnose", baseline)
+
+        sink = AsyncECSLogSink(
+            sink=devnull, queue_size=100000, overflow=LogOverflowPolicy.BLOCK
+        )
+        report("AsyncECSLogSink, diagnose", run(sink, diagnose=True), baseline)
+        report("AsyncECSLogSink", run(sink, diagnose=False), baseline)
+        sink.stop()
+        logger.remove()
+
+
+if __name__ == "__main__":
+    main()
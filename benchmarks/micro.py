@@ -0,0 +1,251 @@
+"""Microbenchmarks of the domain and serialization layers, against baselines.
+
+Each case times one call in isolation (``benchmarks.common.measure``) and is
+compared with its committed median in ``benchmarks/micro_baselines.json``.
+Baselines are only comparable on the machine and Python version that recorded
+them, re-record them (``--save``) before starting an optimization. Run from the
+repository root:
+
+    python -m benchmarks.micro                       # compare with the baselines
+    python -m benchmarks.micro -k time_utils         # cases matching a substring
+    python -m benchmarks.micro --max-regression 0.2  # exit 1 when 20% slower
+    python -m benchmarks.micro --save                # record new baselines
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import measure, report, webhook_user_event
+from benchmarks.response_serialization import build_page
+from internal.controllers.http.resources import GetPostResourceV1
+from internal.domains.entities import (
+    CreateCommentPayload,
+    CreatePostPayload,
+    GetMultiPostsFilter,
+)
+from internal.infrastructures.external_authentication_service.keycloak_client import (
+    KeycloakClient,
+)
+from internal.infrastructures.relational_db.postgres.models.comment import (
+    Comment,
+    CommentModelMapper,
+)
+from internal.infrastructures.relational_db.postgres.models.post import (
+    Post,
+    PostModelMapper,
+)
+from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_dt_to_str, from_str_to_dt
+
+BASELINES_PATH = Path(__file__).resolve().parent / "micro_baselines.json"
+
+# name -> (builds the timed callable, calls per repeat)
+CASES: Dict[str, Tuple[Callable[[], Callable[[], object]], int]] = {}
+
+
+def case(name: str, number: int = 10000):
+    """Register a case; the decorated function sets up and returns the timed call."""
+
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        CASES[name] = (setup, number)
+        return setup
+
+    return decorator
+
+
+def _now() -> datetime:
+    return datetime(2025, 6, 1, 12, 30, 45, 123456, tzinfo=UTC)
+
+
+def _post_row() -> Post:
+    return Post(
+        id_=uuid.uuid4(),
+        text_content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+        created_at=_now(),
+        updated_at=_now(),
+        version=3,
+        comment_count=12,
+        owner_id=uuid.uuid4(),
+    )
+
+
+@case("entities.post_from_row")
+def post_from_row():
+    row = _post_row()
+    return lambda: PostModelMapper.to_entity(model=row)
+
+
+@case("entities.comment_from_row")
+def comment_from_row():
+    row = Comment(
+        id_=uuid.uuid4(),
+        text_content="Lorem ipsum dolor sit amet",
+        created_at=_now(),
+        updated_at=_now(),
+        version=1,
+        post_id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+    )
+    return lambda: CommentModelMapper.to_entity(model=row)
+
+
+@case("validation.get_multi_posts_filter")
+def get_multi_posts_filter():
+    def validate():
+        GetMultiPostsFilter(
+            sort_field="updated_at",
+            sort_order="DESC",
+            offset=0,
+            limit=20,
+            from_date="2025-01-01T00:00:00.000000",
+            to_date="2025-06-01T00:00:00.000000",
+            enable_count=True,
+        )
+
+    return validate
+
+
+@case("validation.create_post_payload")
+def create_post_payload():
+    owner_id = str(uuid.uuid4())
+
+    def validate():
+        CreatePostPayload(text_content="Lorem ipsum", owner_id=owner_id)
+
+    return validate
+
+
+@case("validation.create_comment_payload")
+def create_comment_payload():
+    post_id, owner_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    def validate():
+        CreateCommentPayload(
+            text_content="Lorem ipsum", post_id=post_id, owner_id=owner_id
+        )
+
+    return validate
+
+
+@case("resources.get_post_from_entity")
+def get_post_from_entity():
+    entity = PostModelMapper.to_entity(model=_post_row())
+    return lambda: GetPostResourceV1().from_entity(entity=entity)
+
+
+@case("serialization.encode_post_page", number=200)
+def encode_post_page():
+    res = build_page()
+    return lambda: orjson.dumps(jsonable_encoder(res))
+
+
+@case("webhook.parse_user_event", number=5000)
+def parse_user_event():
+    client = KeycloakClient(
+        url="http://127.0.0.1:8081",
+        admin_username="admin",
+        admin_password="admin",
+        realm="benchmark",
+        client_id="benchmark",
+        client_secret="benchmark",
+        webhook_secret="benchmark",
+    )
+    event = webhook_user_event(
+        user_id=str(uuid.uuid4()),
+        username="benchmark",
+        realm="benchmark",
+        client_id="benchmark",
+    )
+    loop = asyncio.new_event_loop()
+    # nothing is awaited inside, the loop overhead is the same for every run
+    return lambda: loop.run_until_complete(client.parse_webhook_event(event=event))
+
+
+@case("time_utils.from_str_to_dt")
+def time_from_str_to_dt():
+    raw = "2025-06-01T12:30:45.123456"
+    return lambda: from_str_to_dt(str_time=raw, format_=DATETIME_DEFAULT_FORMAT)
+
+
+@case("time_utils.from_dt_to_str")
+def time_from_dt_to_str():
+    dt = _now()
+    return lambda: from_dt_to_str(dt=dt, format_=DATETIME_DEFAULT_FORMAT)
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="keyword", default="", help="case name filter")
+    parser.add_argument("--save", action="store_true", help="record the baselines")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help="fail when a median is slower than its baseline by this ratio",
+    )
+    args = parser.parse_args()
+
+    baselines = {}
+    if BASELINES_PATH.exists():
+        baselines = json.loads(BASELINES_PATH.read_text())
+    if baselines.get("environment", {}) != _environment() and not args.save:
+        print(
+            f"baselines recorded on {baselines.get('environment')}, "
+            f"running on {_environment()}, ratios are indicative only"
+        )
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions: List[str] = []
+    for name, (setup, number) in CASES.items():
+        if args.keyword not in name:
+            continue
+        stats = measure(setup(), number=number)
+        results[name] = {key: round(value, 3) for key, value in stats.items()}
+        baseline = baselines.get("cases", {}).get(name)
+        report(name, stats, baseline=baseline)
+        if (
+            args.max_regression is not None
+            and baseline
+            and stats["median_us"] > baseline["median_us"] * (1 + args.max_regression)
+        ):
+            regressions.append(name)
+
+    if args.save:
+        # baselines of another machine are dropped, not mixed with these
+        cases = results
+        if baselines.get("environment") == _environment():
+            cases = {**baselines.get("cases", {}), **results}
+        BASELINES_PATH.write_text(
+            json.dumps(
+                {"environment": _environment(), "cases": cases},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+        print(f"baselines written to {BASELINES_PATH}")
+    if regressions:
+        print(f"slower than the baselines: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Encoding cost of a 100 item ``GET /v1/posts`` page and of an error response.
+
+Compares the previous ``jsonable_encoder`` + ``ORJSONResponse`` path with the
+single-pass ``DataJSONResponse`` and the pre-serialized ``static_response``.
+Run from the repository root:
+
+    python -m benchmarks.response_serialization
+"""
+
+import uuid
+import warnings
+from datetime import UTC, datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+from benchmarks.common import measure, report
+from internal.controllers.http.resources import GetPostResourceV1
+from internal.controllers.responses import DataJSONResponse, DataResponse
+from internal.controllers.responses.error_code import common_validation_error
+from internal.controllers.responses.static import static_response
+from internal.controllers.responses.success_code import get_post_success
+from internal.domains.entities import PostEntity, UserEntity
+
+PAGE_SIZE = 100
+
+# ORJSONResponse is only kept here as the baseline
+warnings.filterwarnings("ignore", message="ORJSONResponse is deprecated")
+
+
+def build_posts(with_owner: bool = False) -> List[PostEntity]:
+    now = datetime.now(tz=UTC)
+    owner = UserEntity(
+        id_=uuid.uuid4(), username="benchmark", is_active=True, created_at=now
+    )
+    return [
+        PostEntity(
+            id_=uuid.uuid4(),
+            text_content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+            * 4,
+            created_at=now - timedelta(minutes=idx),
+            updated_at=now,
+            version=idx,
+            comment_count=idx * 3,
+            owner_id=owner.id_,
+            owner=owner if with_owner else None,
+        )
+        for idx in range(PAGE_SIZE)
+    ]
+
+
+def build_page(with_owner: bool = False) -> DataResponse:
+    resources = [
+        GetPostResourceV1().from_entity(entity=post)
+        for post in build_posts(with_owner=with_owner)
+    ]
+    return DataResponse(data=resources, count=PAGE_SIZE, message=get_post_success)
+
+
+def main():
+    for with_owner in (False, True):
+        res = build_page(with_owner=with_owner)
+        old = ORJSONResponse(status_code=200, content=jsonable_encoder(res)).body
+        new = DataJSONResponse(status_code=200, content=res).body
+        assert old == new, "renderers disagree"
+
+        suffix = " (expand=owner)" if with_owner else ""
+        baseline = measure(
+            lambda: ORJSONResponse(status_code=200, content=jsonable_encoder(res)),
+            number=200,
+        )
+        report(f"jsonable_encoder+orjson{suffix}", baseline)
+        report(
+            f"DataJSONResponse{suffix}",
+            measure(lambda: DataJSONResponse(status_code=200, content=res), number=200),
+            baseline=baseline,
+        )
+
+    error_res = DataResponse(message=common_validation_error)
+    baseline = measure(
+        lambda: ORJSONResponse(status_code=400, content=jsonable_encoder(error_res)),
+        number=5000,
+    )
+    report("error: jsonable_encoder+orjson", baseline)
+    report(
+        "error: static_response",
+        measure(lambda: static_response(message=common_validation_error), number=5000),
+        baseline=baseline,
+    )
+
+
+if __name__ == "__main__":
+    main()
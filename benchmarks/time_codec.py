@@ -0,0 +1,110 @@
+"""Cost of the ``utils.time_utils`` codec against plain strptime/strftime.
+
+Times one conversion each way, then the conversion of a 100 item
+``GET /v1/posts`` page to resources, which formats two datetimes per row. The
+per row saving is measured in alternating rounds of both codecs, so drift of
+the machine hits both alike, and reported as a median with its spread. Run from
+the repository root:
+
+    python -m benchmarks.time_codec
+"""
+
+import statistics
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, List
+
+from benchmarks.common import measure, report
+from benchmarks.response_serialization import PAGE_SIZE, build_posts
+from internal.controllers.http.resources import GetPostResourceV1
+from internal.controllers.http.resources import post as post_resources
+from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_dt_to_str, from_str_to_dt
+
+
+def strptime_from_str_to_dt(str_time: str, format_: str) -> datetime:
+    return datetime.strptime(str_time, format_)
+
+
+def strftime_from_dt_to_str(dt: datetime, format_: str) -> str:
+    return dt.strftime(format_)
+
+
+@contextmanager
+def strftime_resources():
+    """Format the post resources with strftime, as before the codec."""
+    original = post_resources.from_dt_to_str
+    post_resources.from_dt_to_str = strftime_from_dt_to_str
+    try:
+        yield
+    finally:
+        post_resources.from_dt_to_str = original
+
+
+def saving_per_row(
+    convert: Callable[[], object], rounds: int = 41, number: int = 50
+) -> List[float]:
+    """Microseconds saved per row by the codec, one sample per round."""
+    savings = []
+    for _ in range(rounds):
+        with strftime_resources():
+            legacy = measure(convert, number=number, repeat=1)["median_us"]
+        current = measure(convert, number=number, repeat=1)["median_us"]
+        savings.append((legacy - current) / PAGE_SIZE)
+    return savings
+
+
+def main():
+    raw = "2025-06-01T12:30:45.123456"
+    dt = datetime.fromisoformat(raw)
+    assert from_str_to_dt(str_time=raw, format_=DATETIME_DEFAULT_FORMAT) == dt
+    assert from_dt_to_str(dt=dt, format_=DATETIME_DEFAULT_FORMAT) == raw
+
+    baseline = measure(
+        lambda: strptime_from_str_to_dt(str_time=raw, format_=DATETIME_DEFAULT_FORMAT)
+    )
+    report("parse: strptime", baseline)
+    report(
+        "parse: from_str_to_dt",
+        measure(lambda: from_str_to_dt(str_time=raw, format_=DATETIME_DEFAULT_FORMAT)),
+        baseline=baseline,
+    )
+
+    baseline = measure(
+        lambda: strftime_from_dt_to_str(dt=dt, format_=DATETIME_DEFAULT_FORMAT)
+    )
+    report("format: strftime", baseline)
+    report(
+        "format: from_dt_to_str",
+        measure(lambda: from_dt_to_str(dt=dt, format_=DATETIME_DEFAULT_FORMAT)),
+        baseline=baseline,
+    )
+
+    posts = build_posts()
+
+    def convert() -> list:
+        return [GetPostResourceV1().from_entity(entity=post) for post in posts]
+
+    with strftime_resources():
+        legacy = [resource.model_dump() for resource in convert()]
+        baseline = measure(convert, number=100, repeat=15)
+    assert legacy == [resource.model_dump() for resource in convert()], (
+        "codecs disagree"
+    )
+    current = measure(convert, number=100, repeat=15)
+    report(f"page of {PAGE_SIZE}: strftime", baseline)
+    report(f"page of {PAGE_SIZE}: from_dt_to_str", current, baseline=baseline)
+
+    # the page is dominated by building the resources, a single run's saving is
+    # within its noise
+    savings = saving_per_row(convert=convert)
+    low, median, high = statistics.quantiles(savings, n=4)
+    print(
+        f"saved per row: median {median:.2f} us, "
+        f"interquartile {low:.2f} to {high:.2f} us, "
+        f"range {min(savings):.2f} to {max(savings):.2f} us "
+        f"over {len(savings)} rounds"
+    )
+
+
+if __name__ == "__main__":
+    main()
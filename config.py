@@ -69,6 +69,87 @@ class RelationalDBConfig(BaseModel):
     url: str
     enable_log: bool
     enable_auto_migrate: bool
+    isolation_level: Optional[str] = "READ COMMITTED"
+
+
+class LogConfig(BaseModel):
+    # format and write logs on a background thread instead of the event loop
+    async_sink: Optional[bool] = True
+    queue_size: Optional[int] = 10000
+    batch_size: Optional[int] = 512
+    flush_interval_ms: Optional[int] = 200
+    # drop_new, drop_old or block (wait up to block_timeout_ms, then drop);
+    # block never waits on the event loop thread, records logged there are dropped
+    overflow: Optional[str] = "drop_new"
+    block_timeout_ms: Optional[int] = 100
+    # take the origin of intercepted stdlib records from the record, not the stack
+    intercept_fast: Optional[bool] = True
+    # per logger tree, e.g. "sqlalchemy.engine=0.1,uvicorn.access=0.5"
+    intercept_sample_rates: Optional[str] = ""
+    # max records per second per logger tree, e.g. "sqlalchemy.engine=200"
+    intercept_rate_limits: Optional[str] = ""
+    # share of requests whose info/debug logs are kept, decided when they start
+    request_sample_rate: Optional[float] = 1.0
+    # write an error message logged again within the same request only once
+    dedup_errors: Optional[bool] = True
+
+
+class CompressionConfig(BaseModel):
+    enable: Optional[bool] = True
+    minimum_size: Optional[int] = 1024
+    # server preference order, br and zstd need the brotli/zstandard packages
+    encodings: Optional[str] = "zstd,br,gzip"
+    gzip_level: Optional[int] = 6
+    brotli_quality: Optional[int] = 4
+    zstd_level: Optional[int] = 3
+
+
+class ReadinessConfig(BaseModel):
+    window_seconds: Optional[float] = 60.0
+    min_samples: Optional[int] = 5
+    max_error_rate: Optional[float] = 0.05
+    ping_interval_seconds: Optional[float] = 5.0
+    ping_timeout_seconds: Optional[float] = 2.0
+    postgres_p99_threshold_ms: Optional[float] = 250.0
+    keycloak_p99_threshold_ms: Optional[float] = 500.0
+    openfga_p99_threshold_ms: Optional[float] = 250.0
+
+
+class MetricsConfig(BaseModel):
+    enable: Optional[bool] = True
+    dump_interval_seconds: Optional[float] = 5.0
+
+
+class QueryProfilerConfig(BaseModel):
+    enable: Optional[bool] = True
+    slow_query_ms: Optional[float] = 200.0
+    explain_sample_rate: Optional[float] = 0.0
+    max_queries_per_request: Optional[int] = 20
+    budget_mode: Optional[str] = "warn"
+    max_statement_length: Optional[int] = 1000
+
+
+class TracingConfig(BaseModel):
+    enable: Optional[bool] = False
+    sample_rate: Optional[float] = 0.1
+    exporter: Optional[str] = "memory"
+    otlp_file_path: Optional[str] = "./traces.jsonl"
+    max_spans: Optional[int] = 4096
+    service_name: Optional[str] = "python-clean-architecture-project"
+
+
+class EventLoopWatchdogConfig(BaseModel):
+    enable: Optional[bool] = True
+    interval_ms: Optional[float] = 100.0
+    # log the loop thread's stack once the loop is blocked for this long
+    stall_threshold_ms: Optional[float] = 250.0
+    max_stack_depth: Optional[int] = 30
+
+
+class AdminConfig(BaseModel):
+    # admin routes of the health check server are disabled while empty
+    token: Optional[str] = ""
+    profile_interval_ms: Optional[float] = 5.0
 
 
 class CfgManagerConfig(BaseModel):
@@ -91,6 +172,31 @@ class AppConfig(BaseSettings):
     health_check_http_port: Optional[int] = 5000
     log_level: Optional[str] = "INFO"
     uvicorn_workers: Optional[int] = 1
+    uvicorn_reuse_port: Optional[bool] = True
+
+    # === Logging ===
+    log: Optional[LogConfig] = LogConfig()
+
+    # === Response Compression ===
+    compression: Optional[CompressionConfig] = CompressionConfig()
+
+    # === Readiness ===
+    readiness: Optional[ReadinessConfig] = ReadinessConfig()
+
+    # === Metrics ===
+    metrics: Optional[MetricsConfig] = MetricsConfig()
+
+    # === Query Profiler ===
+    query_profiler: Optional[QueryProfilerConfig] = QueryProfilerConfig()
+
+    # === Tracing ===
+    tracing: Optional[TracingConfig] = TracingConfig()
+
+    # === Event Loop Watchdog ===
+    event_loop_watchdog: Optional[EventLoopWatchdogConfig] = EventLoopWatchdogConfig()
+
+    # === Admin ===
+    admin: Optional[AdminConfig] = AdminConfig()
 
     # === Config Manager ===
     cfg_manager_service: CfgManagerConfig
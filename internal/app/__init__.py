@@ -1,2 +1,11 @@
-from .middlewares import JWTAuthMiddleware
-from .servers import init_health_check_server, init_http_server
+from .dispatcher import PortDispatcher
+from .middlewares import (
+    CompressionMiddleware,
+    JWTAuthMiddleware,
+    MetricsMiddleware,
+    QueryProfilerMiddleware,
+    RequestContextMiddleware,
+    TracingMiddleware,
+)
+from .servers import init_health_check_server, init_http_server, init_server
+from .workers import WorkerSupervisor, serve
@@ -0,0 +1,46 @@
+from typing import Callable, Dict
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from internal.controllers.responses import error_code
+from internal.controllers.responses.static import static_response
+
+
+class PortDispatcher:
+    """Route each connection to an ASGI app by the local port it was accepted on.
+
+    It lets a single uvicorn server per worker listen on both the main and the
+    health check ports. Lifespan events go to the default (main) app only. While
+    ``is_available`` returns False, main app traffic is answered with a 503 so the
+    health check port keeps reporting why.
+    """
+
+    def __init__(
+        self,
+        default_app: ASGIApp,
+        apps: Dict[int, ASGIApp],
+        is_available: Callable[[], bool] = lambda: True,
+    ):
+        self._default_app = default_app
+        self._apps = apps
+        self._is_available = is_available
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self._default_app(scope, receive, send)
+            return
+
+        server = scope.get("server")
+        app = self._apps.get(server[1]) if server else None
+        if app is not None:
+            await app(scope, receive, send)
+            return
+
+        if scope["type"] == "http" and not self._is_available():
+            response = static_response(
+                message=error_code.common_service_unavailable_error
+            )
+            await response(scope, receive, send)
+            return
+
+        await self._default_app(scope, receive, send)
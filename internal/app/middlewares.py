@@ -1,31 +1,145 @@
+import time
+import uuid
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
 from dependency_injector.wiring import Provide, inject
 from fastapi import Request
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import ORJSONResponse
 from jwcrypto.jws import InvalidJWSObject
 from jwcrypto.jwt import JWTExpired
-from starlette import status
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from internal.controllers.responses import DataResponse
 from internal.controllers.responses.error_code import (
     common_invalid_token_error,
     common_missing_or_invalid_token_error,
     common_token_expired_error,
 )
+from internal.controllers.responses.static import static_response
 from internal.domains.entities import JWTPayload
 from internal.domains.services.abstraction import AbstractAuthenticationSVC
+from internal.infrastructures.relational_db.postgres.profiler import (
+    get_query_profiler,
+)
 from internal.patterns import Container
-from utils.logger_utils import get_shared_logger
+from utils.logger_utils import (
+    end_request_log_context,
+    get_request_log_context,
+    get_shared_logger,
+    start_request_log_context,
+)
+from utils.metrics_utils import AUTH_DURATION, HTTP_REQUEST_DURATION
+from utils.tracing_utils import (
+    STATUS_ERROR,
+    activate_span,
+    deactivate_span,
+    get_tracer,
+)
+
+try:
+    import brotli
+except ImportError:  # optional, br is only offered when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, zstd is only offered when installed
+    zstandard = None
 
 logger = get_shared_logger()
 
+_AUTH_DURATION_BY_OUTCOME = {
+    outcome: AUTH_DURATION.labels(outcome)
+    for outcome in ("ok", "missing", "invalid", "expired", "error")
+}
+
+# RFC 9110 methods plus PATCH, any other method is labelled "other"
+_HTTP_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH")
+)
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware opening the log context of every HTTP request.
+
+    The request id is taken from ``X-Request-ID`` when the client (or a proxy)
+    sent a sane one, generated otherwise, and echoed back in the response.
+    """
+
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID"):
+        self.app = app
+        self.header_name = header_name
+
+    def _request_id(self, scope: Scope) -> str:
+        request_id = Headers(scope=scope).get(self.header_name)
+        if request_id and len(request_id) <= 128 and request_id.isprintable():
+            return request_id
+        return uuid.uuid4().hex
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_id(scope=scope)
+        _, token = start_request_log_context(
+            request_id=request_id, method=scope["method"], path=scope["path"]
+        )
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            end_request_log_context(token=token)
+
 
 class JWTAuthMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, excluded_paths: list[str] = None):
         super().__init__(app)
         self.excluded_paths = excluded_paths or []
 
+    async def _authenticate(
+        self, request: Request, authentication_svc: AbstractAuthenticationSVC
+    ) -> Tuple[str, Optional[Response]]:
+        """Return the outcome and, when the request is rejected, the response."""
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return "missing", static_response(
+                message=common_missing_or_invalid_token_error
+            )
+
+        token = auth_header.split(" ")[1]  # Extract token
+        try:
+            (raw_payload, error) = await authentication_svc.decode_token(token=token)
+            if error:
+                return "error", static_response(
+                    message=common_missing_or_invalid_token_error
+                )
+            try:
+                payload = JWTPayload(**raw_payload)
+            except Exception as exc:
+                logger.error(exc)
+                return "invalid", static_response(message=common_invalid_token_error)
+            user_id = payload.sub
+            if not user_id:
+                return "invalid", static_response(message=common_invalid_token_error)
+            request.state.user_id = user_id  # Store user id in request state
+            log_context = get_request_log_context()
+            if log_context is not None:
+                log_context.user_id = str(user_id)
+        except JWTExpired:
+            return "expired", static_response(message=common_token_expired_error)
+        except InvalidJWSObject:
+            return "invalid", static_response(message=common_invalid_token_error)
+        return "ok", None
+
     @inject
     async def dispatch(
         self,
@@ -43,50 +157,367 @@ class JWTAuthMiddleware(BaseHTTPMiddleware):
         if request.url.path in self.excluded_paths:
             return await call_next(request)
 
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            res = DataResponse(message=common_missing_or_invalid_token_error)
-            return ORJSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED, content=jsonable_encoder(res)
-            )
+        started = time.perf_counter()
+        outcome, response = await self._authenticate(
+            request=request, authentication_svc=authentication_svc
+        )
+        _AUTH_DURATION_BY_OUTCOME[outcome].observe(time.perf_counter() - started)
+        if response is not None:
+            return response
+
+        return await call_next(request)
+
+
+class _RouteTemplates:
+    """Resolve the route template (``/v1/posts/{id}``) a request was routed to."""
+
+    def __init__(self):
+        self._templates: Optional[Dict[Any, str]] = None
+
+    def __call__(self, scope: Scope) -> str:
+        route = scope.get("route")  # only set by recent Starlette versions
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._templates is None:
+            self._templates = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if getattr(route, "endpoint", None) is not None
+            }
+        return self._templates.get(endpoint, "unmatched")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware observing ``http_request_duration_seconds``.
+
+    The duration runs until the last body chunk is sent, and requests are
+    labelled with the route template (``/v1/posts/{id}``) rather than the raw
+    path, and non-standard methods as ``other``, so the number of series stays
+    bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_template = _RouteTemplates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        if method not in _HTTP_METHODS:
+            method = "other"
 
-        token = auth_header.split(" ")[1]  # Extract token
         try:
-            (raw_payload, error) = await authentication_svc.decode_token(token=token)
-            if error:
-                res = DataResponse(message=common_missing_or_invalid_token_error)
-                return ORJSONResponse(
-                    status_code=common_missing_or_invalid_token_error.status_code,
-                    content=jsonable_encoder(res),
-                )
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                method, self._route_template(scope=scope), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening the server span of every HTTP request.
+
+    An incoming W3C ``traceparent`` is continued (sampled flag included). The
+    span is renamed to ``<method> <route template>`` once the request is routed,
+    and its trace id is attached to the request logs.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_template = _RouteTemplates()
+        self._tracer = get_tracer()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        span = self._tracer.start_root_span(
+            name=method,
+            traceparent=Headers(scope=scope).get("traceparent"),
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        if not span.recording:
+            token = activate_span(span=span)
             try:
-                payload = JWTPayload(**raw_payload)
-            except Exception as exc:
-                logger.error(exc)
-                res = DataResponse(message=common_invalid_token_error)
-                return ORJSONResponse(
-                    status_code=common_invalid_token_error.status_code,
-                    content=jsonable_encoder(res),
-                )
-            user_id = payload.sub
-            if not user_id:
-                res = DataResponse(message=common_invalid_token_error)
-                return ORJSONResponse(
-                    status_code=common_invalid_token_error.status_code,
-                    content=jsonable_encoder(res),
-                )
-            request.state.user_id = user_id  # Store user id in request state
-        except JWTExpired:
-            res = DataResponse(message=common_token_expired_error)
-            return ORJSONResponse(
-                status_code=common_token_expired_error.status_code,
-                content=jsonable_encoder(res),
+                await self.app(scope, receive, send)
+            finally:
+                deactivate_span(token=token)
+            return
+
+        log_context = get_request_log_context()
+        if log_context is not None:
+            log_context.trace_id = span.trace_id
+
+        async def send_with_status(message: Message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.set_status(status=STATUS_ERROR)
+            await send(message)
+
+        token = activate_span(span=span)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as exc:
+            span.record_exception(exc=exc)
+            raise
+        finally:
+            deactivate_span(token=token)
+            route = self._route_template(scope=scope)
+            span.name = f"{method} {route}"
+            span.set_attribute("http.route", route)
+            span.end()
+
+
+class QueryProfilerMiddleware:
+    """Pure ASGI middleware counting the SQL statements of every HTTP request.
+
+    Requests going over the query budget are reported under their route
+    template, see ``QueryProfiler``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_template = _RouteTemplates()
+        self._profiler = get_query_profiler()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        token = self._profiler.start_scope(name=f"{method} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._profiler.end_scope(
+                token=token, name=f"{method} {self._route_template(scope=scope)}"
             )
-        except InvalidJWSObject:
-            res = DataResponse(message=common_invalid_token_error)
-            return ORJSONResponse(
-                status_code=common_invalid_token_error.status_code,
-                content=jsonable_encoder(res),
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings() -> Dict[str, type]:
+    encodings = {"gzip": _GzipCompressor}
+    if brotli is not None:
+        encodings["br"] = _BrotliCompressor
+    if zstandard is not None:
+        encodings["zstd"] = _ZstdCompressor
+    return encodings
+
+
+class CompressionMiddleware:
+    """Pure ASGI response compression negotiated through ``Accept-Encoding``.
+
+    gzip is always available, br and zstd only when ``brotli``/``zstandard`` are
+    installed. Complete bodies under ``minimum_size`` bytes are sent as is and
+    streamed bodies are compressed chunk by chunk, flushing after every chunk so
+    clients keep receiving data as it is produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[str] = ("zstd", "br", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        available = available_encodings()
+        # server preference order, limited to what is installed
+        self.encodings = [encoding for encoding in encodings if encoding in available]
+        self.compressors = {
+            encoding: available[encoding] for encoding in self.encodings
+        }
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3}
+        self.levels.update(levels or {})
+        # clients send a handful of distinct Accept-Encoding values
+        self.negotiate = lru_cache(maxsize=128)(self._negotiate)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.negotiate(
+            accept_encoding=Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            app=self.app,
+            encoding=encoding,
+            compressor_factory=lambda: self.compressors[encoding](
+                self.levels[encoding]
+            ),
+            minimum_size=self.minimum_size,
+        )
+        await responder(scope, receive, send)
+
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        if not accept_encoding:
+            return None
+
+        weights: Dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            coding, _, params = item.strip().partition(";")
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            weight = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    weight = float(params[2:])
+                except ValueError:
+                    weight = 0.0
+            weights[coding] = weight
+
+        best: Optional[str] = None
+        best_weight = 0.0
+        for encoding in self.encodings:
+            weight = weights.get(encoding, weights.get("*", 0.0))
+            if weight > best_weight:
+                best, best_weight = encoding, weight
+        return best
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoding: str,
+        compressor_factory: Callable[[], Any],
+        minimum_size: int,
+    ):
+        self.app = app
+        self.encoding = encoding
+        self.compressor_factory = compressor_factory
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # hold the headers until the first body chunk tells us the size
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or message["status"] in (
+                204,
+                304,
             )
+            return
 
-        return await call_next(request)
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body and len(body) < self.minimum_size:
+                # small complete body, not worth compressing
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+
+            self.compressor = self.compressor_factory()
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start_message)
+
+        if more_body:
+            chunk = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.finish()
+        await self.send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
@@ -1,19 +1,62 @@
+import hmac
+import os
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import ORJSONResponse
+from fastapi import FastAPI, HTTPException, Query, status
+from fastapi.responses import Response
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 
 from config import app_config
-from internal.app import JWTAuthMiddleware
+from internal.app import (
+    CompressionMiddleware,
+    JWTAuthMiddleware,
+    MetricsMiddleware,
+    PortDispatcher,
+    QueryProfilerMiddleware,
+    RequestContextMiddleware,
+    TracingMiddleware,
+)
+from internal.app.workers import METRICS_DIR_ENV, WORKER_ID_ENV
 from internal.controllers.http.v1.routes import api_router as api_router_v1
-from internal.controllers.responses import DataResponse, MessageResponse
+from internal.controllers.responses import DataJSONResponse, MessageResponse
+from internal.controllers.responses.error_code import (
+    common_missing_or_invalid_token_error,
+    common_operation_in_progress_error,
+)
+from internal.controllers.responses.static import static_response
 from internal.infrastructures.config_manager import ConfigManager
 from internal.patterns import Container, initialize_relational_db
-from internal.patterns.dependency_injection import close_relational_db
+from internal.patterns.dependency_injection import (
+    close_relational_db,
+    configure_query_profiler,
+    start_dependency_monitor,
+    stop_dependency_monitor,
+)
+from utils.health_utils import (
+    DependencyStatus,
+    get_dependency_monitor,
+    get_event_loop_watchdog,
+)
 from utils.logger_utils import get_shared_logger
+from utils.metrics_utils import (
+    CONTENT_TYPE,
+    MultiProcessMetrics,
+    get_metrics_registry,
+)
+from utils.profiling_utils import (
+    MAX_PROFILE_SECONDS,
+    ProfileMode,
+    ProfilerBusyError,
+    dump_tasks,
+    profile_event_loop,
+)
+from utils.tracing_utils import (
+    InMemorySpanCollector,
+    build_span_exporter,
+    get_tracer,
+)
 
 logger = get_shared_logger()
 
@@ -23,6 +66,9 @@ app_status = {"alive": True, "status_code": 200, "message": "I'm fine"}
 def init_http_server() -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        app.state.metrics.start()
+        if app_config.event_loop_watchdog.enable:
+            get_event_loop_watchdog().start()
         try:
             # Get the container instance
             container = Container()
@@ -44,21 +90,68 @@ def init_http_server() -> FastAPI:
                 logger.info(f"Load config from local successfully")
 
             # Initialize relational database
+            configure_query_profiler(config=app_config.query_profiler)
             await initialize_relational_db(container=container)
+            app.state.relational_db = container.relational_db()
             logger.info("Relational database initialized")
 
-            yield
-
-            # Close relational database
-            await close_relational_db(container=container)
-            logger.info("Relational database closed")
+            # Track dependency latency for the readiness probe
+            await start_dependency_monitor(
+                container=container, config=app_config.readiness
+            )
+            logger.info("Dependency monitor started")
         except Exception as exc:
             logger.error(f"Main HTTP server crashed due to: {exc}")
             app_status["alive"] = False
             app_status["status_code"] = 500
             app_status["message"] = str(exc)
 
-    server_ = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+        # keep serving when the startup failed, so the health check port can report it
+        yield
+
+        if app_status["alive"]:
+            try:
+                await stop_dependency_monitor()
+
+                # Close relational database
+                await close_relational_db(container=container)
+                logger.info("Relational database closed")
+            except Exception as exc:
+                logger.error(f"Main HTTP server failed to shut down due to: {exc}")
+
+        await get_event_loop_watchdog().stop()
+        await app.state.metrics.stop()
+        get_tracer().shutdown()
+
+    if app_config.tracing.enable:
+        get_tracer().configure(
+            exporter=build_span_exporter(
+                exporter_type=app_config.tracing.exporter,
+                resource={
+                    "service.name": app_config.tracing.service_name,
+                    "service.instance.id": os.environ.get(WORKER_ID_ENV, "0"),
+                    "process.pid": os.getpid(),
+                },
+                otlp_file_path=app_config.tracing.otlp_file_path,
+                max_spans=app_config.tracing.max_spans,
+            ),
+            sample_rate=app_config.tracing.sample_rate,
+        )
+
+    get_event_loop_watchdog().configure(
+        interval_seconds=app_config.event_loop_watchdog.interval_ms / 1000,
+        stall_threshold_seconds=app_config.event_loop_watchdog.stall_threshold_ms
+        / 1000,
+        max_stack_depth=app_config.event_loop_watchdog.max_stack_depth,
+    )
+
+    server_ = FastAPI(default_response_class=DataJSONResponse, lifespan=lifespan)
+    server_.state.metrics = MultiProcessMetrics(
+        registry=get_metrics_registry(),
+        directory=os.environ.get(METRICS_DIR_ENV),
+        worker_id=os.environ.get(WORKER_ID_ENV),
+        interval_seconds=app_config.metrics.dump_interval_seconds,
+    )
 
     server_.add_middleware(
         middleware_class=CORSMiddleware,
@@ -66,6 +159,7 @@ def init_http_server() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Request-ID"],
     )
     server_.add_middleware(
         middleware_class=JWTAuthMiddleware,
@@ -76,32 +170,172 @@ def init_http_server() -> FastAPI:
             "/v1/authentication/webhook/events-synchronization",  # webhook to integrate with authentication service
         ],
     )
+    # times the authentication and every layer below it
+    if app_config.metrics.enable:
+        server_.add_middleware(middleware_class=MetricsMiddleware)
+    if app_config.query_profiler.enable:
+        server_.add_middleware(middleware_class=QueryProfilerMiddleware)
+    if app_config.tracing.enable:
+        server_.add_middleware(middleware_class=TracingMiddleware)
+    # wraps the authentication, so its logs already carry the request id
+    server_.add_middleware(middleware_class=RequestContextMiddleware)
+    if app_config.compression.enable:
+        # added last so it wraps every other middleware
+        server_.add_middleware(
+            middleware_class=CompressionMiddleware,
+            minimum_size=app_config.compression.minimum_size,
+            encodings=[
+                encoding.strip()
+                for encoding in app_config.compression.encodings.split(",")
+                if encoding.strip()
+            ],
+            levels={
+                "gzip": app_config.compression.gzip_level,
+                "br": app_config.compression.brotli_quality,
+                "zstd": app_config.compression.zstd_level,
+            },
+        )
 
     @server_.exception_handler(HTTPException)
     async def http_exception_handler(_: Request, exc: HTTPException):
         logger.error(exc)
-        res = DataResponse(
+        return static_response(
             message=MessageResponse(
                 msg_code="E000", msg_name=str(exc.detail), status_code=exc.status_code
             )
         )
-        return ORJSONResponse(
-            status_code=exc.status_code,
-            content=jsonable_encoder(res),
-        )
 
     server_.include_router(api_router_v1, prefix="/v1")
 
     return server_
 
 
-def init_health_check_server() -> FastAPI:
+def init_health_check_server(main_server: Optional[FastAPI] = None) -> FastAPI:
     health_check_app = FastAPI()
 
     @health_check_app.get("/health-check")
     async def health_check():
         if app_status["status_code"] != 200:
             logger.info(app_status)
-        return ORJSONResponse(content=app_status, status_code=app_status["status_code"])
+
+        # per worker status, built from in-process state only (no I/O)
+        content = {
+            **app_status,
+            "pid": os.getpid(),
+            "worker": os.environ.get(WORKER_ID_ENV),
+        }
+        relational_db = (
+            getattr(main_server.state, "relational_db", None) if main_server else None
+        )
+        if relational_db is not None:
+            content["relational_db_pool"] = relational_db.pool_status()
+        if app_config.event_loop_watchdog.enable:
+            content["event_loop"] = get_event_loop_watchdog().report()
+
+        return DataJSONResponse(content=content, status_code=app_status["status_code"])
+
+    @health_check_app.get("/readiness")
+    async def readiness():
+        overall, dependencies = get_dependency_monitor().report()
+        ready = app_status["alive"] and overall != DependencyStatus.DEGRADED
+        content = {
+            "ready": ready,
+            "status": overall.value if app_status["alive"] else "unavailable",
+            "pid": os.getpid(),
+            "worker": os.environ.get(WORKER_ID_ENV),
+            "dependencies": dependencies,
+        }
+        return DataJSONResponse(
+            content=content,
+            status_code=(
+                status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+        )
+
+    if app_config.metrics.enable and main_server is not None:
+
+        @health_check_app.get("/metrics")
+        async def metrics():
+            # merged with the dumps of the other workers, see MultiProcessMetrics
+            return Response(
+                content=main_server.state.metrics.render(), media_type=CONTENT_TYPE
+            )
+
+    if app_config.admin.token:
+        _add_admin_routes(health_check_app=health_check_app)
+
+    collector = get_tracer().exporter
+    if isinstance(collector, InMemorySpanCollector):
+
+        @health_check_app.get("/traces")
+        async def traces(limit: int = Query(default=20, ge=1, le=200)):
+            # latest sampled traces of this worker only
+            return DataJSONResponse(content={"traces": collector.traces(limit=limit)})
 
     return health_check_app
+
+
+def _is_admin(request: Request) -> bool:
+    auth_header = request.headers.get("Authorization") or ""
+    if not auth_header.startswith("Bearer "):
+        return False
+    return hmac.compare_digest(
+        auth_header[len("Bearer ") :].encode(), app_config.admin.token.encode()
+    )
+
+
+def _add_admin_routes(health_check_app: FastAPI):
+    """Diagnostics of the worker serving the request, behind the admin token."""
+
+    @health_check_app.get("/admin/profile")
+    async def profile(
+        request: Request,
+        seconds: float = Query(default=10.0, gt=0, le=MAX_PROFILE_SECONDS),
+        interval_ms: Optional[float] = Query(default=None, ge=1, le=1000),
+        mode: ProfileMode = ProfileMode.WALL,
+    ):
+        if not _is_admin(request=request):
+            return static_response(message=common_missing_or_invalid_token_error)
+        try:
+            stacks = await profile_event_loop(
+                seconds=seconds,
+                interval_seconds=(interval_ms or app_config.admin.profile_interval_ms)
+                / 1000,
+                mode=mode,
+            )
+        except ProfilerBusyError:
+            return static_response(message=common_operation_in_progress_error)
+        # collapsed stacks, ready for flamegraph.pl or speedscope
+        return Response(
+            content=stacks,
+            media_type="text/plain; charset=utf-8",
+            headers={"X-Worker-Pid": str(os.getpid())},
+        )
+
+    @health_check_app.get("/admin/tasks")
+    async def tasks(request: Request):
+        if not _is_admin(request=request):
+            return static_response(message=common_missing_or_invalid_token_error)
+        pending = dump_tasks()
+        return DataJSONResponse(
+            content={
+                "pid": os.getpid(),
+                "worker": os.environ.get(WORKER_ID_ENV),
+                "count": len(pending),
+                "tasks": pending,
+            }
+        )
+
+
+def init_server() -> PortDispatcher:
+    """Main and health check apps behind one ASGI app, for a single uvicorn server."""
+    http_server = init_http_server()
+    return PortDispatcher(
+        default_app=http_server,
+        apps={
+            app_config.health_check_http_port: init_health_check_server(
+                main_server=http_server
+            )
+        },
+        is_available=lambda: app_status["alive"],
+    )
@@ -0,0 +1,183 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from multiprocessing.context import SpawnProcess
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import uvicorn
+
+from utils.logger_utils import get_shared_logger
+
+logger = get_shared_logger()
+
+Address = Tuple[str, int]
+
+WORKER_ID_ENV = "APP_WORKER_ID"
+# directory where workers share their metrics, see MultiProcessMetrics
+METRICS_DIR_ENV = "APP_METRICS_DIR"
+
+
+def supports_reuse_port() -> bool:
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+def bind_socket(address: Address, reuse_port: bool = False) -> socket.socket:
+    """Bind a listening socket, optionally with SO_REUSEPORT.
+
+    With SO_REUSEPORT every worker binds its own socket on the same port and the
+    kernel spreads incoming connections between them, instead of all the workers
+    racing on ``accept`` of a single shared socket.
+    """
+    sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(address)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(
+    app: str,
+    addresses: Sequence[Address],
+    log_level: str,
+    sockets: Optional[List[socket.socket]] = None,
+    reuse_port: bool = False,
+):
+    """Run one uvicorn server listening on every address.
+
+    ``app`` is an import string of an app factory, so spawned workers build their
+    own app instead of unpickling one from the supervisor.
+    """
+    if sockets is None:
+        sockets = [
+            bind_socket(address=address, reuse_port=reuse_port) for address in addresses
+        ]
+    config = uvicorn.Config(
+        app=app,
+        factory=True,
+        log_level=log_level.lower(),
+        log_config=None,  # Disable Uvicorn's logging configuration
+    )
+    server = uvicorn.Server(config)
+    asyncio.run(server.serve(sockets=sockets))
+
+
+def _run_worker(worker_id: int, **kwargs):
+    os.environ[WORKER_ID_ENV] = str(worker_id)
+    serve(**kwargs)
+
+
+class WorkerSupervisor:
+    """Pre-fork style supervisor keeping ``workers`` server processes alive.
+
+    Workers are started with the ``spawn`` method, so each one gets a clean
+    interpreter and its own event loop, engine and connection pool. When
+    SO_REUSEPORT is available every worker binds its own sockets, otherwise the
+    supervisor binds them once and hands them over to the workers. A worker that
+    exits while the supervisor is running is restarted; SIGINT/SIGTERM are
+    forwarded to the workers, which shut down gracefully.
+    """
+
+    def __init__(
+        self,
+        app: str,
+        addresses: Sequence[Address],
+        workers: int,
+        log_level: str,
+        reuse_port: bool = True,
+        restart_delay: float = 1.0,
+        shutdown_timeout: float = 30.0,
+    ):
+        self._app = app
+        self._addresses = list(addresses)
+        self._workers = workers
+        self._log_level = log_level
+        self._reuse_port = reuse_port and supports_reuse_port()
+        self._restart_delay = restart_delay
+        self._shutdown_timeout = shutdown_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: Dict[int, SpawnProcess] = {}
+        self._sockets: Optional[List[socket.socket]] = None
+        self._metrics_dir: Optional[str] = None
+        self._should_exit = False
+
+    def _spawn(self, worker_id: int) -> SpawnProcess:
+        process = self._context.Process(
+            target=_run_worker,
+            kwargs={
+                "worker_id": worker_id,
+                "app": self._app,
+                "addresses": self._addresses,
+                "log_level": self._log_level,
+                "sockets": self._sockets,
+                "reuse_port": self._reuse_port,
+            },
+            name=f"worker-{worker_id}",
+        )
+        process.start()
+        logger.info(f"Started worker {worker_id} [{process.pid}]")
+        return process
+
+    def _handle_exit(self, sig, _):
+        logger.info(f"Received {signal.Signals(sig).name}, stopping workers")
+        self._should_exit = True
+
+    def _terminate(self):
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for worker_id, process in self._processes.items():
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(
+                    f"Worker {worker_id} [{process.pid}] did not stop, killing"
+                )
+                process.kill()
+                process.join()
+
+    def run(self):
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+
+        # workers inherit the environment, a fresh directory drops stale dumps
+        self._metrics_dir = tempfile.mkdtemp(prefix="app-metrics-")
+        os.environ[METRICS_DIR_ENV] = self._metrics_dir
+
+        if not self._reuse_port:
+            self._sockets = [
+                bind_socket(address=address) for address in self._addresses
+            ]
+
+        logger.info(
+            f"Supervisor [{os.getpid()}] starting {self._workers} workers "
+            f"(SO_REUSEPORT={'on' if self._reuse_port else 'off'})"
+        )
+        for worker_id in range(self._workers):
+            self._processes[worker_id] = self._spawn(worker_id=worker_id)
+
+        try:
+            while not self._should_exit:
+                for worker_id, process in list(self._processes.items()):
+                    if process.is_alive() or self._should_exit:
+                        continue
+                    logger.error(
+                        f"Worker {worker_id} [{process.pid}] exited with code "
+                        f"{process.exitcode}, restarting"
+                    )
+                    time.sleep(self._restart_delay)
+                    self._processes[worker_id] = self._spawn(worker_id=worker_id)
+                time.sleep(0.5)
+        finally:
+            self._terminate()
+            for sock in self._sockets or []:
+                sock.close()
+            shutil.rmtree(self._metrics_dir, ignore_errors=True)
+            logger.info("All workers stopped")
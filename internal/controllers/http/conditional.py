@@ -0,0 +1,29 @@
+import hashlib
+from typing import Optional
+
+from starlette.responses import Response
+
+
+def make_etag(*parts: str) -> str:
+    """Build a weak ETag from the revision parts of a representation."""
+    digest = hashlib.blake2b(
+        "|".join(parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
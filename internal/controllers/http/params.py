@@ -0,0 +1,24 @@
+from typing import Iterable, List, Optional
+
+from internal.domains.constants import ExpandField
+
+
+def parse_expand(expand: Optional[str], allowed: Iterable[ExpandField]) -> List[str]:
+    """Split an ``expand=a,b`` query value.
+
+    Raises ``ValueError`` for fields the endpoint can't embed.
+    """
+    if not expand:
+        return []
+
+    allowed_values = {field.value for field in allowed}
+    fields: List[str] = []
+    for field in expand.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in allowed_values:
+            raise ValueError(f"Invalid expand field: {field}")
+        if field not in fields:
+            fields.append(field)
+    return fields
@@ -1,6 +1,6 @@
 from typing import Annotated, Optional
 
-from pydantic import UUID4, BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field
 
 from internal.domains.entities import CreateCommentPayload, UpdateCommentPayload
 
@@ -10,15 +10,14 @@ class CreateCommentRequestV1(BaseModel):
     post_id: str = Field(description="ID of the post")
 
     def validate_(self):
-        try:
-            UUID4(self.post_id)
-        except Exception as exc:
-            raise ValidationError(exc)
+        return self
 
-    def to_payload(self) -> CreateCommentPayload:
+    def to_payload(self, owner_id: str) -> CreateCommentPayload:
+        # post_id is parsed by the payload
         return CreateCommentPayload(
             text_content=self.text_content,
             post_id=self.post_id,
+            owner_id=owner_id,
         )
 
 
@@ -26,6 +25,9 @@ class UpdateCommentRequestV1(BaseModel):
     text_content: Optional[
         Annotated[str, Field(description="Text content of comment")]
     ] = None
+    version: Optional[
+        Annotated[int, Field(description="Version of the comment being edited")]
+    ] = None
 
     def validate_(self):
         return self
@@ -33,4 +35,5 @@ class UpdateCommentRequestV1(BaseModel):
     def to_payload(self) -> UpdateCommentPayload:
         return UpdateCommentPayload(
             text_content=self.text_content,
+            version=self.version,
         )
@@ -11,9 +11,10 @@ class CreatePostRequestV1(BaseModel):
     def validate_(self):
         return self
 
-    def to_payload(self) -> CreatePostPayload:
+    def to_payload(self, owner_id: str) -> CreatePostPayload:
         return CreatePostPayload(
             text_content=self.text_content,
+            owner_id=owner_id,
         )
 
 
@@ -21,6 +22,9 @@ class UpdatePostRequestV1(BaseModel):
     text_content: Optional[
         Annotated[str, Field(description="Text content of the post")]
     ] = None
+    version: Optional[
+        Annotated[int, Field(description="Version of the post being edited")]
+    ] = None
 
     def validate_(self):
         return self
@@ -28,4 +32,5 @@ class UpdatePostRequestV1(BaseModel):
     def to_payload(self) -> UpdatePostPayload:
         return UpdatePostPayload(
             text_content=self.text_content,
+            version=self.version,
         )
@@ -1,2 +1,3 @@
 from .comment import CreateCommentResourceV1, GetCommentResourceV1
 from .post import CreatePostResourceV1, GetPostResourceV1
+from .user import GetUserResourceV1
@@ -2,6 +2,8 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from internal.controllers.http.resources.post import GetPostResourceV1
+from internal.controllers.http.resources.user import GetUserResourceV1
 from internal.domains.entities import CommentEntity
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_dt_to_str
 
@@ -11,6 +13,7 @@ class CreateCommentResourceV1(BaseModel):
     text_content: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None
     post_id: Optional[str] = None
 
     def from_entity(self, entity: CommentEntity):
@@ -23,6 +26,7 @@ class CreateCommentResourceV1(BaseModel):
             self.updated_at = from_dt_to_str(
                 dt=entity.updated_at, format_=DATETIME_DEFAULT_FORMAT
             )
+        self.version = entity.version
         self.post_id = str(entity.post_id)
         return self
 
@@ -32,7 +36,10 @@ class GetCommentResourceV1(BaseModel):
     text_content: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None
     post_id: Optional[str] = None
+    owner: Optional[GetUserResourceV1] = None
+    post: Optional[GetPostResourceV1] = None
 
     def from_entity(self, entity: CommentEntity):
         self.id_ = str(entity.id_)
@@ -44,5 +51,10 @@ class GetCommentResourceV1(BaseModel):
             self.updated_at = from_dt_to_str(
                 dt=entity.updated_at, format_=DATETIME_DEFAULT_FORMAT
             )
+        self.version = entity.version
         self.post_id = str(entity.post_id)
+        if entity.owner:
+            self.owner = GetUserResourceV1().from_entity(entity=entity.owner)
+        if entity.post:
+            self.post = GetPostResourceV1().from_entity(entity=entity.post)
         return self
@@ -2,6 +2,7 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from internal.controllers.http.resources.user import GetUserResourceV1
 from internal.domains.entities import PostEntity
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_dt_to_str
 
@@ -11,6 +12,7 @@ class CreatePostResourceV1(BaseModel):
     text_content: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None
 
     def from_entity(self, entity: PostEntity):
         self.id_ = str(entity.id_)
@@ -22,6 +24,7 @@ class CreatePostResourceV1(BaseModel):
             self.updated_at = from_dt_to_str(
                 dt=entity.updated_at, format_=DATETIME_DEFAULT_FORMAT
             )
+        self.version = entity.version
         return self
 
 
@@ -30,6 +33,9 @@ class GetPostResourceV1(BaseModel):
     text_content: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None
+    comment_count: Optional[int] = None
+    owner: Optional[GetUserResourceV1] = None
 
     def from_entity(self, entity: PostEntity):
         self.id_ = str(entity.id_)
@@ -41,4 +47,8 @@ class GetPostResourceV1(BaseModel):
             self.updated_at = from_dt_to_str(
                 dt=entity.updated_at, format_=DATETIME_DEFAULT_FORMAT
             )
+        self.version = entity.version
+        self.comment_count = entity.comment_count
+        if entity.owner:
+            self.owner = GetUserResourceV1().from_entity(entity=entity.owner)
         return self
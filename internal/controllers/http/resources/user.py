@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from internal.domains.entities import UserEntity
+
+
+class GetUserResourceV1(BaseModel):
+    id_: Optional[str] = None
+    username: Optional[str] = None
+    post_count: Optional[int] = None
+    comment_count: Optional[int] = None
+
+    def from_entity(self, entity: UserEntity):
+        self.id_ = str(entity.id_)
+        self.username = entity.username
+        self.post_count = entity.post_count
+        self.comment_count = entity.comment_count
+        return self
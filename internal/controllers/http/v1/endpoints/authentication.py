@@ -2,8 +2,6 @@ from typing import Annotated
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Request
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import ORJSONResponse
 
 from internal.controllers.responses import DataResponse
 from internal.controllers.responses.error_code import (
@@ -11,6 +9,7 @@ from internal.controllers.responses.error_code import (
     invalid_webhook_secret_error,
     sync_webhook_event_fail,
 )
+from internal.controllers.responses.static import build_response
 from internal.controllers.responses.success_code import sync_webhook_event_success
 from internal.domains.errors import UnauthorizedWebhookException
 from internal.domains.services import AuthenticationSVC
@@ -43,7 +42,4 @@ async def sync_event_webhook(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
@@ -2,10 +2,14 @@ from typing import Annotated, Optional
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Request
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import ORJSONResponse
 from pydantic import UUID4, Field, ValidationError
 
+from internal.controllers.http.conditional import (
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
+from internal.controllers.http.params import parse_expand
 from internal.controllers.http.payloads import (
     CreateCommentRequestV1,
     UpdateCommentRequestV1,
@@ -22,20 +26,24 @@ from internal.controllers.responses.error_code import (
     create_comment_fail,
     delete_comment_fail,
     get_comment_fail,
+    update_comment_conflict,
     update_comment_fail,
 )
+from internal.controllers.responses.static import build_response, static_response
 from internal.controllers.responses.success_code import (
     create_comment_success,
     delete_comment_success,
     get_comment_success,
     update_comment_success,
 )
+from internal.domains.constants import ExpandField
 from internal.domains.entities import DeleteCommentPayload, GetMultiCommentsFilter
 from internal.domains.errors import (
     CreateCommentException,
     DeleteCommentException,
     GetCommentException,
     UnauthorizeException,
+    UpdateCommentConflictException,
     UpdateCommentException,
 )
 from internal.domains.services import CommentSVC
@@ -60,20 +68,13 @@ async def create(
         # get user id from context request
         user_id = ctx_req_.state.user_id
 
-        # validate request body
+        # validate request body, the payload parses its ids once
         try:
             req_.validate_()
+            payload = req_.to_payload(owner_id=user_id)
         except ValidationError as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
-
-        # convert request body to payload
-        payload = req_.to_payload()
-        payload.owner_id = str(user_id)
+            return static_response(message=common_validation_error)
 
         # execute
         (new_comment, error_) = await svc.create(payload=payload)
@@ -89,33 +90,45 @@ async def create(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
 
 
 @router.get("/{comment_id}", response_model=DataResponse)
 @inject
 async def get_by_id(
-    comment_id: str, svc: Annotated[CommentSVC, Depends(Provide[Container.comment_svc])]
+    ctx_req_: Request,
+    comment_id: str,
+    svc: Annotated[CommentSVC, Depends(Provide[Container.comment_svc])],
+    expand: Optional[
+        Annotated[str, Field(description="Comma separated, enum: owner, post")]
+    ] = None,
 ):
     # Default res
     res = DataResponse(message=common_internal_error)
+    etag: Optional[str] = None
     try:
         # validate request body
         try:
             UUID4(comment_id)
+            expand_ = parse_expand(
+                expand=expand, allowed=[ExpandField.OWNER, ExpandField.POST]
+            )
         except Exception as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
+
+        # answer conditional requests from the cheap revision probe,
+        # embedded entities are not covered by the revision
+        if_none_match = ctx_req_.headers.get("if-none-match")
+        if if_none_match and not expand_:
+            (revision, error_) = await svc.get_revision(id_=comment_id)
+            if not error_ and revision:
+                current_etag = make_etag(revision)
+                if etag_matches(if_none_match=if_none_match, etag=current_etag):
+                    return not_modified_response(etag=current_etag)
 
         # execute
-        (comment_, error_) = await svc.get_by_id(id_=comment_id)
+        (comment_, error_) = await svc.get_by_id(id_=comment_id, expand=expand_)
         if error_:
             if isinstance(error_, GetCommentException):
                 res = DataResponse(message=get_comment_fail)
@@ -123,20 +136,23 @@ async def get_by_id(
             resource = GetCommentResourceV1()
             resource.from_entity(entity=comment_)
             res = DataResponse(data=[resource], count=1, message=get_comment_success)
+            if not expand_:
+                etag = make_etag(comment_.revision)
 
     except Exception as exc:
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    response = build_response(res=res)
+    if etag:
+        response.headers["ETag"] = etag
+    return response
 
 
 @router.get("", response_model=DataResponse)
 @inject
 async def get_multi(
+    ctx_req_: Request,
     svc: Annotated[CommentSVC, Depends(Provide[Container.comment_svc])],
     sort_field: Annotated[
         str, Field(description="Enum: updated_at, created_at")
@@ -151,12 +167,19 @@ async def get_multi(
         Annotated[str, Field(description="yyyy-mm-ddThh:mm:ss.ffffff")]
     ] = None,
     post_id: Optional[str] = None,
+    expand: Optional[
+        Annotated[str, Field(description="Comma separated, enum: owner, post")]
+    ] = None,
 ):
     # Default res
     res = DataResponse(message=common_internal_error)
+    etag: Optional[str] = None
     try:
         # validate request body
         try:
+            expand_ = parse_expand(
+                expand=expand, allowed=[ExpandField.OWNER, ExpandField.POST]
+            )
             filter_ = GetMultiCommentsFilter(
                 sort_field=sort_field,
                 sort_order=sort_order,
@@ -167,35 +190,53 @@ async def get_multi(
                 post_id=post_id,
                 enable_count=True,
             )
-            filter_.validate_()
-        except ValidationError as exc:
+        except (ValidationError, ValueError) as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
 
-        # execute
-        ((comments_, count), error_) = await svc.get_multi(filter_=filter_)
+        # embedded entities are not covered by the revision
+        if expand_:
+            # execute
+            ((comments_, count), error_) = await svc.get_multi(
+                filter_=filter_, expand=expand_
+            )
+        else:
+            filter_key = filter_.model_dump_json()
+            # the revision probe answers conditional requests without the page
+            if_none_match = ctx_req_.headers.get("if-none-match")
+            if if_none_match:
+                ((revision, _), error_) = await svc.get_multi_revision(filter_=filter_)
+                if not error_:
+                    etag = make_etag(revision, filter_key)
+                    if etag_matches(if_none_match=if_none_match, etag=etag):
+                        return not_modified_response(etag=etag)
+
+            # execute, the ETag is made from the snapshot the page is read from
+            (
+                (revision, comments_, count),
+                error_,
+            ) = await svc.get_multi_with_revision(filter_=filter_)
+            etag = make_etag(revision, filter_key)
         if error_:
+            etag = None
             if isinstance(error_, GetCommentException):
                 res = DataResponse(message=get_comment_fail)
         else:
-            resource = GetCommentResourceV1()
             resources = [
-                resource.from_entity(entity=comment_) for comment_ in comments_
+                GetCommentResourceV1().from_entity(entity=comment_)
+                for comment_ in comments_
             ]
             res = DataResponse(data=resources, count=count, message=get_comment_success)
 
     except Exception as exc:
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
+        etag = None
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    response = build_response(res=res)
+    if etag:
+        response.headers["ETag"] = etag
+    return response
 
 
 @router.put("/{comment_id}", response_model=DataResponse)
@@ -218,11 +259,7 @@ async def update(
             req_.validate_()
         except Exception as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
 
         # convert request body to payload
         payload = req_.to_payload()
@@ -232,7 +269,9 @@ async def update(
         # execute
         error_ = await svc.update(payload=payload)
         if error_:
-            if isinstance(error_, UpdateCommentException):
+            if isinstance(error_, UpdateCommentConflictException):
+                res = DataResponse(message=update_comment_conflict)
+            elif isinstance(error_, UpdateCommentException):
                 res = DataResponse(message=update_comment_fail)
             elif isinstance(error_, UnauthorizeException):
                 res = DataResponse(message=common_no_permission_error)
@@ -243,10 +282,7 @@ async def update(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
 
 
 @router.delete("/{comment_id}", response_model=DataResponse)
@@ -267,11 +303,7 @@ async def delete(
             UUID4(comment_id)
         except Exception as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
 
         # build payload
         payload = DeleteCommentPayload(id_=comment_id, owner_id=str(user_id))
@@ -290,7 +322,4 @@ async def delete(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
@@ -2,10 +2,14 @@ from typing import Annotated, Optional
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Request
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import ORJSONResponse
 from pydantic import UUID4, Field, ValidationError
 
+from internal.controllers.http.conditional import (
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
+from internal.controllers.http.params import parse_expand
 from internal.controllers.http.payloads import CreatePostRequestV1, UpdatePostRequestV1
 from internal.controllers.http.resources import CreatePostResourceV1, GetPostResourceV1
 from internal.controllers.responses import DataResponse
@@ -16,20 +20,24 @@ from internal.controllers.responses.error_code import (
     create_post_fail,
     delete_post_fail,
     get_post_fail,
+    update_post_conflict,
     update_post_fail,
 )
+from internal.controllers.responses.static import build_response, static_response
 from internal.controllers.responses.success_code import (
     create_post_success,
     delete_post_success,
     get_post_success,
     update_post_success,
 )
+from internal.domains.constants import ExpandField
 from internal.domains.entities import DeletePostPayload, GetMultiPostsFilter
 from internal.domains.errors import (
     CreatePostException,
     DeletePostException,
     GetPostException,
     UnauthorizeException,
+    UpdatePostConflictException,
     UpdatePostException,
 )
 from internal.domains.services import PostSVC
@@ -54,20 +62,13 @@ async def create(
         # get user id from context request
         user_id = ctx_req_.state.user_id
 
-        # validate request body
+        # validate request body, the payload parses its ids once
         try:
             req_.validate_()
+            payload = req_.to_payload(owner_id=user_id)
         except ValidationError as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
-
-        # convert request body to payload
-        payload = req_.to_payload()
-        payload.owner_id = str(user_id)
+            return static_response(message=common_validation_error)
 
         # execute
         (new_post, error_) = await svc.create(payload=payload)
@@ -83,33 +84,43 @@ async def create(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
 
 
 @router.get("/{post_id}", response_model=DataResponse)
 @inject
 async def get_by_id(
-    post_id: str, svc: Annotated[PostSVC, Depends(Provide[Container.post_svc])]
+    ctx_req_: Request,
+    post_id: str,
+    svc: Annotated[PostSVC, Depends(Provide[Container.post_svc])],
+    expand: Optional[
+        Annotated[str, Field(description="Comma separated, enum: owner")]
+    ] = None,
 ):
     # Default res
     res = DataResponse(message=common_internal_error)
+    etag: Optional[str] = None
     try:
         # validate request body
         try:
             UUID4(post_id)
+            expand_ = parse_expand(expand=expand, allowed=[ExpandField.OWNER])
         except Exception as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
+
+        # answer conditional requests from the cheap revision probe,
+        # embedded entities are not covered by the revision
+        if_none_match = ctx_req_.headers.get("if-none-match")
+        if if_none_match and not expand_:
+            (revision, error_) = await svc.get_revision(id_=post_id)
+            if not error_ and revision:
+                current_etag = make_etag(revision)
+                if etag_matches(if_none_match=if_none_match, etag=current_etag):
+                    return not_modified_response(etag=current_etag)
 
         # execute
-        (post_, error_) = await svc.get_by_id(id_=post_id)
+        (post_, error_) = await svc.get_by_id(id_=post_id, expand=expand_)
         if error_:
             if isinstance(error_, GetPostException):
                 res = DataResponse(message=get_post_fail)
@@ -117,20 +128,23 @@ async def get_by_id(
             resource = GetPostResourceV1()
             resource.from_entity(entity=post_)
             res = DataResponse(data=[resource], count=1, message=get_post_success)
+            if not expand_:
+                etag = make_etag(post_.revision)
 
     except Exception as exc:
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    response = build_response(res=res)
+    if etag:
+        response.headers["ETag"] = etag
+    return response
 
 
 @router.get("", response_model=DataResponse)
 @inject
 async def get_multi(
+    ctx_req_: Request,
     svc: Annotated[PostSVC, Depends(Provide[Container.post_svc])],
     sort_field: Annotated[
         str, Field(description="Enum: updated_at, created_at")
@@ -144,12 +158,17 @@ async def get_multi(
     to_date: Optional[
         Annotated[str, Field(description="yyyy-mm-ddThh:mm:ss.ffffff")]
     ] = None,
+    expand: Optional[
+        Annotated[str, Field(description="Comma separated, enum: owner")]
+    ] = None,
 ):
     # Default res
     res = DataResponse(message=common_internal_error)
+    etag: Optional[str] = None
     try:
         # validate request body
         try:
+            expand_ = parse_expand(expand=expand, allowed=[ExpandField.OWNER])
             filter_ = GetMultiPostsFilter(
                 sort_field=sort_field,
                 sort_order=sort_order,
@@ -159,33 +178,52 @@ async def get_multi(
                 to_date=to_date,
                 enable_count=True,
             )
-            filter_.validate_()
-        except ValidationError as exc:
+        except (ValidationError, ValueError) as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
 
-        # execute
-        ((posts_, count), error_) = await svc.get_multi(filter_=filter_)
+        # embedded entities are not covered by the revision
+        if expand_:
+            # execute
+            ((posts_, count), error_) = await svc.get_multi(
+                filter_=filter_, expand=expand_
+            )
+        else:
+            filter_key = filter_.model_dump_json()
+            # the revision probe answers conditional requests without the page
+            if_none_match = ctx_req_.headers.get("if-none-match")
+            if if_none_match:
+                ((revision, _), error_) = await svc.get_multi_revision(filter_=filter_)
+                if not error_:
+                    etag = make_etag(revision, filter_key)
+                    if etag_matches(if_none_match=if_none_match, etag=etag):
+                        return not_modified_response(etag=etag)
+
+            # execute, the ETag is made from the snapshot the page is read from
+            (
+                (revision, posts_, count),
+                error_,
+            ) = await svc.get_multi_with_revision(filter_=filter_)
+            etag = make_etag(revision, filter_key)
         if error_:
+            etag = None
             if isinstance(error_, GetPostException):
                 res = DataResponse(message=get_post_fail)
         else:
-            resource = GetPostResourceV1()
-            resources = [resource.from_entity(entity=post_) for post_ in posts_]
+            resources = [
+                GetPostResourceV1().from_entity(entity=post_) for post_ in posts_
+            ]
             res = DataResponse(data=resources, count=count, message=get_post_success)
 
     except Exception as exc:
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
+        etag = None
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    response = build_response(res=res)
+    if etag:
+        response.headers["ETag"] = etag
+    return response
 
 
 @router.put("/{post_id}", response_model=DataResponse)
@@ -208,11 +246,7 @@ async def update(
             req_.validate_()
         except Exception as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
 
         # convert request body to payload
         payload = req_.to_payload()
@@ -222,7 +256,9 @@ async def update(
         # execute
         error_ = await svc.update(payload=payload)
         if error_:
-            if isinstance(error_, UpdatePostException):
+            if isinstance(error_, UpdatePostConflictException):
+                res = DataResponse(message=update_post_conflict)
+            elif isinstance(error_, UpdatePostException):
                 res = DataResponse(message=update_post_fail)
             elif isinstance(error_, UnauthorizeException):
                 res = DataResponse(message=common_no_permission_error)
@@ -233,10 +269,7 @@ async def update(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
 
 
 @router.delete("/{post_id}", response_model=DataResponse)
@@ -257,11 +290,7 @@ async def delete(
             UUID4(post_id)
         except Exception as exc:
             logger.error(exc)
-            res = DataResponse(message=common_validation_error)
-            return ORJSONResponse(
-                status_code=common_validation_error.status_code,
-                content=jsonable_encoder(res),
-            )
+            return static_response(message=common_validation_error)
 
         # build payload
         payload = DeletePostPayload(
@@ -283,7 +312,4 @@ async def delete(
         logger.error(exc)
         res = DataResponse(message=common_internal_error)
 
-    return ORJSONResponse(
-        status_code=res.message.status_code,
-        content=jsonable_encoder(res),
-    )
+    return build_response(res=res)
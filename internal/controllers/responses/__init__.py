@@ -1 +1,2 @@
 from .base import DataResponse, MessageResponse
+from .renderer import DataJSONResponse
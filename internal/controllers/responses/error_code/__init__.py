@@ -3,6 +3,7 @@ from .comment import (
     create_comment_fail,
     delete_comment_fail,
     get_comment_fail,
+    update_comment_conflict,
     update_comment_fail,
 )
 from .common import (
@@ -10,7 +11,15 @@ from .common import (
     common_invalid_token_error,
     common_missing_or_invalid_token_error,
     common_no_permission_error,
+    common_operation_in_progress_error,
+    common_service_unavailable_error,
     common_token_expired_error,
     common_validation_error,
 )
-from .post import create_post_fail, delete_post_fail, get_post_fail, update_post_fail
+from .post import (
+    create_post_fail,
+    delete_post_fail,
+    get_post_fail,
+    update_post_conflict,
+    update_post_fail,
+)
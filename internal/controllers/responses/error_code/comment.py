@@ -22,3 +22,8 @@ delete_comment_fail = MessageResponse(
     msg_name="Delete comment fail",
     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 )
+update_comment_conflict = MessageResponse(
+    msg_code="E205",
+    msg_name="Comment was modified by another request",
+    status_code=status.HTTP_409_CONFLICT,
+)
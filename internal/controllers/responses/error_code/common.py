@@ -32,3 +32,13 @@ common_no_permission_error = MessageResponse(
     msg_name="No permission",
     status_code=status.HTTP_401_UNAUTHORIZED,
 )
+common_service_unavailable_error = MessageResponse(
+    msg_code="E007",
+    msg_name="Service Unavailable",
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+)
+common_operation_in_progress_error = MessageResponse(
+    msg_code="E008",
+    msg_name="Operation already in progress",
+    status_code=status.HTTP_409_CONFLICT,
+)
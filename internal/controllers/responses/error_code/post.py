@@ -22,3 +22,8 @@ delete_post_fail = MessageResponse(
     msg_name="Delete post fail",
     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 )
+update_post_conflict = MessageResponse(
+    msg_code="E105",
+    msg_name="Post was modified by another request",
+    status_code=status.HTTP_409_CONFLICT,
+)
@@ -0,0 +1,15 @@
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class DataJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core in a single pass.
+
+    Response models (and plain dicts) go straight to bytes, UUID and datetime
+    included, without the ``jsonable_encoder`` walk and a second encode.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
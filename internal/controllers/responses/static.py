@@ -0,0 +1,64 @@
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, Iterator, Tuple
+
+from pydantic_core import to_json
+from starlette.responses import Response
+
+from internal.controllers.responses import error_code, success_code
+from internal.controllers.responses.base import DataResponse, MessageResponse
+from internal.controllers.responses.renderer import DataJSONResponse
+
+MEDIA_TYPE = "application/json"
+
+MessageKey = Tuple[str, str, int]
+
+
+def _key(message: MessageResponse) -> MessageKey:
+    return message.msg_code, message.msg_name, message.status_code
+
+
+def _collect(*modules: ModuleType) -> Iterator[MessageResponse]:
+    for module in modules:
+        for value in vars(module).values():
+            if isinstance(value, MessageResponse):
+                yield value
+
+
+# every declared message body, serialized once at import time
+_STATIC_BODIES: Dict[MessageKey, bytes] = {
+    _key(message): to_json(DataResponse(message=message))
+    for message in _collect(error_code, success_code)
+}
+
+
+@lru_cache(maxsize=256)
+def _dynamic_body(msg_code: str, msg_name: str, status_code: int) -> bytes:
+    return to_json(
+        DataResponse(
+            message=MessageResponse(
+                msg_code=msg_code, msg_name=msg_name, status_code=status_code
+            )
+        )
+    )
+
+
+def static_response(message: MessageResponse) -> Response:
+    """Serve a message-only body from pre-serialized bytes.
+
+    Messages that are not declared in ``error_code``/``success_code`` (e.g. the
+    details of an ``HTTPException``) are serialized once and kept in a bounded cache.
+    """
+    key = _key(message)
+    body = _STATIC_BODIES.get(key)
+    if body is None:
+        body = _dynamic_body(*key)
+    return Response(
+        content=body, status_code=message.status_code, media_type=MEDIA_TYPE
+    )
+
+
+def build_response(res: DataResponse) -> Response:
+    if res.data is None and res.count is None:
+        return static_response(message=res.message)
+    return DataJSONResponse(status_code=res.message.status_code, content=res)
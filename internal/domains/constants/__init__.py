@@ -1,2 +1,3 @@
 from .authentication import WebhookEventOperation, WebhookEventResource
+from .expand import ExpandField
 from .v1_authorization import V1ReBACObjectType, V1ReBACRelation
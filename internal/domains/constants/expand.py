@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ExpandField(str, Enum):
+    OWNER = "owner"
+    POST = "post"
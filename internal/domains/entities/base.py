@@ -0,0 +1,48 @@
+from typing import Any, ClassVar, Dict, FrozenSet, Self
+
+from pydantic import BaseModel
+
+_object_setattr = object.__setattr__
+
+
+class Entity(BaseModel):
+    """Base of the domain entities.
+
+    Entities built from untrusted input (request payloads, webhook events) are
+    validated as usual. Rows read back from the database are valid already,
+    ``from_trusted`` builds their entities without validation.
+    """
+
+    # every field in definition order with its default (PydanticUndefined when
+    # required), so from_trusted keeps the field order of model_dump
+    __trusted_defaults__: ClassVar[Dict[str, Any]] = {}
+    __trusted_required__: ClassVar[FrozenSet[str]] = frozenset()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__trusted_defaults__ = {
+            name: field.default for name, field in cls.model_fields.items()
+        }
+        cls.__trusted_required__ = frozenset(
+            name for name, field in cls.model_fields.items() if field.is_required()
+        )
+
+    @classmethod
+    def from_trusted(cls, **values: Any) -> Self:
+        """Build the entity from already valid values, skipping validation.
+
+        Sets the same instance state as ``model_construct`` without its per
+        field alias and default handling, which costs more than validating.
+        The entities have no extra fields and no private attributes. A missing
+        required field raises here rather than at serialization.
+        """
+        if not cls.__trusted_required__ <= values.keys():
+            missing = sorted(cls.__trusted_required__.difference(values))
+            raise TypeError(f"{cls.__name__} is missing required fields: {missing}")
+        entity = cls.__new__(cls)
+        _object_setattr(entity, "__dict__", {**cls.__trusted_defaults__, **values})
+        _object_setattr(entity, "__pydantic_fields_set__", set(values))
+        _object_setattr(entity, "__pydantic_extra__", None)
+        _object_setattr(entity, "__pydantic_private__", None)
+        return entity
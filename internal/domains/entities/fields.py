@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Annotated, Literal
+
+from pydantic import BeforeValidator
+
+from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
+
+
+def _parse_default_datetime(value: object) -> object:
+    # strings must be in DATETIME_DEFAULT_FORMAT, pydantic's own datetime
+    # parsing would also accept timestamps and offsets
+    if isinstance(value, str):
+        try:
+            return from_str_to_dt(str_time=value, format_=DATETIME_DEFAULT_FORMAT)
+        except Exception as exc:
+            raise ValueError(f"Invalid datetime: {value}") from exc
+    return value
+
+
+# a datetime parsed once from DATETIME_DEFAULT_FORMAT when the model is built
+DefaultDatetime = Annotated[datetime, BeforeValidator(_parse_default_datetime)]
+
+SortOrder = Literal["DESC", "ASC"]
@@ -3,16 +3,19 @@ from typing import Optional
 
 from pydantic import UUID4, BaseModel, ConfigDict, ValidationError
 
+from internal.domains.entities.base import Entity
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
 
 
-class UserEntity(BaseModel):
+class UserEntity(Entity):
     id_: UUID4
     username: str
     metadata_: Optional[dict] = None
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
+    post_count: int = 0
+    comment_count: int = 0
     model_config = ConfigDict(from_attributes=True)
 
     def to_dict(self, exclude_none: bool = False) -> dict:
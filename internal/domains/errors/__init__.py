@@ -15,12 +15,14 @@ from .comment import (
     CreateCommentException,
     DeleteCommentException,
     GetCommentException,
+    UpdateCommentConflictException,
     UpdateCommentException,
 )
 from .post import (
     CreatePostException,
     DeletePostException,
     GetPostException,
+    UpdatePostConflictException,
     UpdatePostException,
 )
 from .user import (
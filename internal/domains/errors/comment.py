@@ -10,5 +10,9 @@ class UpdateCommentException(Exception):
     pass
 
 
+class UpdateCommentConflictException(UpdateCommentException):
+    pass
+
+
 class DeleteCommentException(Exception):
     pass
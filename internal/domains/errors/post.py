@@ -10,5 +10,9 @@ class UpdatePostException(Exception):
     pass
 
 
+class UpdatePostConflictException(UpdatePostException):
+    pass
+
+
 class DeletePostException(Exception):
     pass
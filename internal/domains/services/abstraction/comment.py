@@ -19,16 +19,34 @@ class AbstractCommentSVC(abc.ABC):
 
     @abc.abstractmethod
     async def get_by_id(
-        self, id_: str
+        self, id_: str, expand: Optional[List[str]] = None
     ) -> Tuple[Optional[CommentEntity], Optional[Exception]]:
         raise NotImplementedError
 
     @abc.abstractmethod
     async def get_multi(
-        self, filter_: GetMultiCommentsFilter
+        self, filter_: GetMultiCommentsFilter, expand: Optional[List[str]] = None
     ) -> Tuple[Tuple[List[CommentEntity], Optional[int]], Optional[Exception]]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_revision(self, id_: str) -> Tuple[Optional[str], Optional[Exception]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_revision(
+        self, filter_: GetMultiCommentsFilter
+    ) -> Tuple[Tuple[Optional[str], Optional[int]], Optional[Exception]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_with_revision(
+        self, filter_: GetMultiCommentsFilter
+    ) -> Tuple[
+        Tuple[Optional[str], List[CommentEntity], Optional[int]], Optional[Exception]
+    ]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(self, payload: UpdateCommentPayload) -> Optional[Exception]:
         raise NotImplementedError
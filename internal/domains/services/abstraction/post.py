@@ -19,16 +19,34 @@ class AbstractPostSVC(abc.ABC):
 
     @abc.abstractmethod
     async def get_by_id(
-        self, id_: str
+        self, id_: str, expand: Optional[List[str]] = None
     ) -> Tuple[Optional[PostEntity], Optional[Exception]]:
         raise NotImplementedError
 
     @abc.abstractmethod
     async def get_multi(
-        self, filter_: GetMultiPostsFilter
+        self, filter_: GetMultiPostsFilter, expand: Optional[List[str]] = None
     ) -> Tuple[Tuple[List[PostEntity], Optional[int]], Optional[Exception]]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_revision(self, id_: str) -> Tuple[Optional[str], Optional[Exception]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_revision(
+        self, filter_: GetMultiPostsFilter
+    ) -> Tuple[Tuple[Optional[str], Optional[int]], Optional[Exception]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_with_revision(
+        self, filter_: GetMultiPostsFilter
+    ) -> Tuple[
+        Tuple[Optional[str], List[PostEntity], Optional[int]], Optional[Exception]
+    ]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(self, payload: UpdatePostPayload) -> Optional[Exception]:
         raise NotImplementedError
@@ -1,4 +1,4 @@
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 from fastapi import Request
 
@@ -22,18 +22,20 @@ from internal.infrastructures.relational_db.patterns import (
 )
 from utils.logger_utils import get_shared_logger
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_dt_to_str
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="AuthenticationSVC")
 class AuthenticationSVC(AbstractAuthenticationSVC):
     def __init__(
         self,
-        relational_db_uow: RelationalDBUnitOfWork,
+        relational_db_uow_factory: Callable[[], RelationalDBUnitOfWork],
         authentication_uc: AbstractAuthenticationUC,
         user_uc: AbstractUserUC,
     ):
-        self._relational_db_uow = relational_db_uow
+        self._relational_db_uow_factory = relational_db_uow_factory
         self._authentication_uc = authentication_uc
         self._user_uc = user_uc
 
@@ -119,7 +121,7 @@ class AuthenticationSVC(AbstractAuthenticationSVC):
                             ),
                         )
                         create_user_payload.validate_()
-                        async with self._relational_db_uow as session:
+                        async with self._relational_db_uow_factory() as session:
                             await self._user_uc.create(
                                 payload=create_user_payload, uow=session
                             )
@@ -134,12 +136,12 @@ class AuthenticationSVC(AbstractAuthenticationSVC):
                                 format_=DATETIME_DEFAULT_FORMAT,
                             ),
                         )
-                        async with self._relational_db_uow as session:
+                        async with self._relational_db_uow_factory() as session:
                             await self._user_uc.update(
                                 payload=update_user_payload, uow=session
                             )
                     elif event_payload.operation == WebhookEventOperation.DELETE:
-                        async with self._relational_db_uow as session:
+                        async with self._relational_db_uow_factory() as session:
                             await self._user_uc.delete(
                                 id_=event_payload.resource_detail.id_, uow=session
                             )
@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from internal.domains.constants import V1ReBACObjectType, V1ReBACRelation
 from internal.domains.entities import (
@@ -15,6 +15,7 @@ from internal.domains.errors import (
     CreatePermException,
     DeleteCommentException,
     GetCommentException,
+    GetPostException,
     GetUserException,
     UnauthorizeException,
     UpdateCommentException,
@@ -23,26 +24,31 @@ from internal.domains.services.abstraction.comment import AbstractCommentSVC
 from internal.domains.usecases.abstraction import (
     AbstractAuthorizationUC,
     AbstractCommentUC,
+    AbstractPostUC,
     AbstractUserUC,
 )
 from internal.infrastructures.relational_db.patterns import (
     AbstractUnitOfWork as RelationalDBUnitOfWork,
 )
 from utils.logger_utils import get_shared_logger
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="CommentSVC")
 class CommentSVC(AbstractCommentSVC):
     def __init__(
         self,
-        relational_db_uow: RelationalDBUnitOfWork,
+        relational_db_uow_factory: Callable[[], RelationalDBUnitOfWork],
         comment_uc: AbstractCommentUC,
+        post_uc: AbstractPostUC,
         user_uc: AbstractUserUC,
         authorization_uc: AbstractAuthorizationUC,
     ):
-        self._relational_db_uow = relational_db_uow
+        self._relational_db_uow_factory = relational_db_uow_factory
         self._comment_uc = comment_uc
+        self._post_uc = post_uc
         self._user_uc = user_uc
         self._authorization_uc = authorization_uc
 
@@ -52,15 +58,17 @@ class CommentSVC(AbstractCommentSVC):
         new_comment: Optional[CommentEntity] = None
         error: Optional[Exception] = None
 
-        if not payload.owner_id or payload.owner_id == "":
+        if not payload.owner_id:
             return None, CreateCommentException("Missing owner id")
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
+                # the locks keep the owner and the post from being deleted until
+                # the comment is committed, see UserSVC.delete and PostSVC.delete
                 try:
-                    exited_user = await self._user_uc.get_by_id(
-                        id_=payload.owner_id, uow=session
+                    exited_user = await self._user_uc.lock_for_update(
+                        id_=str(payload.owner_id), uow=session
                     )
                     if not exited_user:
                         return None, CreateCommentException(
@@ -69,6 +77,17 @@ class CommentSVC(AbstractCommentSVC):
                 except GetUserException as exc:
                     raise CreateCommentException(exc)
 
+                try:
+                    existed_post = await self._post_uc.lock_for_update(
+                        id_=str(payload.post_id), uow=session
+                    )
+                    if not existed_post:
+                        return None, CreateCommentException(
+                            f"Not found post: {payload.post_id}"
+                        )
+                except GetPostException as exc:
+                    raise CreateCommentException(exc)
+
                 new_comment = await self._comment_uc.create(
                     payload=payload, uow=session
                 )
@@ -94,15 +113,17 @@ class CommentSVC(AbstractCommentSVC):
         return new_comment, error
 
     async def get_by_id(
-        self, id_: str
+        self, id_: str, expand: Optional[List[str]] = None
     ) -> Tuple[Optional[CommentEntity], Optional[Exception]]:
         comment: Optional[CommentEntity] = None
         error: Optional[Exception] = None
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
-                comment = await self._comment_uc.get_by_id(id_=id_, uow=session)
+            async with self._relational_db_uow_factory() as session:
+                comment = await self._comment_uc.get_by_id(
+                    id_=id_, uow=session, expand=expand
+                )
         except GetCommentException as exc:
             logger.error(exc)
             error = exc
@@ -110,15 +131,77 @@ class CommentSVC(AbstractCommentSVC):
         return comment, error
 
     async def get_multi(
-        self, filter_: GetMultiCommentsFilter
+        self, filter_: GetMultiCommentsFilter, expand: Optional[List[str]] = None
     ) -> Tuple[Tuple[List[CommentEntity], Optional[int]], Optional[Exception]]:
         res: Tuple[List[CommentEntity], Optional[int]] = ([], None)
         error: Optional[Exception] = None
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
-                res = await self._comment_uc.get_multi(filter_=filter_, uow=session)
+            async with self._relational_db_uow_factory() as session:
+                res = await self._comment_uc.get_multi(
+                    filter_=filter_, uow=session, expand=expand
+                )
+        except GetCommentException as exc:
+            logger.error(exc)
+            error = exc
+
+        return res, error
+
+    async def get_revision(self, id_: str) -> Tuple[Optional[str], Optional[Exception]]:
+        revision: Optional[str] = None
+        error: Optional[Exception] = None
+
+        try:
+            # start transaction
+            async with self._relational_db_uow_factory() as session:
+                revision = await self._comment_uc.get_revision(id_=id_, uow=session)
+        except GetCommentException as exc:
+            logger.error(exc)
+            error = exc
+
+        return revision, error
+
+    async def get_multi_revision(
+        self, filter_: GetMultiCommentsFilter
+    ) -> Tuple[Tuple[Optional[str], Optional[int]], Optional[Exception]]:
+        res: Tuple[Optional[str], Optional[int]] = (None, None)
+        error: Optional[Exception] = None
+
+        try:
+            # start transaction
+            async with self._relational_db_uow_factory() as session:
+                res = await self._comment_uc.get_multi_revision(
+                    filter_=filter_, uow=session
+                )
+        except GetCommentException as exc:
+            logger.error(exc)
+            error = exc
+
+        return res, error
+
+    async def get_multi_with_revision(
+        self, filter_: GetMultiCommentsFilter
+    ) -> Tuple[
+        Tuple[Optional[str], List[CommentEntity], Optional[int]], Optional[Exception]
+    ]:
+        res: Tuple[Optional[str], List[CommentEntity], Optional[int]] = (None, [], None)
+        error: Optional[Exception] = None
+
+        try:
+            # start transaction, the revision and the page are read from one
+            # snapshot so the revision describes the returned page
+            async with self._relational_db_uow_factory() as session:
+                await session.begin_snapshot()
+                revision, total_count = await self._comment_uc.get_multi_revision(
+                    filter_=filter_, uow=session
+                )
+                # the revision probe already counted the rows
+                comments, _ = await self._comment_uc.get_multi(
+                    filter_=filter_.model_copy(update={"enable_count": False}),
+                    uow=session,
+                )
+                res = (revision, comments, total_count)
         except GetCommentException as exc:
             logger.error(exc)
             error = exc
@@ -146,7 +229,7 @@ class CommentSVC(AbstractCommentSVC):
                 raise UpdateCommentException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 try:
                     exited_user = await self._user_uc.get_by_id(
                         id_=payload.owner_id, uow=session
@@ -187,7 +270,7 @@ class CommentSVC(AbstractCommentSVC):
                 raise DeleteCommentException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 try:
                     exited_user = await self._user_uc.get_by_id(
                         id_=payload.owner_id, uow=session
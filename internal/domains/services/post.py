@@ -1,12 +1,9 @@
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from internal.domains.constants import V1ReBACObjectType, V1ReBACRelation
 from internal.domains.entities import (
-    CommentEntity,
     CreatePostPayload,
-    DeleteCommentPayload,
     DeletePostPayload,
-    GetMultiCommentsFilter,
     GetMultiPostsFilter,
     PermEntity,
     PostEntity,
@@ -18,7 +15,6 @@ from internal.domains.errors import (
     CreatePostException,
     DeleteCommentException,
     DeletePostException,
-    GetCommentException,
     GetPostException,
     GetUserException,
     UnauthorizeException,
@@ -35,20 +31,22 @@ from internal.infrastructures.relational_db.patterns import (
     AbstractUnitOfWork as RelationalDBUnitOfWork,
 )
 from utils.logger_utils import get_shared_logger
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="PostSVC")
 class PostSVC(AbstractPostSVC):
     def __init__(
         self,
-        relational_db_uow: RelationalDBUnitOfWork,
+        relational_db_uow_factory: Callable[[], RelationalDBUnitOfWork],
         post_uc: AbstractPostUC,
         comment_uc: AbstractCommentUC,
         user_uc: AbstractUserUC,
         authorization_uc: AbstractAuthorizationUC,
     ):
-        self._relational_db_uow = relational_db_uow
+        self._relational_db_uow_factory = relational_db_uow_factory
         self._post_uc = post_uc
         self._comment_uc = comment_uc
         self._user_uc = user_uc
@@ -60,15 +58,17 @@ class PostSVC(AbstractPostSVC):
         new_post: Optional[PostEntity] = None
         error: Optional[Exception] = None
 
-        if not payload.owner_id or payload.owner_id == "":
+        if not payload.owner_id:
             return None, CreatePostException("Missing owner id")
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
+                # the lock keeps the owner from being deleted until the post is
+                # committed, see UserSVC.delete
                 try:
-                    exited_user = await self._user_uc.get_by_id(
-                        id_=payload.owner_id, uow=session
+                    exited_user = await self._user_uc.lock_for_update(
+                        id_=str(payload.owner_id), uow=session
                     )
                     if not exited_user:
                         return None, CreatePostException(
@@ -101,15 +101,17 @@ class PostSVC(AbstractPostSVC):
         return new_post, error
 
     async def get_by_id(
-        self, id_: str
+        self, id_: str, expand: Optional[List[str]] = None
     ) -> Tuple[Optional[PostEntity], Optional[Exception]]:
         post: Optional[PostEntity] = None
         error: Optional[Exception] = None
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
-                post = await self._post_uc.get_by_id(id_=id_, uow=session)
+            async with self._relational_db_uow_factory() as session:
+                post = await self._post_uc.get_by_id(
+                    id_=id_, uow=session, expand=expand
+                )
         except GetPostException as exc:
             logger.error(exc)
             error = exc
@@ -117,15 +119,77 @@ class PostSVC(AbstractPostSVC):
         return post, error
 
     async def get_multi(
-        self, filter_: GetMultiPostsFilter
+        self, filter_: GetMultiPostsFilter, expand: Optional[List[str]] = None
     ) -> Tuple[Tuple[List[PostEntity], Optional[int]], Optional[Exception]]:
         res: Tuple[List[PostEntity], Optional[int]] = ([], None)
         error: Optional[Exception] = None
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
-                res = await self._post_uc.get_multi(filter_=filter_, uow=session)
+            async with self._relational_db_uow_factory() as session:
+                res = await self._post_uc.get_multi(
+                    filter_=filter_, uow=session, expand=expand
+                )
+        except GetPostException as exc:
+            logger.error(exc)
+            error = exc
+
+        return res, error
+
+    async def get_revision(self, id_: str) -> Tuple[Optional[str], Optional[Exception]]:
+        revision: Optional[str] = None
+        error: Optional[Exception] = None
+
+        try:
+            # start transaction
+            async with self._relational_db_uow_factory() as session:
+                revision = await self._post_uc.get_revision(id_=id_, uow=session)
+        except GetPostException as exc:
+            logger.error(exc)
+            error = exc
+
+        return revision, error
+
+    async def get_multi_revision(
+        self, filter_: GetMultiPostsFilter
+    ) -> Tuple[Tuple[Optional[str], Optional[int]], Optional[Exception]]:
+        res: Tuple[Optional[str], Optional[int]] = (None, None)
+        error: Optional[Exception] = None
+
+        try:
+            # start transaction
+            async with self._relational_db_uow_factory() as session:
+                res = await self._post_uc.get_multi_revision(
+                    filter_=filter_, uow=session
+                )
+        except GetPostException as exc:
+            logger.error(exc)
+            error = exc
+
+        return res, error
+
+    async def get_multi_with_revision(
+        self, filter_: GetMultiPostsFilter
+    ) -> Tuple[
+        Tuple[Optional[str], List[PostEntity], Optional[int]], Optional[Exception]
+    ]:
+        res: Tuple[Optional[str], List[PostEntity], Optional[int]] = (None, [], None)
+        error: Optional[Exception] = None
+
+        try:
+            # start transaction, the revision and the page are read from one
+            # snapshot so the revision describes the returned page
+            async with self._relational_db_uow_factory() as session:
+                await session.begin_snapshot()
+                revision, total_count = await self._post_uc.get_multi_revision(
+                    filter_=filter_, uow=session
+                )
+                # the revision probe already counted the rows
+                posts, _ = await self._post_uc.get_multi(
+                    filter_=filter_.model_copy(update={"enable_count": False}),
+                    uow=session,
+                )
+                res = (revision, posts, total_count)
         except GetPostException as exc:
             logger.error(exc)
             error = exc
@@ -153,7 +217,7 @@ class PostSVC(AbstractPostSVC):
                 raise UpdatePostException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 try:
                     exited_user = await self._user_uc.get_by_id(
                         id_=payload.owner_id, uow=session
@@ -194,7 +258,7 @@ class PostSVC(AbstractPostSVC):
                 raise DeletePostException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 try:
                     exited_user = await self._user_uc.get_by_id(
                         id_=payload.owner_id, uow=session
@@ -206,35 +270,18 @@ class PostSVC(AbstractPostSVC):
                 except GetUserException as exc:
                     raise DeletePostException(exc)
 
-                # get all comments of this post
+                # delete this post first, its row lock waits for the comments
+                # being created on it, which the delete below then sees
+                await self._post_uc.delete(payload=payload, uow=session)
+
+                # delete all comments of this post in one statement
                 try:
-                    comments: List[CommentEntity] = []
-                    (comments, _) = await self._comment_uc.get_multi(
-                        filter_=GetMultiCommentsFilter(
-                            enable_count=False,
-                            post_id=payload.id_,
-                        ),
-                        uow=session,
+                    await self._comment_uc.delete_by_posts(
+                        post_ids=[payload.id_], uow=session
                     )
-                except GetCommentException as exc:
+                except DeleteCommentException as exc:
                     raise DeletePostException(exc)
 
-                # delete one by one comment
-                for comment in comments:
-                    try:
-                        delete_comment_payload = DeleteCommentPayload(
-                            id_=str(comment.id_),
-                            owner_id=payload.owner_id,
-                        )
-                        await self._comment_uc.delete(
-                            payload=delete_comment_payload, uow=session
-                        )
-                    except DeleteCommentException as exc:
-                        raise DeletePostException(exc)
-
-                # delete this post
-                await self._post_uc.delete(payload=payload, uow=session)
-
         except DeletePostException as exc:
             logger.error(exc)
             error = exc
@@ -1,15 +1,9 @@
-from typing import List, Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 from internal.domains.constants import V1ReBACObjectType, V1ReBACRelation
 from internal.domains.entities import (
-    CommentEntity,
     CreateUserPayload,
-    DeleteCommentPayload,
-    DeletePostPayload,
-    GetMultiCommentsFilter,
-    GetMultiPostsFilter,
     PermEntity,
-    PostEntity,
     UpdateUserPayload,
     UserEntity,
 )
@@ -20,8 +14,6 @@ from internal.domains.errors import (
     DeleteCommentException,
     DeletePostException,
     DeleteUserException,
-    GetCommentException,
-    GetPostException,
     GetUserException,
     UnauthorizeException,
     UpdateUserException,
@@ -37,20 +29,22 @@ from internal.infrastructures.relational_db.patterns import (
     AbstractUnitOfWork as RelationalDBUnitOfWork,
 )
 from utils.logger_utils import get_shared_logger
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="UserSVC")
 class UserSVC(AbstractUserSVC):
     def __init__(
         self,
-        relational_db_uow: RelationalDBUnitOfWork,
+        relational_db_uow_factory: Callable[[], RelationalDBUnitOfWork],
         user_uc: AbstractUserUC,
         post_uc: AbstractPostUC,
         comment_uc: AbstractCommentUC,
         authorization_uc: AbstractAuthorizationUC,
     ):
-        self._relational_db_uow = relational_db_uow
+        self._relational_db_uow_factory = relational_db_uow_factory
         self._user_uc = user_uc
         self._post_uc = post_uc
         self._comment_uc = comment_uc
@@ -64,7 +58,7 @@ class UserSVC(AbstractUserSVC):
 
         try:
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 new_user = await self._user_uc.create(payload=payload, uow=session)
 
                 # set owner permission
@@ -108,7 +102,7 @@ class UserSVC(AbstractUserSVC):
                 raise GetUserException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 user = await self._user_uc.get_by_id(id_=id_, uow=session)
         except GetUserException as exc:
             logger.error(exc)
@@ -134,7 +128,7 @@ class UserSVC(AbstractUserSVC):
                 raise UpdateUserException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
+            async with self._relational_db_uow_factory() as session:
                 await self._user_uc.update(payload=payload, uow=session)
         except UpdateUserException as exc:
             logger.error(exc)
@@ -159,62 +153,28 @@ class UserSVC(AbstractUserSVC):
                 raise DeleteUserException(exc)
 
             # start transaction
-            async with self._relational_db_uow as session:
-                # get all comments of this user
+            async with self._relational_db_uow_factory() as session:
+                # delete this user first, its row lock waits for the posts and
+                # comments being created for it, which the deletes below then see
+                await self._user_uc.delete(id_=id_, uow=session)
+
+                # delete all comments of this user in one statement
                 try:
-                    comments: List[CommentEntity] = []
-                    (comments, _) = await self._comment_uc.get_multi(
-                        filter_=GetMultiCommentsFilter(
-                            enable_count=False,
-                            owner_id=id_,
-                        ),
-                        uow=session,
-                    )
-                except GetCommentException as exc:
+                    await self._comment_uc.delete_by_owner(owner_id=id_, uow=session)
+                except DeleteCommentException as exc:
                     raise DeleteUserException(exc)
 
-                # delete one by one comment
-                for comment in comments:
-                    try:
-                        delete_comment_payload = DeleteCommentPayload(
-                            id_=str(comment.id_),
-                            owner_id=id_,
-                        )
-                        await self._comment_uc.delete(
-                            payload=delete_comment_payload, uow=session
-                        )
-                    except DeleteCommentException as exc:
-                        raise DeleteUserException(exc)
-
-                # get all posts of this user
+                # delete all posts of this user and the comments left on them
                 try:
-                    posts: List[PostEntity] = []
-                    (posts, _) = await self._post_uc.get_multi(
-                        filter_=GetMultiPostsFilter(
-                            enable_count=False,
-                            owner_id=id_,
-                        ),
-                        uow=session,
+                    posts = await self._post_uc.delete_by_owner(
+                        owner_id=id_, uow=session
                     )
-                except GetPostException as exc:
+                    await self._comment_uc.delete_by_posts(
+                        post_ids=[str(post.id_) for post in posts], uow=session
+                    )
+                except (DeletePostException, DeleteCommentException) as exc:
                     raise DeleteUserException(exc)
 
-                # delete one by one post
-                for post in posts:
-                    try:
-                        delete_post_payload = DeletePostPayload(
-                            id_=str(post.id_),
-                            owner_id=id_,
-                        )
-                        await self._post_uc.delete(
-                            payload=delete_post_payload, uow=session
-                        )
-                    except DeletePostException as exc:
-                        raise DeleteUserException(exc)
-
-                # delete this user
-                await self._user_uc.delete(id_=id_, uow=session)
-
         except DeleteUserException as exc:
             logger.error(exc)
             error = exc
@@ -24,7 +24,10 @@ class AbstractCommentUC(abc.ABC):
 
     @abc.abstractmethod
     async def get_by_id(
-        self, id_: str, uow: RelationalDBUnitOfWork
+        self,
+        id_: str,
+        uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Optional[CommentEntity]:
         raise NotImplementedError
 
@@ -33,9 +36,22 @@ class AbstractCommentUC(abc.ABC):
         self,
         filter_: GetMultiCommentsFilter,
         uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Tuple[List[CommentEntity], Optional[int]]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_revision(
+        self, id_: str, uow: RelationalDBUnitOfWork
+    ) -> Optional[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_revision(
+        self, filter_: GetMultiCommentsFilter, uow: RelationalDBUnitOfWork
+    ) -> Tuple[str, int]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(
         self,
@@ -51,3 +67,19 @@ class AbstractCommentUC(abc.ABC):
         uow: RelationalDBUnitOfWork,
     ):
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_by_posts(
+        self,
+        post_ids: List[str],
+        uow: RelationalDBUnitOfWork,
+    ) -> List[CommentEntity]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_by_owner(
+        self,
+        owner_id: str,
+        uow: RelationalDBUnitOfWork,
+    ) -> List[CommentEntity]:
+        raise NotImplementedError
@@ -22,16 +22,38 @@ class AbstractPostUC(abc.ABC):
 
     @abc.abstractmethod
     async def get_by_id(
-        self, id_: str, uow: RelationalDBUnitOfWork
+        self,
+        id_: str,
+        uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Optional[PostEntity]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def lock_for_update(self, id_: str, uow: RelationalDBUnitOfWork) -> bool:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_multi(
-        self, filter_: GetMultiPostsFilter, uow: RelationalDBUnitOfWork
+        self,
+        filter_: GetMultiPostsFilter,
+        uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Tuple[List[PostEntity], Optional[int]]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_revision(
+        self, id_: str, uow: RelationalDBUnitOfWork
+    ) -> Optional[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_revision(
+        self, filter_: GetMultiPostsFilter, uow: RelationalDBUnitOfWork
+    ) -> Tuple[str, int]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(self, payload: UpdatePostPayload, uow: RelationalDBUnitOfWork):
         raise NotImplementedError
@@ -39,3 +61,9 @@ class AbstractPostUC(abc.ABC):
     @abc.abstractmethod
     async def delete(self, payload: DeletePostPayload, uow: RelationalDBUnitOfWork):
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_by_owner(
+        self, owner_id: str, uow: RelationalDBUnitOfWork
+    ) -> List[PostEntity]:
+        raise NotImplementedError
@@ -20,6 +20,10 @@ class AbstractUserUC(abc.ABC):
     ) -> Optional[UserEntity]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def lock_for_update(self, id_: str, uow: RelationalDBUnitOfWork) -> bool:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(self, payload: UpdateUserPayload, uow: RelationalDBUnitOfWork):
         raise NotImplementedError
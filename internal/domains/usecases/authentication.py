@@ -12,10 +12,12 @@ from internal.infrastructures.external_authentication_service.abstraction import
     AbstractExternalAuthenticationSVC,
 )
 from utils.logger_utils import get_shared_logger
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="AuthenticationUC")
 class AuthenticationUC(AbstractAuthenticationUC):
     def __init__(self, external_authentication_svc: AbstractExternalAuthenticationSVC):
         self._external_authentication_svc = external_authentication_svc
@@ -11,10 +11,12 @@ from internal.infrastructures.external_rebac_authorization_service.abstraction i
     AbstractExternalReBACAuthorizationSVC,
 )
 from utils.logger_utils import get_shared_logger
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="AuthorizationUC")
 class AuthorizationUC(AbstractAuthorizationUC):
     def __init__(
         self, external_authorization_svc: AbstractExternalReBACAuthorizationSVC
@@ -1,9 +1,11 @@
 import uuid
+from collections import Counter
 from datetime import UTC, datetime
 from typing import List, Optional, Tuple
 
 from pydantic import UUID4
 
+from internal.domains.constants import ExpandField
 from internal.domains.entities import (
     CommentEntity,
     CreateCommentPayload,
@@ -15,18 +17,22 @@ from internal.domains.errors import (
     CreateCommentException,
     DeleteCommentException,
     GetCommentException,
+    UpdateCommentConflictException,
     UpdateCommentException,
 )
 from internal.domains.usecases.abstraction import AbstractCommentUC
+from internal.domains.usecases.loaders import RelationalDBLoaders
 from internal.infrastructures.relational_db.patterns import (
     AbstractUnitOfWork as RelationalDBUnitOfWork,
 )
 from utils.logger_utils import get_shared_logger
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="CommentUC")
 class CommentUC(AbstractCommentUC):
     def __init__(self):
         pass
@@ -39,34 +45,43 @@ class CommentUC(AbstractCommentUC):
         try:
             session = uow.comment_repo
 
+            # ids and dates were parsed when the payload was built
             entity = CommentEntity(
-                id_=uuid.uuid4(),
+                id_=payload.id_ or uuid.uuid4(),
                 text_content=payload.text_content,
-                created_at=datetime.now(tz=UTC),
-                post_id=UUID4(payload.post_id),
-                owner_id=UUID4(payload.owner_id),
+                created_at=payload.created_at or datetime.now(tz=UTC),
+                post_id=payload.post_id,
+                owner_id=payload.owner_id,
             )
-            if payload.id_:
-                entity.id_ = UUID4(payload.id_)
-            if payload.created_at:
-                entity.created_at = from_str_to_dt(
-                    str_time=payload.created_at, format_=DATETIME_DEFAULT_FORMAT
-                )
 
             new_id = await session.create(entity=entity)
 
+            # keep the counter caches in step within the same transaction
+            await uow.post_repo.increase_comment_count(deltas={entity.post_id: 1})
+            await uow.user_repo.increase_comment_count(deltas={entity.owner_id: 1})
+
             return await session.get_by_id(id_=new_id)
         except Exception as exc:
             logger.error(exc)
             raise CreateCommentException(exc)
 
     async def get_by_id(
-        self, id_: str, uow: Optional[RelationalDBUnitOfWork] = None
+        self,
+        id_: str,
+        uow: Optional[RelationalDBUnitOfWork] = None,
+        expand: Optional[List[str]] = None,
     ) -> Optional[CommentEntity]:
         try:
             session = uow.comment_repo
 
-            return await session.get_by_id(id_=UUID4(id_))
+            comment = await session.get_by_id(id_=UUID4(id_))
+            if comment and expand:
+                await self._expand(
+                    comments=[comment],
+                    expand=expand,
+                    loaders=RelationalDBLoaders(uow=uow),
+                )
+            return comment
         except Exception as exc:
             logger.error(exc)
             raise GetCommentException(exc)
@@ -75,11 +90,41 @@ class CommentUC(AbstractCommentUC):
         self,
         filter_: GetMultiCommentsFilter,
         uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Tuple[List[CommentEntity], Optional[int]]:
         try:
             session = uow.comment_repo
 
-            return await session.get_multi(filter_=filter_)
+            (comments, total_count) = await session.get_multi(filter_=filter_)
+            if comments and expand:
+                await self._expand(
+                    comments=comments,
+                    expand=expand,
+                    loaders=RelationalDBLoaders(uow=uow),
+                )
+            return comments, total_count
+        except Exception as exc:
+            logger.error(exc)
+            raise GetCommentException(exc)
+
+    async def get_revision(
+        self, id_: str, uow: RelationalDBUnitOfWork
+    ) -> Optional[str]:
+        try:
+            session = uow.comment_repo
+
+            return await session.get_revision(id_=UUID4(id_))
+        except Exception as exc:
+            logger.error(exc)
+            raise GetCommentException(exc)
+
+    async def get_multi_revision(
+        self, filter_: GetMultiCommentsFilter, uow: RelationalDBUnitOfWork
+    ) -> Tuple[str, int]:
+        try:
+            session = uow.comment_repo
+
+            return await session.get_multi_revision(filter_=filter_)
         except Exception as exc:
             logger.error(exc)
             raise GetCommentException(exc)
@@ -92,6 +137,25 @@ class CommentUC(AbstractCommentUC):
         try:
             session = uow.comment_repo
 
+            values = {"updated_at": datetime.now(tz=UTC)}
+            if payload.text_content:
+                values["text_content"] = payload.text_content
+            if payload.updated_at:
+                values["updated_at"] = from_str_to_dt(
+                    str_time=payload.updated_at, format_=DATETIME_DEFAULT_FORMAT
+                )
+
+            # ownership and version are checked by the update statement itself
+            updated_comment = await session.update_by_owner(
+                id_=UUID4(payload.id_),
+                owner_id=UUID4(payload.owner_id),
+                values=values,
+                version=payload.version,
+            )
+            if updated_comment:
+                return
+
+            # nothing matched, find out why
             existed_comment = await session.get_by_id(id_=UUID4(payload.id_))
             if not existed_comment:
                 raise Exception(f"Not found comment: {payload.id_}")
@@ -99,22 +163,13 @@ class CommentUC(AbstractCommentUC):
             if str(existed_comment.owner_id) != payload.owner_id:
                 raise Exception(f"{payload.owner_id} is not owner of this comment")
 
-            entity = CommentEntity(
-                id_=UUID4(payload.id_),
-                text_content=existed_comment.text_content,
-                created_at=existed_comment.created_at,
-                updated_at=datetime.now(tz=UTC),
-                post_id=existed_comment.post_id,
-                owner_id=existed_comment.owner_id,
+            raise UpdateCommentConflictException(
+                f"Comment {payload.id_} is at version {existed_comment.version}, "
+                f"expected {payload.version}"
             )
-            if payload.text_content:
-                entity.text_content = payload.text_content
-            if payload.updated_at:
-                entity.updated_at = from_str_to_dt(
-                    str_time=payload.updated_at, format_=DATETIME_DEFAULT_FORMAT
-                )
-
-            await session.update(entity=entity)
+        except UpdateCommentConflictException as exc:
+            logger.error(exc)
+            raise
         except Exception as exc:
             logger.error(exc)
             raise UpdateCommentException(exc)
@@ -127,14 +182,84 @@ class CommentUC(AbstractCommentUC):
         try:
             session = uow.comment_repo
 
+            deleted_comment = await session.delete_by_owner(
+                id_=UUID4(payload.id_), owner_id=UUID4(payload.owner_id)
+            )
+            if deleted_comment:
+                await self._decrease_counters(comments=[deleted_comment], uow=uow)
+                return
+
+            # nothing matched, find out why
             existed_comment = await session.get_by_id(id_=UUID4(payload.id_))
             if not existed_comment:
                 raise Exception(f"Not found comment: {payload.id_}")
 
-            if str(existed_comment.owner_id) != payload.owner_id:
-                raise Exception(f"{payload.owner_id} is not owner of this comment")
+            raise Exception(f"{payload.owner_id} is not owner of this comment")
+        except Exception as exc:
+            logger.error(exc)
+            raise DeleteCommentException(exc)
+
+    async def delete_by_posts(
+        self,
+        post_ids: List[str],
+        uow: RelationalDBUnitOfWork,
+    ) -> List[CommentEntity]:
+        try:
+            if not post_ids:
+                return []
 
-            await session.delete(id_=UUID4(payload.id_))
+            deleted_comments = await uow.comment_repo.delete_multi(
+                post_ids=[UUID4(id_) for id_ in post_ids]
+            )
+            await self._decrease_counters(comments=deleted_comments, uow=uow)
+            return deleted_comments
+        except Exception as exc:
+            logger.error(exc)
+            raise DeleteCommentException(exc)
+
+    async def delete_by_owner(
+        self,
+        owner_id: str,
+        uow: RelationalDBUnitOfWork,
+    ) -> List[CommentEntity]:
+        try:
+            deleted_comments = await uow.comment_repo.delete_multi(
+                owner_id=UUID4(owner_id)
+            )
+            await self._decrease_counters(comments=deleted_comments, uow=uow)
+            return deleted_comments
         except Exception as exc:
             logger.error(exc)
             raise DeleteCommentException(exc)
+
+    @staticmethod
+    async def _expand(
+        comments: List[CommentEntity],
+        expand: List[str],
+        loaders: RelationalDBLoaders,
+    ):
+        if ExpandField.OWNER.value in expand:
+            owners = await loaders.users.load_many(
+                keys=[comment.owner_id for comment in comments]
+            )
+            for comment in comments:
+                comment.owner = owners[comment.owner_id]
+        if ExpandField.POST.value in expand:
+            posts = await loaders.posts.load_many(
+                keys=[comment.post_id for comment in comments]
+            )
+            for comment in comments:
+                comment.post = posts[comment.post_id]
+
+    @staticmethod
+    async def _decrease_counters(
+        comments: List[CommentEntity], uow: RelationalDBUnitOfWork
+    ):
+        post_deltas: Counter = Counter()
+        owner_deltas: Counter = Counter()
+        for comment in comments:
+            post_deltas[comment.post_id] -= 1
+            owner_deltas[comment.owner_id] -= 1
+
+        await uow.post_repo.increase_comment_count(deltas=post_deltas)
+        await uow.user_repo.increase_comment_count(deltas=owner_deltas)
@@ -0,0 +1,57 @@
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+from pydantic import UUID4
+
+from internal.domains.entities import PostEntity, UserEntity
+from internal.infrastructures.relational_db.patterns import (
+    AbstractUnitOfWork as RelationalDBUnitOfWork,
+)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """DataLoader-style batcher.
+
+    Keys passed to ``load_many`` are deduplicated and the ones not seen before are
+    fetched with a single ``batch_fn`` call. Results, misses included, are cached
+    for the lifetime of the loader, which is meant to be a single request.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]]):
+        self._batch_fn = batch_fn
+        self._cache: Dict[K, Optional[V]] = {}
+
+    async def load(self, key: K) -> Optional[V]:
+        return (await self.load_many(keys=[key]))[key]
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, Optional[V]]:
+        keys = list(keys)
+        missing = list(dict.fromkeys(key for key in keys if key not in self._cache))
+        if missing:
+            found = await self._batch_fn(missing)
+            for key in missing:
+                self._cache[key] = found.get(key)
+        return {key: self._cache[key] for key in keys}
+
+
+class RelationalDBLoaders:
+    """Batch loaders for entities referenced by id, bound to one unit of work."""
+
+    def __init__(self, uow: RelationalDBUnitOfWork):
+        self._uow = uow
+        self.users: BatchLoader[UUID4, UserEntity] = BatchLoader(
+            batch_fn=self._load_users
+        )
+        self.posts: BatchLoader[UUID4, PostEntity] = BatchLoader(
+            batch_fn=self._load_posts
+        )
+
+    async def _load_users(self, ids: List[UUID4]) -> Dict[UUID4, UserEntity]:
+        users = await self._uow.user_repo.get_by_ids(ids=ids)
+        return {user.id_: user for user in users}
+
+    async def _load_posts(self, ids: List[UUID4]) -> Dict[UUID4, PostEntity]:
+        posts = await self._uow.post_repo.get_by_ids(ids=ids)
+        return {post.id_: post for post in posts}
@@ -4,6 +4,7 @@ from typing import List, Optional, Tuple
 
 from pydantic import UUID4
 
+from internal.domains.constants import ExpandField
 from internal.domains.entities import (
     CreatePostPayload,
     DeletePostPayload,
@@ -15,18 +16,22 @@ from internal.domains.errors import (
     CreatePostException,
     DeletePostException,
     GetPostException,
+    UpdatePostConflictException,
     UpdatePostException,
 )
 from internal.domains.usecases.abstraction import AbstractPostUC
+from internal.domains.usecases.loaders import RelationalDBLoaders
 from internal.infrastructures.relational_db.patterns import (
     AbstractUnitOfWork as RelationalDBUnitOfWork,
 )
 from utils.logger_utils import get_shared_logger
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="PostUC")
 class PostUC(AbstractPostUC):
     def __init__(self):
         pass
@@ -37,44 +42,89 @@ class PostUC(AbstractPostUC):
         try:
             session = uow.post_repo
 
+            # ids and dates were parsed when the payload was built
             entity = PostEntity(
-                id_=uuid.uuid4(),
+                id_=payload.id_ or uuid.uuid4(),
                 text_content=payload.text_content,
-                created_at=datetime.now(tz=UTC),
-                owner_id=UUID4(payload.owner_id),
+                created_at=payload.created_at or datetime.now(tz=UTC),
+                owner_id=payload.owner_id,
             )
-            if payload.id_:
-                entity.id_ = UUID4(payload.id_)
-            if payload.created_at:
-                entity.created_at = from_str_to_dt(
-                    str_time=payload.created_at, format_=DATETIME_DEFAULT_FORMAT
-                )
 
             new_id = await session.create(entity=entity)
 
+            # keep the counter cache in step within the same transaction
+            await uow.user_repo.increase_post_count(deltas={entity.owner_id: 1})
+
             return await session.get_by_id(id_=new_id)
         except Exception as exc:
             logger.error(exc)
             raise CreatePostException(exc)
 
     async def get_by_id(
-        self, id_: str, uow: RelationalDBUnitOfWork
+        self,
+        id_: str,
+        uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Optional[PostEntity]:
         try:
             session = uow.post_repo
 
-            return await session.get_by_id(id_=UUID4(id_))
+            post = await session.get_by_id(id_=UUID4(id_))
+            if post and expand:
+                await self._expand(
+                    posts=[post], expand=expand, loaders=RelationalDBLoaders(uow=uow)
+                )
+            return post
+        except Exception as exc:
+            logger.error(exc)
+            raise GetPostException(exc)
+
+    async def lock_for_update(self, id_: str, uow: RelationalDBUnitOfWork) -> bool:
+        try:
+            session = uow.post_repo
+
+            return await session.lock_for_update(id_=UUID4(id_))
         except Exception as exc:
             logger.error(exc)
             raise GetPostException(exc)
 
     async def get_multi(
-        self, filter_: GetMultiPostsFilter, uow: RelationalDBUnitOfWork
+        self,
+        filter_: GetMultiPostsFilter,
+        uow: RelationalDBUnitOfWork,
+        expand: Optional[List[str]] = None,
     ) -> Tuple[List[PostEntity], Optional[int]]:
         try:
             session = uow.post_repo
 
-            return await session.get_multi(filter_=filter_)
+            (posts, total_count) = await session.get_multi(filter_=filter_)
+            if posts and expand:
+                await self._expand(
+                    posts=posts, expand=expand, loaders=RelationalDBLoaders(uow=uow)
+                )
+            return posts, total_count
+        except Exception as exc:
+            logger.error(exc)
+            raise GetPostException(exc)
+
+    async def get_revision(
+        self, id_: str, uow: RelationalDBUnitOfWork
+    ) -> Optional[str]:
+        try:
+            session = uow.post_repo
+
+            return await session.get_revision(id_=UUID4(id_))
+        except Exception as exc:
+            logger.error(exc)
+            raise GetPostException(exc)
+
+    async def get_multi_revision(
+        self, filter_: GetMultiPostsFilter, uow: RelationalDBUnitOfWork
+    ) -> Tuple[str, int]:
+        try:
+            session = uow.post_repo
+
+            return await session.get_multi_revision(filter_=filter_)
         except Exception as exc:
             logger.error(exc)
             raise GetPostException(exc)
@@ -83,6 +133,25 @@ class PostUC(AbstractPostUC):
         try:
             session = uow.post_repo
 
+            values = {"updated_at": datetime.now(tz=UTC)}
+            if payload.text_content:
+                values["text_content"] = payload.text_content
+            if payload.updated_at:
+                values["updated_at"] = from_str_to_dt(
+                    str_time=payload.updated_at, format_=DATETIME_DEFAULT_FORMAT
+                )
+
+            # ownership and version are checked by the update statement itself
+            updated_post = await session.update_by_owner(
+                id_=UUID4(payload.id_),
+                owner_id=UUID4(payload.owner_id),
+                values=values,
+                version=payload.version,
+            )
+            if updated_post:
+                return
+
+            # nothing matched, find out why
             existed_post = await session.get_by_id(id_=UUID4(payload.id_))
             if not existed_post:
                 raise Exception(f"Not found post: {payload.id_}")
@@ -90,21 +159,13 @@ class PostUC(AbstractPostUC):
             if str(existed_post.owner_id) != payload.owner_id:
                 raise Exception(f"{payload.owner_id} is not owner of this post")
 
-            entity = PostEntity(
-                id_=UUID4(payload.id_),
-                text_content=existed_post.text_content,
-                created_at=existed_post.created_at,
-                updated_at=datetime.now(tz=UTC),
-                owner_id=existed_post.owner_id,
+            raise UpdatePostConflictException(
+                f"Post {payload.id_} is at version {existed_post.version}, "
+                f"expected {payload.version}"
             )
-            if payload.text_content:
-                entity.text_content = payload.text_content
-            if payload.updated_at:
-                entity.updated_at = from_str_to_dt(
-                    str_time=payload.updated_at, format_=DATETIME_DEFAULT_FORMAT
-                )
-
-            await session.update(entity=entity)
+        except UpdatePostConflictException as exc:
+            logger.error(exc)
+            raise
         except Exception as exc:
             logger.error(exc)
             raise UpdatePostException(exc)
@@ -113,14 +174,44 @@ class PostUC(AbstractPostUC):
         try:
             session = uow.post_repo
 
+            deleted_post = await session.delete_by_owner(
+                id_=UUID4(payload.id_), owner_id=UUID4(payload.owner_id)
+            )
+            if deleted_post:
+                await uow.user_repo.increase_post_count(
+                    deltas={deleted_post.owner_id: -1}
+                )
+                return
+
+            # nothing matched, find out why
             existed_post = await session.get_by_id(id_=UUID4(payload.id_))
             if not existed_post:
                 raise Exception(f"Not found post: {payload.id_}")
 
-            if str(existed_post.owner_id) != payload.owner_id:
-                raise Exception(f"{payload.owner_id} is not owner of this post")
+            raise Exception(f"{payload.owner_id} is not owner of this post")
+        except Exception as exc:
+            logger.error(exc)
+            raise DeletePostException(exc)
 
-            await session.delete(id_=UUID4(payload.id_))
+    async def delete_by_owner(
+        self, owner_id: str, uow: RelationalDBUnitOfWork
+    ) -> List[PostEntity]:
+        try:
+            deleted_posts = await uow.post_repo.delete_multi(owner_id=UUID4(owner_id))
+            if deleted_posts:
+                await uow.user_repo.increase_post_count(
+                    deltas={UUID4(owner_id): -len(deleted_posts)}
+                )
+            return deleted_posts
         except Exception as exc:
             logger.error(exc)
             raise DeletePostException(exc)
+
+    @staticmethod
+    async def _expand(
+        posts: List[PostEntity], expand: List[str], loaders: RelationalDBLoaders
+    ):
+        if ExpandField.OWNER.value in expand:
+            owners = await loaders.users.load_many(keys=[p.owner_id for p in posts])
+            for post in posts:
+                post.owner = owners[post.owner_id]
@@ -17,10 +17,12 @@ from internal.infrastructures.relational_db.patterns import (
 )
 from utils.logger_utils import get_shared_logger
 from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
+from utils.tracing_utils import trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(component="UserUC")
 class UserUC(AbstractUserUC):
     def __init__(self):
         pass
@@ -64,6 +66,15 @@ class UserUC(AbstractUserUC):
             logger.error(exc)
             raise GetUserException(exc)
 
+    async def lock_for_update(self, id_: str, uow: RelationalDBUnitOfWork) -> bool:
+        try:
+            session = uow.user_repo
+
+            return await session.lock_for_update(id_=UUID4(id_))
+        except Exception as exc:
+            logger.error(exc)
+            raise GetUserException(exc)
+
     async def update(self, payload: UpdateUserPayload, uow: RelationalDBUnitOfWork):
         try:
             session = uow.user_repo
@@ -72,21 +83,17 @@ class UserUC(AbstractUserUC):
             if not existed_user:
                 raise Exception(f"Not found user: {payload.id_}")
 
-            entity = UserEntity(
-                id_=UUID4(payload.id_),
-                username=existed_user.username,
-                metadata_=existed_user.metadata_,
-                is_active=existed_user.is_active,
-                created_at=existed_user.created_at,
-                updated_at=datetime.now(tz=UTC),
-            )
+            values = {"updated_at": datetime.now(tz=UTC)}
             if payload.metadata_:
-                entity.metadata_ = payload.metadata_.to_dict(exclude_none=True)
+                values["metadata_"] = payload.metadata_.to_dict(exclude_none=True)
             if payload.updated_at:
-                entity.updated_at = from_str_to_dt(
+                values["updated_at"] = from_str_to_dt(
                     str_time=payload.updated_at, format_=DATETIME_DEFAULT_FORMAT
                 )
 
+            # the stored user is valid already, only the new values were parsed
+            entity = existed_user.model_copy(update=values)
+
             await session.update(entity=entity)
         except Exception as exc:
             logger.error(exc)
@@ -6,6 +6,7 @@ from internal.domains.entities import WebhookEventEntity
 
 
 class AbstractExternalAuthenticationSVC(abc.ABC):
+    dependency_name: str
     url: str
     admin_username: str
     admin_password: str
@@ -22,6 +23,10 @@ class AbstractExternalAuthenticationSVC(abc.ABC):
     async def decode_token(self, token: str) -> dict:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def ping(self):
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def check_webhook_authentication(self, ctx_req_: Request) -> bool:
         raise NotImplementedError
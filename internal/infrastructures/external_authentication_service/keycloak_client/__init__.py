@@ -5,6 +5,7 @@ from typing import Optional, Union
 
 from fastapi import Request
 from keycloak import KeycloakAdmin, KeycloakOpenID, KeycloakOpenIDConnection
+from keycloak.exceptions import KeycloakError
 
 from internal.domains.constants import WebhookEventOperation, WebhookEventResource
 from internal.domains.entities import (
@@ -15,14 +16,30 @@ from internal.domains.entities import (
 from internal.infrastructures.external_authentication_service.abstraction import (
     AbstractExternalAuthenticationSVC,
 )
+from utils.health_utils import get_dependency_monitor
 from utils.logger_utils import get_shared_logger
+from utils.metrics_utils import EXTERNAL_CALL_DURATION, instrument_methods
 from utils.string_utils import from_str_to_dict
 from utils.time_utils import from_timestamp_to_dt
+from utils.tracing_utils import SPAN_KIND_CLIENT, trace_methods
 
 logger = get_shared_logger()
 
 
+@trace_methods(
+    component="KeycloakClient",
+    methods=("get_certs", "decode_token"),
+    kind=SPAN_KIND_CLIENT,
+    attributes={"peer.service": "keycloak"},
+)
+@instrument_methods(
+    histogram=EXTERNAL_CALL_DURATION,
+    component="keycloak",
+    methods=("get_certs", "decode_token", "ping"),
+)
 class KeycloakClient(AbstractExternalAuthenticationSVC):
+    dependency_name = "keycloak"
+
     def __init__(
         self,
         url: str,
@@ -62,13 +79,25 @@ class KeycloakClient(AbstractExternalAuthenticationSVC):
 
         self._admin = KeycloakAdmin(connection=self._connection)
 
+        self._monitor = get_dependency_monitor()
+
     async def get_certs(self) -> dict:
         if not self._certs:
-            self._certs = await self._openid.a_certs()
+            async with self._monitor.track(
+                name=self.dependency_name, errors=(KeycloakError,)
+            ):
+                self._certs = await self._openid.a_certs()
         return self._certs
 
     async def decode_token(self, token: str) -> Optional[dict]:
-        return await self._openid.a_decode_token(token=token, validate=True)
+        # only Keycloak errors count against the dependency, not rejected tokens
+        async with self._monitor.track(
+            name=self.dependency_name, errors=(KeycloakError,)
+        ):
+            return await self._openid.a_decode_token(token=token, validate=True)
+
+    async def ping(self):
+        await self._openid.a_well_known()
 
     async def check_webhook_authentication(self, ctx_req_: Request) -> bool:
         x_keycloak_signature = ctx_req_.headers.get("X-Keycloak-Signature", None)
@@ -5,6 +5,7 @@ from internal.domains.entities import PermEntity
 
 
 class AbstractExternalReBACAuthorizationSVC(abc.ABC):
+    dependency_name: str
     url: str
     api_token: str
     store_id: str
@@ -27,6 +28,10 @@ class AbstractExternalReBACAuthorizationSVC(abc.ABC):
     async def delete_perms(self, entities: List[PermEntity]) -> List[dict]:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def ping(self):
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def close(self):
         raise NotImplementedError()
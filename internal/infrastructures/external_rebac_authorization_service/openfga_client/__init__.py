@@ -15,9 +15,31 @@ from internal.domains.entities import PermEntity
 from internal.infrastructures.external_rebac_authorization_service.abstraction import (
     AbstractExternalReBACAuthorizationSVC,
 )
+from utils.health_utils import get_dependency_monitor
+from utils.metrics_utils import EXTERNAL_CALL_DURATION, instrument_methods
+from utils.tracing_utils import SPAN_KIND_CLIENT, trace_methods
 
 
+@trace_methods(
+    component="OpenFGAClient",
+    methods=("create_perms", "check_single_perm", "check_perms", "delete_perms"),
+    kind=SPAN_KIND_CLIENT,
+    attributes={"peer.service": "openfga"},
+)
+@instrument_methods(
+    histogram=EXTERNAL_CALL_DURATION,
+    component="openfga",
+    methods=(
+        "create_perms",
+        "check_single_perm",
+        "check_perms",
+        "delete_perms",
+        "ping",
+    ),
+)
 class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
+    dependency_name = "openfga"
+
     def __init__(
         self,
         url: str,
@@ -47,6 +69,8 @@ class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
             )
         )
 
+        self._monitor = get_dependency_monitor()
+
     async def create_perms(self, entities: List[PermEntity]) -> List[dict]:
         results = []
         writes = [
@@ -58,12 +82,13 @@ class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
             for entity in entities
         ]
         body = ClientWriteRequest(writes=writes)
-        api_response: ClientWriteResponse = await self._client.write(
-            body=body,
-            options={
-                "authorization_model_id": self._authorization_model_id,
-            },
-        )
+        async with self._monitor.track(name=self.dependency_name):
+            api_response: ClientWriteResponse = await self._client.write(
+                body=body,
+                options={
+                    "authorization_model_id": self._authorization_model_id,
+                },
+            )
         for res in api_response.writes:
             results.append(
                 {
@@ -80,12 +105,13 @@ class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
             relation=entity.relation,
             object=entity.request_obj,
         )
-        response = await self._client.check(
-            body=body,
-            options={
-                "authorization_model_id": self._authorization_model_id,
-            },
-        )
+        async with self._monitor.track(name=self.dependency_name):
+            response = await self._client.check(
+                body=body,
+                options={
+                    "authorization_model_id": self._authorization_model_id,
+                },
+            )
         return response.allowed
 
     async def check_perms(self, entities: List[PermEntity]) -> bool:
@@ -97,12 +123,13 @@ class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
             )
             for entity in entities
         ]
-        response = await self._client.batch_check(
-            body=ClientBatchCheckRequest(checks=checks),
-            options={
-                "authorization_model_id": self._authorization_model_id,
-            },
-        )
+        async with self._monitor.track(name=self.dependency_name):
+            response = await self._client.batch_check(
+                body=ClientBatchCheckRequest(checks=checks),
+                options={
+                    "authorization_model_id": self._authorization_model_id,
+                },
+            )
         results = response.result
         for result in results:
             allowed = result["allowed"]
@@ -122,12 +149,13 @@ class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
             for entity in entities
         ]
         body = ClientWriteRequest(deletes=deletes)
-        api_response: ClientWriteResponse = await self._client.write(
-            body=body,
-            options={
-                "authorization_model_id": self._authorization_model_id,
-            },
-        )
+        async with self._monitor.track(name=self.dependency_name):
+            api_response: ClientWriteResponse = await self._client.write(
+                body=body,
+                options={
+                    "authorization_model_id": self._authorization_model_id,
+                },
+            )
         for res in api_response.deletes:
             results.append(
                 {
@@ -137,5 +165,12 @@ class OpenFGAClient(AbstractExternalReBACAuthorizationSVC):
             )
         return results
 
+    async def ping(self):
+        await self._client.read_authorization_model(
+            options={
+                "authorization_model_id": self._authorization_model_id,
+            },
+        )
+
     async def close(self):
         await self._client.close()
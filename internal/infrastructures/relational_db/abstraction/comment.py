@@ -25,9 +25,39 @@ class AbstractCommentRepo(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def update(self, entity: CommentEntity):
+    async def get_revision(self, id_: UUID4) -> Optional[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_revision(
+        self, filter_: GetMultiCommentsFilter
+    ) -> Tuple[str, int]:
         raise NotImplementedError
 
     @abc.abstractmethod
     async def delete(self, id_: UUID4):
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_by_owner(
+        self,
+        id_: UUID4,
+        owner_id: UUID4,
+        values: dict,
+        version: Optional[int] = None,
+    ) -> Optional[CommentEntity]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_by_owner(
+        self, id_: UUID4, owner_id: UUID4
+    ) -> Optional[CommentEntity]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_multi(
+        self,
+        post_ids: Optional[List[UUID4]] = None,
+        owner_id: Optional[UUID4] = None,
+    ) -> List[CommentEntity]:
+        raise NotImplementedError
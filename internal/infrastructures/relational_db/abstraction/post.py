@@ -1,5 +1,5 @@
 import abc
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +18,15 @@ class AbstractPostRepo(abc.ABC):
     async def get_by_id(self, id_: UUID4) -> Optional[PostEntity]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def lock_for_update(self, id_: UUID4) -> bool:
+        """Lock the row until the transaction ends, ``False`` when it is gone."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_ids(self, ids: List[UUID4]) -> List[PostEntity]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_multi(
         self, filter_: GetMultiPostsFilter
@@ -25,9 +34,37 @@ class AbstractPostRepo(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def update(self, entity: PostEntity):
+    async def get_revision(self, id_: UUID4) -> Optional[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_multi_revision(self, filter_: GetMultiPostsFilter) -> Tuple[str, int]:
         raise NotImplementedError
 
     @abc.abstractmethod
     async def delete(self, id_: UUID4):
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_by_owner(
+        self,
+        id_: UUID4,
+        owner_id: UUID4,
+        values: dict,
+        version: Optional[int] = None,
+    ) -> Optional[PostEntity]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_by_owner(
+        self, id_: UUID4, owner_id: UUID4
+    ) -> Optional[PostEntity]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_multi(self, owner_id: UUID4) -> List[PostEntity]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def increase_comment_count(self, deltas: Dict[UUID4, int]):
+        raise NotImplementedError
@@ -1,5 +1,5 @@
 import abc
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +18,15 @@ class AbstractUserRepo(abc.ABC):
     async def get_by_id(self, id_: UUID4) -> Optional[UserEntity]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def lock_for_update(self, id_: UUID4) -> bool:
+        """Lock the row until the transaction ends, ``False`` when it is gone."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_ids(self, ids: List[UUID4]) -> List[UserEntity]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def update(self, entity: UserEntity):
         raise NotImplementedError
@@ -25,3 +34,11 @@ class AbstractUserRepo(abc.ABC):
     @abc.abstractmethod
     async def delete(self, id_: UUID4):
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def increase_post_count(self, deltas: Dict[UUID4, int]):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def increase_comment_count(self, deltas: Dict[UUID4, int]):
+        raise NotImplementedError
@@ -0,0 +1,70 @@
+"""add counter caches to posts and users
+
+Revision ID: 5b30ceb9889d
+Revises: 652103922e5c
+Create Date: 2026-10-19 10:41:07.552310
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b30ceb9889d"
+down_revision: Union[str, None] = "652103922e5c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "posts",
+        sa.Column(
+            "comment_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "post_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "comment_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+
+    # backfill counters from existing rows
+    op.execute(
+        """
+        UPDATE posts SET comment_count = c.total
+        FROM (SELECT post_id, count(*) AS total FROM comments GROUP BY post_id) AS c
+        WHERE posts.id = c.post_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE users SET post_count = p.total
+        FROM (SELECT owner_id, count(*) AS total FROM posts GROUP BY owner_id) AS p
+        WHERE users.id = p.owner_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE users SET comment_count = c.total
+        FROM (SELECT owner_id, count(*) AS total FROM comments GROUP BY owner_id) AS c
+        WHERE users.id = c.owner_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "comment_count")
+    op.drop_column("users", "post_count")
+    op.drop_column("posts", "comment_count")
@@ -0,0 +1,36 @@
+"""add version to posts and comments
+
+Revision ID: 652103922e5c
+Revises: 284ec1087c38
+Create Date: 2026-10-19 09:12:41.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "652103922e5c"
+down_revision: Union[str, None] = "284ec1087c38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "posts",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+    op.add_column(
+        "comments",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("comments", "version")
+    op.drop_column("posts", "version")
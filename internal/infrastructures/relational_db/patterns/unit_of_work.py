@@ -1,12 +1,9 @@
 import abc
+import time
 from abc import abstractmethod
 from typing import Any, Callable, Optional, Type
 
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    AsyncSessionTransaction,
-    async_scoped_session,
-)
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
 from internal.infrastructures.relational_db import CommentRepo, PostRepo, UserRepo
 from internal.infrastructures.relational_db.abstraction import (
@@ -14,6 +11,18 @@ from internal.infrastructures.relational_db.abstraction import (
     AbstractPostRepo,
     AbstractUserRepo,
 )
+from utils.metrics_utils import UOW_DURATION
+from utils.tracing_utils import (
+    activate_span,
+    deactivate_span,
+    get_tracer,
+    start_as_current_span,
+)
+
+_UOW_DURATION_BY_OUTCOME = {
+    outcome: UOW_DURATION.labels(outcome)
+    for outcome in ("empty", "commit", "rollback", "error")
+}
 
 
 class AbstractUnitOfWork(abc.ABC):
@@ -41,9 +50,19 @@ class AbstractUnitOfWork(abc.ABC):
     async def __aexit__(self, exc_type, exc, tb):
         raise NotImplementedError
 
+    @abstractmethod
+    async def begin_snapshot(self):
+        """Read every following statement from one snapshot of the database."""
+        raise NotImplementedError
+
 
 class AsyncSQLAlchemyUnitOfWork(AbstractUnitOfWork):
-    """SQLAlchemy-based Unit of Work for async operations."""
+    """SQLAlchemy-based Unit of Work for async operations.
+
+    The session is created on first repository access and its transaction
+    autobegins on the first executed statement, so a unit of work that exits
+    early never checks out a pooled connection nor issues a COMMIT.
+    """
 
     def __init__(
         self,
@@ -54,35 +73,109 @@ class AsyncSQLAlchemyUnitOfWork(AbstractUnitOfWork):
     ):
         self._scoped_session_factory = scoped_session
         self._session: Optional[AsyncSession] = None
-        self._transaction: Optional[AsyncSessionTransaction] = None
         self._post_repo_factory = post_repo_factory
         self._comment_repo_factory = comment_repo_factory
         self._user_repo_factory = user_repo_factory
+        self._post_repo: Optional[PostRepo] = None
+        self._comment_repo: Optional[CommentRepo] = None
+        self._user_repo: Optional[UserRepo] = None
+        self._started = 0.0
+        self._span = None
+        self._span_token = None
 
-    async def __aenter__(self):
-        self._session = self._scoped_session_factory()
-        self._transaction = await self._session.begin()
+    @property
+    def post_repo(self) -> PostRepo:
+        if self._post_repo is None:
+            self._post_repo = self._post_repo_factory(self._get_session())
+        return self._post_repo
+
+    @property
+    def comment_repo(self) -> CommentRepo:
+        if self._comment_repo is None:
+            self._comment_repo = self._comment_repo_factory(self._get_session())
+        return self._comment_repo
 
-        # register repo
-        self.post_repo = self._post_repo_factory(self._session)
-        self.comment_repo = self._comment_repo_factory(self._session)
-        self.user_repo = self._user_repo_factory(self._session)
+    @property
+    def user_repo(self) -> UserRepo:
+        if self._user_repo is None:
+            self._user_repo = self._user_repo_factory(self._get_session())
+        return self._user_repo
+
+    def _get_session(self) -> AsyncSession:
+        # Creating the session does not check out a connection, the session
+        # autobegins its transaction on the first executed statement
+        if self._session is None:
+            self._session = self._scoped_session_factory()
+        return self._session
+
+    def _reset(self):
+        self._session = None
+        self._post_repo = None
+        self._comment_repo = None
+        self._user_repo = None
+
+    async def begin_snapshot(self):
+        """Run the transaction under REPEATABLE READ.
+
+        Under READ COMMITTED every statement sees the rows committed when it
+        started, so two reads of one unit of work can disagree. Must be called
+        before the first statement, the isolation level is reset when the
+        connection returns to the pool.
+        """
+        await self._get_session().connection(
+            execution_options={"isolation_level": "REPEATABLE READ"}
+        )
+
+    async def __aenter__(self):
+        self._reset()
+        self._started = time.perf_counter()
+        tracer = get_tracer()
+        if tracer.enabled:
+            self._span = tracer.start_span(name="uow")
+            if self._span is not None:
+                self._span_token = activate_span(span=self._span)
         return self
 
+    def _observe(self, outcome: str):
+        _UOW_DURATION_BY_OUTCOME[outcome].observe(time.perf_counter() - self._started)
+        if self._span is not None:
+            self._span.set_attribute("uow.outcome", outcome)
+            deactivate_span(token=self._span_token)
+            self._span.end()
+            self._span = None
+            self._span_token = None
+
     async def __aexit__(
         self,
         exc_type: Optional[Type[BaseException]],
         exc: Optional[BaseException],
         tb: Any,
     ):
+        if exc is not None and self._span is not None:
+            self._span.record_exception(exc=exc)
+
+        if self._session is None:
+            # no repository was used, nothing to commit or release
+            self._observe(outcome="empty")
+            return
+
+        outcome = "empty"
         try:
-            if exc_type is None:
-                await self._transaction.commit()
-            else:
-                await self._transaction.rollback()
+            if self._session.in_transaction():
+                if exc_type is None:
+                    with start_as_current_span(name="uow.commit"):
+                        await self._session.commit()
+                    outcome = "commit"
+                else:
+                    with start_as_current_span(name="uow.rollback"):
+                        await self._session.rollback()
+                    outcome = "rollback"
         except Exception:
-            await self._transaction.rollback()
+            outcome = "error"
+            await self._session.rollback()
             raise
         finally:
             await self._session.close()
             await self._scoped_session_factory.remove()
+            self._reset()
+            self._observe(outcome=outcome)
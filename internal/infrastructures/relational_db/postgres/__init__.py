@@ -1,9 +1,12 @@
 import asyncio
+import logging
 import subprocess
+import time
 from asyncio import current_task
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Type
+from typing import AsyncGenerator, Dict, Type
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_scoped_session,
@@ -11,24 +14,44 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import QueuePool
 
+from internal.infrastructures.relational_db.postgres.profiler import (
+    QueryBudgetExceededError,
+    get_query_profiler,
+)
+from utils.health_utils import get_dependency_monitor
 from utils.logger_utils import get_shared_logger
 
 logger = get_shared_logger()
 
+_STATEMENT_STARTS_KEY = "dependency_monitor_starts"
+
 
 class PostgresDatabase:
+    dependency_name = "postgres"
+
     def __init__(
-        self, db_url: str, enable_log: bool = True, enable_migrations: bool = True
+        self,
+        db_url: str,
+        enable_log: bool = True,
+        enable_migrations: bool = True,
+        isolation_level: str = "READ COMMITTED",
     ):
         self._db_url = db_url
         self._enable_log = enable_log
         self._enable_migrations = enable_migrations
+        # posts and comments are protected by optimistic locking (version column),
+        # and creates lock their parent rows against concurrent deletes, so
+        # writes do not need SERIALIZABLE and its serialization failures
         self._engine = create_async_engine(
             url=self._db_url,
-            echo=self._enable_log,
-            isolation_level="SERIALIZABLE",
+            isolation_level=isolation_level,
         )
+        if self._enable_log:
+            # same statements as echo=True, but only through the intercepted logging;
+            # echo also attaches its own synchronous stdout handler
+            logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
         self._session_factory = async_sessionmaker(
             bind=self._engine,
@@ -42,6 +65,47 @@ class PostgresDatabase:
             session_factory=self._session_factory, scopefunc=current_task
         )
 
+        # before the monitor's listeners, so a statement refused by the query
+        # budget is never timed
+        get_query_profiler().attach(engine=self._engine)
+        self._track_statements()
+
+    def _track_statements(self):
+        """Feed every statement's latency and failures to the dependency monitor."""
+        monitor = get_dependency_monitor()
+        name = self.dependency_name
+
+        @event.listens_for(self._engine.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            conn.info.setdefault(_STATEMENT_STARTS_KEY, []).append(time.perf_counter())
+
+        @event.listens_for(self._engine.sync_engine, "after_cursor_execute")
+        def after_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            started = conn.info[_STATEMENT_STARTS_KEY].pop()
+            monitor.record(name=name, latency=time.perf_counter() - started)
+
+        @event.listens_for(self._engine.sync_engine, "handle_error")
+        def handle_error(exception_context):
+            if isinstance(
+                exception_context.original_exception, QueryBudgetExceededError
+            ):
+                # refused by the query profiler before its start was recorded,
+                # the database never saw it
+                return
+            conn = exception_context.connection
+            starts = conn.info.get(_STATEMENT_STARTS_KEY) if conn is not None else None
+            latency = time.perf_counter() - starts.pop() if starts else 0.0
+            monitor.record(
+                name=name,
+                latency=latency,
+                ok=False,
+                error=repr(exception_context.original_exception),
+            )
+
     @property
     def engine(self):
         return self._engine
@@ -50,6 +114,22 @@ class PostgresDatabase:
     def scoped_session(self):
         return self._scoped_session
 
+    async def ping(self):
+        async with self._engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    def pool_status(self) -> Dict[str, int]:
+        """Connection pool counters, read without touching the database."""
+        pool = self._engine.pool
+        if not isinstance(pool, QueuePool):
+            return {}
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+
     async def run_migrations(self):
         """Runs Alembic migrations asynchronously."""
         process = await asyncio.create_subprocess_exec(
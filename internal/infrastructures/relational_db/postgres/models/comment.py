@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import UUID, Column, Text, func
+from sqlalchemy import UUID, Column, Integer, Text, func, text
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 
 from internal.domains.entities import CommentEntity
@@ -15,6 +15,7 @@ class Comment(Base):
         "created_at", TIMESTAMP(timezone=True), server_default=func.now()
     )
     updated_at = Column("updated_at", TIMESTAMP(timezone=True), onupdate=func.now())
+    version = Column("version", Integer, nullable=False, server_default=text("1"))
 
     # fk
     post_id = Column("post_id", UUID, nullable=False)
@@ -24,4 +25,13 @@ class Comment(Base):
 class CommentModelMapper:
     @staticmethod
     def to_entity(model: Comment) -> CommentEntity:
-        return CommentEntity.model_validate(obj=model)
+        # rows are typed by their columns, no need to validate them again
+        return CommentEntity.from_trusted(
+            id_=model.id_,
+            text_content=model.text_content,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            version=model.version,
+            post_id=model.post_id,
+            owner_id=model.owner_id,
+        )
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import UUID, Column, Text, func
+from sqlalchemy import UUID, Column, Integer, Text, func, text
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 
 from internal.domains.entities import PostEntity
@@ -15,6 +15,10 @@ class Post(Base):
         "created_at", TIMESTAMP(timezone=True), server_default=func.now()
     )
     updated_at = Column("updated_at", TIMESTAMP(timezone=True), onupdate=func.now())
+    version = Column("version", Integer, nullable=False, server_default=text("1"))
+    comment_count = Column(
+        "comment_count", Integer, nullable=False, server_default=text("0")
+    )
 
     # fk
     owner_id = Column("owner_id", UUID, nullable=False)
@@ -23,4 +27,13 @@ class Post(Base):
 class PostModelMapper:
     @staticmethod
     def to_entity(model: Post) -> PostEntity:
-        return PostEntity.model_validate(obj=model)
+        # rows are typed by their columns, no need to validate them again
+        return PostEntity.from_trusted(
+            id_=model.id_,
+            text_content=model.text_content,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            version=model.version,
+            comment_count=model.comment_count,
+            owner_id=model.owner_id,
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import UUID, VARCHAR, Boolean, Column, func
+from sqlalchemy import UUID, VARCHAR, Boolean, Column, Integer, func, text
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
 
 from internal.domains.entities import UserEntity
@@ -15,9 +15,23 @@ class User(Base):
         "created_at", TIMESTAMP(timezone=True), server_default=func.now()
     )
     updated_at = Column("updated_at", TIMESTAMP(timezone=True), onupdate=func.now())
+    post_count = Column("post_count", Integer, nullable=False, server_default=text("0"))
+    comment_count = Column(
+        "comment_count", Integer, nullable=False, server_default=text("0")
+    )
 
 
 class UserModelMapper:
     @staticmethod
     def to_entity(model: User) -> UserEntity:
-        return UserEntity.model_validate(obj=model)
+        # rows are typed by their columns, no need to validate them again
+        return UserEntity.from_trusted(
+            id_=model.id_,
+            username=model.username,
+            metadata_=model.metadata_,
+            is_active=model.is_active,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            post_count=model.post_count,
+            comment_count=model.comment_count,
+        )
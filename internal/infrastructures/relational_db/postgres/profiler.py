@@ -0,0 +1,299 @@
+import asyncio
+import random
+import time
+from contextvars import ContextVar, Token
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from utils.logger_utils import get_shared_logger
+
+logger = get_shared_logger()
+
+_STATEMENT_STARTS_KEY = "query_profiler_starts"
+
+# statements EXPLAIN accepts, the others (BEGIN, SAVEPOINT, ...) are skipped
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# bounds the per-request memory of distinct statements
+MAX_TRACKED_STATEMENTS = 64
+
+
+class QueryBudgetMode(str, Enum):
+    OFF = "off"
+    WARN = "warn"  # log the request once it is over budget
+    FAIL = "fail"  # refuse the statement going over budget, for dev and CI
+
+
+class QueryBudgetExceededError(Exception):
+    pass
+
+
+class QueryStats:
+    """Statements run by one request, kept in a contextvar for its lifetime."""
+
+    __slots__ = ("name", "count", "seconds", "statements", "over_budget", "explains")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.seconds = 0.0
+        # statement -> executions, repeated statements point at N+1 loops
+        self.statements: Dict[str, int] = {}
+        self.over_budget = False
+        # (message, statement, parameters) explained once the response is sent
+        self.explains: List[Tuple[str, str, object]] = []
+
+    def most_repeated(self) -> Optional[tuple]:
+        if not self.statements:
+            return None
+        return max(self.statements.items(), key=lambda item: item[1])
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _shape(value: object) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: object, executemany: bool = False) -> str:
+    """Types and sizes of the bound parameters, never their values."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shapes(parameters=parameters[0])}"
+    if isinstance(parameters, dict):
+        return str({key: _shape(value) for key, value in parameters.items()})
+    if isinstance(parameters, (list, tuple)):
+        return str([_shape(value) for value in parameters])
+    return _shape(parameters)
+
+
+class QueryProfiler:
+    """SQLAlchemy event based query profiler.
+
+    Statements slower than ``slow_query_ms`` are logged with the shapes of their
+    bound parameters and, for ``explain_sample_rate`` of them, their EXPLAIN plan.
+    EXPLAIN runs in a background task on a connection of its own, for a request
+    once its response is sent. Inside a request scope (see ``start_scope``)
+    statements are counted, and a request running more than
+    ``max_queries_per_request`` is reported (``QueryBudgetMode.WARN``) or has
+    the statement going over budget refused (``QueryBudgetMode.FAIL``).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        slow_query_ms: float = 200.0,
+        explain_sample_rate: float = 0.0,
+        max_queries_per_request: int = 20,
+        budget_mode: QueryBudgetMode = QueryBudgetMode.WARN,
+        max_statement_length: int = 1000,
+    ):
+        self.enabled = enabled
+        self._slow_query_seconds = slow_query_ms / 1000
+        self._explain_sample_rate = explain_sample_rate
+        self._max_queries_per_request = max_queries_per_request
+        self._budget_mode = QueryBudgetMode(budget_mode)
+        self._max_statement_length = max_statement_length
+        self._engine: Optional[AsyncEngine] = None
+        self._explain_tasks: Set[asyncio.Task] = set()
+
+    def configure(
+        self,
+        enabled: bool,
+        slow_query_ms: float,
+        explain_sample_rate: float,
+        max_queries_per_request: int,
+        budget_mode: QueryBudgetMode,
+        max_statement_length: int,
+    ):
+        self.enabled = enabled
+        self._slow_query_seconds = slow_query_ms / 1000
+        self._explain_sample_rate = explain_sample_rate
+        self._max_queries_per_request = max_queries_per_request
+        self._budget_mode = QueryBudgetMode(budget_mode)
+        self._max_statement_length = max_statement_length
+
+    def _truncate(self, statement: str) -> str:
+        if len(statement) <= self._max_statement_length:
+            return statement
+        return f"{statement[: self._max_statement_length]}..."
+
+    def attach(self, engine: AsyncEngine):
+        """Listen to the statements of an engine, EXPLAIN runs on its pool."""
+        self._engine = engine
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if not self.enabled:
+            return
+        stats = _query_stats.get()
+        if stats is not None:
+            # a refused statement is neither counted nor timed
+            if (
+                self._budget_mode == QueryBudgetMode.FAIL
+                and stats.count >= self._max_queries_per_request
+            ):
+                stats.over_budget = True
+                raise QueryBudgetExceededError(
+                    f"{stats.name} went over its budget of "
+                    f"{self._max_queries_per_request} queries"
+                )
+            stats.count += 1
+            if (
+                statement in stats.statements
+                or len(stats.statements) < MAX_TRACKED_STATEMENTS
+            ):
+                stats.statements[statement] = stats.statements.get(statement, 0) + 1
+        conn.info.setdefault(_STATEMENT_STARTS_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get(_STATEMENT_STARTS_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.seconds += elapsed
+        if elapsed < self._slow_query_seconds:
+            return
+
+        message = (
+            f"Slow query ({elapsed * 1000:.1f} ms"
+            f"{f', in {stats.name}' if stats is not None else ''}): "
+            f"{self._truncate(statement=statement)} "
+            f"params={parameter_shapes(parameters=parameters, executemany=executemany)}"
+        )
+        if (
+            not executemany
+            and random.random() < self._explain_sample_rate
+            and statement.lstrip()[:6].upper().startswith(_EXPLAINABLE)
+        ):
+            # the adapter may reuse the parameters list
+            parameters = (
+                tuple(parameters) if isinstance(parameters, list) else parameters
+            )
+            if stats is not None:
+                stats.explains.append((message, statement, parameters))
+            else:
+                self._schedule_explains(explains=[(message, statement, parameters)])
+            return
+        logger.warning(message)
+
+    def _handle_error(self, exception_context):
+        if isinstance(exception_context.original_exception, QueryBudgetExceededError):
+            # refused before its start was recorded
+            return
+        conn = exception_context.connection
+        starts = conn.info.get(_STATEMENT_STARTS_KEY) if conn is not None else None
+        if starts:
+            starts.pop()
+
+    def _schedule_explains(self, explains: List[Tuple[str, str, object]]):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        for message, statement, parameters in explains:
+            if loop is None or self._engine is None:
+                logger.warning(message)
+                continue
+            task = loop.create_task(
+                self._log_explained(
+                    message=message, statement=statement, parameters=parameters
+                )
+            )
+            # the loop only keeps weak references to its tasks
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    async def _log_explained(self, message: str, statement: str, parameters):
+        plan = None
+        try:
+            async with self._engine.connect() as conn:
+                plan = await conn.run_sync(
+                    lambda sync_conn: self._explain(
+                        conn=sync_conn, statement=statement, parameters=parameters
+                    )
+                )
+        except Exception as exc:
+            logger.warning(f"Failed to explain slow query: {exc!r}")
+        logger.warning(f"{message}\n{plan}" if plan else message)
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[str]:
+        """EXPLAIN (without ANALYZE, nothing is run) on a raw DBAPI cursor.
+
+        The raw cursor bypasses the engine events, and the savepoint keeps the
+        connection's transaction usable should EXPLAIN fail.
+        """
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT query_profiler_explain")
+            try:
+                cursor.execute(f"EXPLAIN {statement}", parameters)
+                rows: List[tuple] = cursor.fetchall()
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+                raise
+            cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+            return "\n".join(str(row[0]) for row in rows)
+        except Exception as exc:
+            logger.warning(f"Failed to explain slow query: {exc!r}")
+            return None
+        finally:
+            cursor.close()
+
+    def start_scope(self, name: str) -> Token:
+        """Start counting the statements of a request (or any unit of work)."""
+        return _query_stats.set(QueryStats(name=name))
+
+    def end_scope(self, token: Token, name: Optional[str] = None) -> QueryStats:
+        """Stop counting and report the scope when it went over budget.
+
+        ``name`` replaces the scope's name in the report, e.g. with the route
+        template, only known once the request is routed.
+        """
+        stats = _query_stats.get()
+        _query_stats.reset(token)
+        if name is not None:
+            stats.name = name
+        if stats.explains:
+            self._schedule_explains(explains=stats.explains)
+            stats.explains = []
+        if (
+            self.enabled
+            and self._budget_mode == QueryBudgetMode.WARN
+            and stats.count > self._max_queries_per_request
+        ):
+            stats.over_budget = True
+            statement, repeats = stats.most_repeated()
+            logger.warning(
+                f"{stats.name} ran {stats.count} queries "
+                f"({stats.seconds * 1000:.1f} ms), over its budget of "
+                f"{self._max_queries_per_request}; most repeated, {repeats} times: "
+                f"{self._truncate(statement=statement)}"
+            )
+        return stats
+
+
+_query_profiler = QueryProfiler()
+
+
+def get_query_profiler() -> QueryProfiler:
+    """Return the process-wide query profiler."""
+    return _query_profiler
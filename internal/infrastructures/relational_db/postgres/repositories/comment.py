@@ -10,9 +10,12 @@ from internal.infrastructures.relational_db.postgres.models import (
     Comment,
     CommentModelMapper,
 )
-from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
+from utils.metrics_utils import REPOSITORY_CALL_DURATION, instrument_methods
+from utils.tracing_utils import trace_methods
 
 
+@trace_methods(component="CommentRepo", attributes={"db.system": "postgresql"})
+@instrument_methods(histogram=REPOSITORY_CALL_DURATION, component="comment")
 class CommentRepo(AbstractCommentRepo):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -35,6 +38,15 @@ class CommentRepo(AbstractCommentRepo):
             return None
         return CommentModelMapper.to_entity(model=token_)
 
+    def _build_filter(self, filter_: GetMultiCommentsFilter) -> list:
+        filter_stmt = []
+        if filter_.post_id:
+            filter_stmt.append(Comment.post_id == filter_.post_id)
+        if filter_.from_date is not None and filter_.to_date is not None:
+            filter_stmt.append(Comment.created_at >= filter_.from_date)
+            filter_stmt.append(Comment.created_at <= filter_.to_date)
+        return filter_stmt
+
     async def get_multi(
         self, filter_: GetMultiCommentsFilter
     ) -> Tuple[List[CommentEntity], Optional[int]]:
@@ -49,18 +61,7 @@ class CommentRepo(AbstractCommentRepo):
         else:
             sort_stmt = desc(Comment.created_at)
 
-        filter_stmt = []
-        if filter_.post_id:
-            filter_stmt.append(Comment.post_id == filter_.post_id)
-        if filter_.from_date is not None and filter_.to_date is not None:
-            from_date_dt = from_str_to_dt(
-                str_time=filter_.from_date, format_=DATETIME_DEFAULT_FORMAT
-            )
-            to_date_dt = from_str_to_dt(
-                str_time=filter_.to_date, format_=DATETIME_DEFAULT_FORMAT
-            )
-            filter_stmt.append(Comment.created_at >= from_date_dt)
-            filter_stmt.append(Comment.created_at <= to_date_dt)
+        filter_stmt = self._build_filter(filter_=filter_)
 
         # Count query - only count the "id" column
         # optional call count query
@@ -78,13 +79,80 @@ class CommentRepo(AbstractCommentRepo):
         comments = [CommentModelMapper.to_entity(model=comment_) for comment_ in result]
         return comments, total_count
 
-    async def update(self, entity: CommentEntity):
-        obj_in_data = entity.to_dict(exclude_none=True)
-        stmt = update(Comment).where(Comment.id_ == entity.id_).values(**obj_in_data)
-        await self.session.execute(stmt)
-        return
+    async def get_revision(self, id_: UUID4) -> Optional[str]:
+        stmt = select(Comment.id_, Comment.version).where(Comment.id_ == id_)
+        row = (await self.session.execute(stmt)).first()
+        if not row:
+            return None
+        return CommentEntity.build_revision(id_=row.id_, version=row.version)
+
+    async def get_multi_revision(
+        self, filter_: GetMultiCommentsFilter
+    ) -> Tuple[str, int]:
+        # one aggregate over the filtered set, it also replaces the count query
+        stmt = select(
+            func.count(Comment.id_),
+            func.max(func.coalesce(Comment.updated_at, Comment.created_at)),
+            func.coalesce(func.sum(Comment.version), 0),
+        ).filter(*self._build_filter(filter_=filter_))
+        (total_count, last_modified, versions) = (
+            await self.session.execute(stmt)
+        ).one()
+        revision = f"{total_count}:{last_modified}:{versions}"
+        return revision, total_count
 
     async def delete(self, id_: UUID4):
         stmt = delete(Comment).where(Comment.id_ == id_)
         await self.session.execute(stmt)
         return
+
+    async def delete_multi(
+        self,
+        post_ids: Optional[List[UUID4]] = None,
+        owner_id: Optional[UUID4] = None,
+    ) -> List[CommentEntity]:
+        filter_stmt = []
+        if post_ids is not None:
+            filter_stmt.append(Comment.post_id.in_(post_ids))
+        if owner_id is not None:
+            filter_stmt.append(Comment.owner_id == owner_id)
+        if not filter_stmt:
+            raise ValueError("delete_multi requires post_ids or owner_id")
+
+        stmt = delete(Comment).where(*filter_stmt).returning(Comment)
+        result = (await self.session.execute(stmt)).scalars().all()
+        return [CommentModelMapper.to_entity(model=comment_) for comment_ in result]
+
+    async def update_by_owner(
+        self,
+        id_: UUID4,
+        owner_id: UUID4,
+        values: dict,
+        version: Optional[int] = None,
+    ) -> Optional[CommentEntity]:
+        filter_stmt = [Comment.id_ == id_, Comment.owner_id == owner_id]
+        if version is not None:
+            filter_stmt.append(Comment.version == version)
+        stmt = (
+            update(Comment)
+            .where(*filter_stmt)
+            .values(**values, version=Comment.version + 1)
+            .returning(Comment)
+        )
+        token_ = (await self.session.execute(stmt)).scalars().first()
+        if not token_:
+            return None
+        return CommentModelMapper.to_entity(model=token_)
+
+    async def delete_by_owner(
+        self, id_: UUID4, owner_id: UUID4
+    ) -> Optional[CommentEntity]:
+        stmt = (
+            delete(Comment)
+            .where(Comment.id_ == id_, Comment.owner_id == owner_id)
+            .returning(Comment)
+        )
+        token_ = (await self.session.execute(stmt)).scalars().first()
+        if not token_:
+            return None
+        return CommentModelMapper.to_entity(model=token_)
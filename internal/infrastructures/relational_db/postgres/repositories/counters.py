@@ -0,0 +1,29 @@
+from typing import Dict
+
+from pydantic import UUID4
+from sqlalchemy import Column, bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def increase_counter(
+    session: AsyncSession, column: Column, deltas: Dict[UUID4, int]
+):
+    """Atomically apply ``column = column + delta`` to every row id in ``deltas``.
+
+    All rows are updated through one executemany statement. Ids are applied in
+    sorted order so concurrent cascades lock the rows in the same order.
+    """
+    params = [
+        {"b_id": id_, "b_delta": delta}
+        for id_, delta in sorted(deltas.items(), key=lambda item: str(item[0]))
+        if delta
+    ]
+    if not params:
+        return
+    table = column.table
+    values = {column.key: column + bindparam("b_delta")}
+    if "updated_at" in table.c:
+        # a counter bump is not an edit, keep the onupdate hook off updated_at
+        values["updated_at"] = table.c.updated_at
+    stmt = update(table).where(table.c.id == bindparam("b_id")).values(values)
+    await session.execute(stmt, params)
@@ -1,15 +1,34 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import UUID4
-from sqlalchemy import UnaryExpression, asc, delete, desc, func, insert, select, update
+from sqlalchemy import (
+    UUID,
+    UnaryExpression,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from internal.domains.entities import GetMultiPostsFilter, PostEntity
 from internal.infrastructures.relational_db.abstraction import AbstractPostRepo
 from internal.infrastructures.relational_db.postgres.models import Post, PostModelMapper
-from utils.time_utils import DATETIME_DEFAULT_FORMAT, from_str_to_dt
+from internal.infrastructures.relational_db.postgres.repositories.counters import (
+    increase_counter,
+)
+from utils.metrics_utils import REPOSITORY_CALL_DURATION, instrument_methods
+from utils.tracing_utils import trace_methods
 
 
+@trace_methods(component="PostRepo", attributes={"db.system": "postgresql"})
+@instrument_methods(histogram=REPOSITORY_CALL_DURATION, component="post")
 class PostRepo(AbstractPostRepo):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -32,6 +51,29 @@ class PostRepo(AbstractPostRepo):
             return None
         return PostModelMapper.to_entity(model=token_)
 
+    async def lock_for_update(self, id_: UUID4) -> bool:
+        # FOR NO KEY UPDATE is the lock the counter caches take anyway, so
+        # concurrent child inserts queue here instead of deadlocking on an upgrade
+        stmt = select(Post.id_).where(Post.id_ == id_).with_for_update(key_share=True)
+        return (await self.session.execute(stmt)).scalar() is not None
+
+    async def get_by_ids(self, ids: List[UUID4]) -> List[PostEntity]:
+        if not ids:
+            return []
+        # one array parameter, so every page size shares the same statement
+        stmt = select(Post).where(
+            Post.id_ == any_(bindparam("ids", value=list(ids), type_=ARRAY(UUID)))
+        )
+        result = (await self.session.execute(stmt)).scalars().all()
+        return [PostModelMapper.to_entity(model=post_) for post_ in result]
+
+    def _build_filter(self, filter_: GetMultiPostsFilter) -> list:
+        filter_stmt = []
+        if filter_.from_date is not None and filter_.to_date is not None:
+            filter_stmt.append(Post.created_at >= filter_.from_date)
+            filter_stmt.append(Post.created_at <= filter_.to_date)
+        return filter_stmt
+
     async def get_multi(
         self, filter_: GetMultiPostsFilter
     ) -> Tuple[List[PostEntity], Optional[int]]:
@@ -46,16 +88,7 @@ class PostRepo(AbstractPostRepo):
         else:
             sort_stmt = desc(Post.created_at)
 
-        filter_stmt = []
-        if filter_.from_date is not None and filter_.to_date is not None:
-            from_date_dt = from_str_to_dt(
-                str_time=filter_.from_date, format_=DATETIME_DEFAULT_FORMAT
-            )
-            to_date_dt = from_str_to_dt(
-                str_time=filter_.to_date, format_=DATETIME_DEFAULT_FORMAT
-            )
-            filter_stmt.append(Post.created_at >= from_date_dt)
-            filter_stmt.append(Post.created_at <= to_date_dt)
+        filter_stmt = self._build_filter(filter_=filter_)
 
         # Count query - only count the "id" column
         # optional call count query
@@ -73,13 +106,74 @@ class PostRepo(AbstractPostRepo):
         posts = [PostModelMapper.to_entity(model=post_) for post_ in result]
         return posts, total_count
 
-    async def update(self, entity: PostEntity):
-        obj_in_data = entity.to_dict(exclude_none=True)
-        stmt = update(Post).where(Post.id_ == entity.id_).values(**obj_in_data)
-        await self.session.execute(stmt)
-        return
+    async def get_revision(self, id_: UUID4) -> Optional[str]:
+        stmt = select(Post.id_, Post.version, Post.comment_count).where(Post.id_ == id_)
+        row = (await self.session.execute(stmt)).first()
+        if not row:
+            return None
+        return PostEntity.build_revision(
+            id_=row.id_, version=row.version, comment_count=row.comment_count
+        )
+
+    async def get_multi_revision(self, filter_: GetMultiPostsFilter) -> Tuple[str, int]:
+        # one aggregate over the filtered set, it also replaces the count query
+        stmt = select(
+            func.count(Post.id_),
+            func.max(func.coalesce(Post.updated_at, Post.created_at)),
+            func.coalesce(func.sum(Post.version), 0),
+            func.coalesce(func.sum(Post.comment_count), 0),
+        ).filter(*self._build_filter(filter_=filter_))
+        (total_count, last_modified, versions, comment_counts) = (
+            await self.session.execute(stmt)
+        ).one()
+        revision = f"{total_count}:{last_modified}:{versions}:{comment_counts}"
+        return revision, total_count
 
     async def delete(self, id_: UUID4):
         stmt = delete(Post).where(Post.id_ == id_)
         await self.session.execute(stmt)
         return
+
+    async def update_by_owner(
+        self,
+        id_: UUID4,
+        owner_id: UUID4,
+        values: dict,
+        version: Optional[int] = None,
+    ) -> Optional[PostEntity]:
+        filter_stmt = [Post.id_ == id_, Post.owner_id == owner_id]
+        if version is not None:
+            filter_stmt.append(Post.version == version)
+        stmt = (
+            update(Post)
+            .where(*filter_stmt)
+            .values(**values, version=Post.version + 1)
+            .returning(Post)
+        )
+        token_ = (await self.session.execute(stmt)).scalars().first()
+        if not token_:
+            return None
+        return PostModelMapper.to_entity(model=token_)
+
+    async def delete_by_owner(
+        self, id_: UUID4, owner_id: UUID4
+    ) -> Optional[PostEntity]:
+        stmt = (
+            delete(Post)
+            .where(Post.id_ == id_, Post.owner_id == owner_id)
+            .returning(Post)
+        )
+        token_ = (await self.session.execute(stmt)).scalars().first()
+        if not token_:
+            return None
+        return PostModelMapper.to_entity(model=token_)
+
+    async def delete_multi(self, owner_id: UUID4) -> List[PostEntity]:
+        stmt = delete(Post).where(Post.owner_id == owner_id).returning(Post)
+        result = (await self.session.execute(stmt)).scalars().all()
+        return [PostModelMapper.to_entity(model=post_) for post_ in result]
+
+    async def increase_comment_count(self, deltas: Dict[UUID4, int]):
+        await increase_counter(
+            session=self.session, column=Post.__table__.c.comment_count, deltas=deltas
+        )
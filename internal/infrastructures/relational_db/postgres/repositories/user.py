@@ -1,14 +1,22 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import UUID4
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import UUID, any_, bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from internal.domains.entities import UserEntity
 from internal.infrastructures.relational_db.abstraction import AbstractUserRepo
 from internal.infrastructures.relational_db.postgres.models import User, UserModelMapper
+from internal.infrastructures.relational_db.postgres.repositories.counters import (
+    increase_counter,
+)
+from utils.metrics_utils import REPOSITORY_CALL_DURATION, instrument_methods
+from utils.tracing_utils import trace_methods
 
 
+@trace_methods(component="UserRepo", attributes={"db.system": "postgresql"})
+@instrument_methods(histogram=REPOSITORY_CALL_DURATION, component="user")
 class UserRepo(AbstractUserRepo):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -31,8 +39,27 @@ class UserRepo(AbstractUserRepo):
             return None
         return UserModelMapper.to_entity(model=token_)
 
+    async def lock_for_update(self, id_: UUID4) -> bool:
+        # FOR NO KEY UPDATE is the lock the counter caches take anyway, so
+        # concurrent child inserts queue here instead of deadlocking on an upgrade
+        stmt = select(User.id_).where(User.id_ == id_).with_for_update(key_share=True)
+        return (await self.session.execute(stmt)).scalar() is not None
+
+    async def get_by_ids(self, ids: List[UUID4]) -> List[UserEntity]:
+        if not ids:
+            return []
+        # one array parameter, so every page size shares the same statement
+        stmt = select(User).where(
+            User.id_ == any_(bindparam("ids", value=list(ids), type_=ARRAY(UUID)))
+        )
+        result = (await self.session.execute(stmt)).scalars().all()
+        return [UserModelMapper.to_entity(model=user_) for user_ in result]
+
     async def update(self, entity: UserEntity):
         obj_in_data = entity.to_dict()
+        # counters are only maintained through increase_* statements
+        obj_in_data.pop("post_count", None)
+        obj_in_data.pop("comment_count", None)
         stmt = update(User).where(User.id_ == entity.id_).values(**obj_in_data)
         await self.session.execute(stmt)
         return
@@ -41,3 +68,13 @@ class UserRepo(AbstractUserRepo):
         stmt = delete(User).where(User.id_ == id_)
         await self.session.execute(stmt)
         return
+
+    async def increase_post_count(self, deltas: Dict[UUID4, int]):
+        await increase_counter(
+            session=self.session, column=User.__table__.c.post_count, deltas=deltas
+        )
+
+    async def increase_comment_count(self, deltas: Dict[UUID4, int]):
+        await increase_counter(
+            session=self.session, column=User.__table__.c.comment_count, deltas=deltas
+        )
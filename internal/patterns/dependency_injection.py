@@ -1,5 +1,6 @@
 from dependency_injector import containers, providers
 
+from config import QueryProfilerConfig, ReadinessConfig
 from internal.domains.services import AuthenticationSVC, CommentSVC, PostSVC, UserSVC
 from internal.domains.usecases import (
     AuthenticationUC,
@@ -22,6 +23,10 @@ from internal.infrastructures.relational_db import (
 )
 from internal.infrastructures.relational_db.base import Base
 from internal.infrastructures.relational_db.patterns import AsyncSQLAlchemyUnitOfWork
+from internal.infrastructures.relational_db.postgres.profiler import (
+    get_query_profiler,
+)
+from utils.health_utils import get_dependency_monitor
 
 
 class Container(containers.DeclarativeContainer):
@@ -44,6 +49,7 @@ class Container(containers.DeclarativeContainer):
         db_url=config.relational_db.url,
         enable_log=config.relational_db.enable_log,
         enable_migrations=config.relational_db.enable_auto_migrate,
+        isolation_level=config.relational_db.isolation_level,
     )
 
     relational_db_scoped_session = providers.Resource(
@@ -78,6 +84,7 @@ class Container(containers.DeclarativeContainer):
     user_repo_factory = providers.Factory(UserRepo)
 
     ### Unit of Work
+    # a fresh one for every transaction, the shared services take this provider
     relational_db_uow = providers.Factory(
         AsyncSQLAlchemyUnitOfWork,
         scoped_session=relational_db_scoped_session,
@@ -87,44 +94,46 @@ class Container(containers.DeclarativeContainer):
     )
 
     # Domains
+    # usecases and services are stateless, built once and shared by every request
     ## UseCases
-    post_uc = providers.Factory(PostUC)
-    comment_uc = providers.Factory(CommentUC)
-    user_uc = providers.Factory(UserUC)
-    authentication_uc = providers.Factory(
+    post_uc = providers.Singleton(PostUC)
+    comment_uc = providers.Singleton(CommentUC)
+    user_uc = providers.Singleton(UserUC)
+    authentication_uc = providers.Singleton(
         AuthenticationUC, external_authentication_svc=external_authentication_svc
     )
-    authorization_uc = providers.Factory(
+    authorization_uc = providers.Singleton(
         AuthorizationUC, external_authorization_svc=external_rebac_authorization_svc
     )
 
     ## Services
-    post_svc = providers.Factory(
+    post_svc = providers.Singleton(
         PostSVC,
-        relational_db_uow=relational_db_uow,
+        relational_db_uow_factory=relational_db_uow.provider,
         post_uc=post_uc,
         comment_uc=comment_uc,
         user_uc=user_uc,
         authorization_uc=authorization_uc,
     )
-    comment_svc = providers.Factory(
+    comment_svc = providers.Singleton(
         CommentSVC,
-        relational_db_uow=relational_db_uow,
+        relational_db_uow_factory=relational_db_uow.provider,
         comment_uc=comment_uc,
+        post_uc=post_uc,
         user_uc=user_uc,
         authorization_uc=authorization_uc,
     )
-    user_svc = providers.Factory(
+    user_svc = providers.Singleton(
         UserSVC,
-        relational_db_uow=relational_db_uow,
+        relational_db_uow_factory=relational_db_uow.provider,
         user_uc=user_uc,
         post_uc=post_uc,
         comment_uc=comment_uc,
         authorization_uc=authorization_uc,
     )
-    authentication_svc = providers.Factory(
+    authentication_svc = providers.Singleton(
         AuthenticationSVC,
-        relational_db_uow=relational_db_uow,
+        relational_db_uow_factory=relational_db_uow.provider,
         authentication_uc=authentication_uc,
         user_uc=user_uc,
     )
@@ -138,3 +147,52 @@ async def initialize_relational_db(container: Container):
 async def close_relational_db(container: Container):
     """Initialize the relational database."""
     await container.relational_db().close()
+
+
+def configure_query_profiler(config: QueryProfilerConfig):
+    """Apply the slow query log and query budget settings."""
+    get_query_profiler().configure(
+        enabled=config.enable,
+        slow_query_ms=config.slow_query_ms,
+        explain_sample_rate=config.explain_sample_rate,
+        max_queries_per_request=config.max_queries_per_request,
+        budget_mode=config.budget_mode,
+        max_statement_length=config.max_statement_length,
+    )
+
+
+async def start_dependency_monitor(container: Container, config: ReadinessConfig):
+    """Register the dependencies behind the readiness probe and start pinging them."""
+    monitor = get_dependency_monitor()
+    monitor.configure(
+        window_seconds=config.window_seconds,
+        min_samples=config.min_samples,
+        max_error_rate=config.max_error_rate,
+        ping_interval_seconds=config.ping_interval_seconds,
+        ping_timeout_seconds=config.ping_timeout_seconds,
+    )
+    relational_db = container.relational_db()
+    monitor.register(
+        name=relational_db.dependency_name,
+        p99_threshold_ms=config.postgres_p99_threshold_ms,
+        ping=relational_db.ping,
+        # the ping runs a statement on the instrumented engine
+        self_reporting=True,
+    )
+    authentication_svc = container.external_authentication_svc()
+    monitor.register(
+        name=authentication_svc.dependency_name,
+        p99_threshold_ms=config.keycloak_p99_threshold_ms,
+        ping=authentication_svc.ping,
+    )
+    rebac_authorization_svc = container.external_rebac_authorization_svc()
+    monitor.register(
+        name=rebac_authorization_svc.dependency_name,
+        p99_threshold_ms=config.openfga_p99_threshold_ms,
+        ping=rebac_authorization_svc.ping,
+    )
+    monitor.start()
+
+
+async def stop_dependency_monitor():
+    await get_dependency_monitor().stop()
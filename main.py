@@ -1,10 +1,9 @@
-import asyncio
-
-import uvicorn
+import os
+import subprocess
 
 from config import app_config
 from config import logger as deferred_logger
-from internal.app import init_health_check_server, init_http_server
+from internal.app import WorkerSupervisor, serve
 from utils.logger_utils import get_shared_logger
 
 # Get the configured logger
@@ -13,43 +12,43 @@ logger = get_shared_logger()
 # Set the real logger for our DeferredLogger in config.py
 deferred_logger.set_real_logger(logger)
 
+# Both the main and the health check apps are served by the same uvicorn server
+APP_FACTORY = "internal.app:init_server"
 
-http_server_ = init_http_server()
-
+ADDRESSES = [
+    ("0.0.0.0", app_config.main_http_port),
+    ("0.0.0.0", app_config.health_check_http_port),
+]
 
-async def main_http_server():
-    config = uvicorn.Config(
-        app="main:http_server_",
-        host="0.0.0.0",
-        port=app_config.main_http_port,
-        log_level=app_config.log_level.lower(),
-        log_config=None,  # Disable Uvicorn's logging configuration
-        workers=app_config.uvicorn_workers,
-    )
-    server = uvicorn.Server(config)
-    await server.serve()
 
+def run_migrations_once():
+    """Upgrade the schema from the supervisor, before any worker starts.
 
-health_check_server_ = init_health_check_server()
+    Workers inherit the environment, so auto migration is switched off for them
+    instead of having every worker race on ``alembic upgrade head``.
+    """
+    if not app_config.relational_db.enable_auto_migrate:
+        return
+    subprocess.run(["alembic", "upgrade", "head"], check=True)
+    os.environ["RELATIONAL_DB__ENABLE_AUTO_MIGRATE"] = "false"
+    logger.info("Relational database migrated by the supervisor")
 
 
-async def main_health_check_server():
-    config = uvicorn.Config(
-        app="main:health_check_server_",
-        host="0.0.0.0",
-        port=app_config.health_check_http_port,
-        log_level=app_config.log_level.lower(),
-        log_config=None,  # Disable Uvicorn's logging configuration
-        workers=app_config.uvicorn_workers,
-    )
-    server = uvicorn.Server(config)
-    await server.serve()
-
-
-async def main():
+def main():
     """Main entry point for the application."""
-    await asyncio.gather(main_health_check_server(), main_http_server())
+    if app_config.uvicorn_workers <= 1:
+        serve(app=APP_FACTORY, addresses=ADDRESSES, log_level=app_config.log_level)
+        return
+
+    run_migrations_once()
+    WorkerSupervisor(
+        app=APP_FACTORY,
+        addresses=ADDRESSES,
+        workers=app_config.uvicorn_workers,
+        log_level=app_config.log_level,
+        reuse_port=app_config.uvicorn_reuse_port,
+    ).run()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
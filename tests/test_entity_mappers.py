@@ -0,0 +1,83 @@
+import unittest
+import uuid
+from datetime import UTC, datetime
+
+from internal.domains.entities import CommentEntity, PostEntity, UserEntity
+from internal.infrastructures.relational_db.postgres.models import (
+    Comment,
+    CommentModelMapper,
+    Post,
+    PostModelMapper,
+    User,
+    UserModelMapper,
+)
+
+
+def _now() -> datetime:
+    return datetime(2025, 6, 1, 12, 30, 45, 123456, tzinfo=UTC)
+
+
+class TestEntityMappers(unittest.TestCase):
+    """``from_trusted`` mappers must build what ``model_validate`` builds."""
+
+    def assert_same_entity(self, trusted, validated):
+        self.assertEqual(trusted, validated)
+        self.assertEqual(trusted.model_dump(), validated.model_dump())
+        # field order shows in every serialized response
+        self.assertEqual(list(trusted.model_dump()), list(validated.model_dump()))
+        self.assertEqual(trusted.model_dump_json(), validated.model_dump_json())
+
+    def test_post(self):
+        for updated_at in (None, _now()):
+            row = Post(
+                id_=uuid.uuid4(),
+                text_content="Lorem ipsum",
+                created_at=_now(),
+                updated_at=updated_at,
+                version=3,
+                comment_count=12,
+                owner_id=uuid.uuid4(),
+            )
+            self.assert_same_entity(
+                PostModelMapper.to_entity(model=row), PostEntity.model_validate(row)
+            )
+
+    def test_comment(self):
+        for updated_at in (None, _now()):
+            row = Comment(
+                id_=uuid.uuid4(),
+                text_content="Lorem ipsum",
+                created_at=_now(),
+                updated_at=updated_at,
+                version=2,
+                post_id=uuid.uuid4(),
+                owner_id=uuid.uuid4(),
+            )
+            self.assert_same_entity(
+                CommentModelMapper.to_entity(model=row),
+                CommentEntity.model_validate(row),
+            )
+
+    def test_user(self):
+        for metadata_ in (None, {"email": "user@example.com"}):
+            row = User(
+                id_=uuid.uuid4(),
+                username="user",
+                metadata_=metadata_,
+                is_active=True,
+                created_at=_now(),
+                updated_at=None,
+                post_count=4,
+                comment_count=9,
+            )
+            self.assert_same_entity(
+                UserModelMapper.to_entity(model=row), UserEntity.model_validate(row)
+            )
+
+    def test_missing_required_field(self):
+        with self.assertRaises(TypeError):
+            PostEntity.from_trusted(id_=uuid.uuid4(), text_content="Lorem ipsum")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,357 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from utils.logger_utils import get_shared_logger
+from utils.metrics_utils import EVENT_LOOP_LAG
+
+logger = get_shared_logger()
+
+Ping = Callable[[], Awaitable[object]]
+
+_EVENT_LOOP_LAG = EVENT_LOOP_LAG.labels()
+
+
+class DependencyStatus(str, Enum):
+    OK = "ok"
+    DEGRADED = "degraded"
+    UNKNOWN = "unknown"
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(q * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+class LatencyTracker:
+    """Rolling window of call latencies and outcomes for one dependency.
+
+    Recording is O(1) so it can sit on the request path; percentiles are only
+    computed when a snapshot is asked for.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, max_samples: int = 2048):
+        self.window_seconds = window_seconds
+        # (monotonic time, latency in seconds, succeeded)
+        self._samples: Deque[Tuple[float, float, bool]] = deque(maxlen=max_samples)
+        self.last_error: Optional[str] = None
+
+    def record(self, latency: float, ok: bool = True, error: Optional[str] = None):
+        self._samples.append((time.monotonic(), latency, ok))
+        if not ok:
+            self.last_error = error
+
+    def _prune(self):
+        horizon = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < horizon:
+            self._samples.popleft()
+
+    def snapshot(self) -> dict:
+        self._prune()
+        latencies = sorted(sample[1] for sample in self._samples)
+        errors = sum(1 for sample in self._samples if not sample[2])
+        count = len(latencies)
+        return {
+            "count": count,
+            "error_rate": errors / count if count else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "last_error": self.last_error,
+        }
+
+
+class DependencyMonitor:
+    """Latency and error-rate stats of downstream dependencies.
+
+    Samples come from real traffic (``track``/``record``) and from optional
+    background pings, so an idle pod still has fresh data. A dependency is
+    reported degraded when, with at least ``min_samples`` in the window, its p99
+    latency goes over its threshold or its error rate over ``max_error_rate``.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        min_samples: int = 5,
+        max_error_rate: float = 0.05,
+        ping_interval_seconds: float = 5.0,
+        ping_timeout_seconds: float = 2.0,
+    ):
+        self._window_seconds = window_seconds
+        self._min_samples = min_samples
+        self._max_error_rate = max_error_rate
+        self._ping_interval_seconds = ping_interval_seconds
+        self._ping_timeout_seconds = ping_timeout_seconds
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._pings: Dict[str, Ping] = {}
+        self._self_reporting: Set[str] = set()
+        self._ping_task: Optional[asyncio.Task] = None
+
+    def configure(
+        self,
+        window_seconds: float,
+        min_samples: int,
+        max_error_rate: float,
+        ping_interval_seconds: float,
+        ping_timeout_seconds: float,
+    ):
+        self._window_seconds = window_seconds
+        self._min_samples = min_samples
+        self._max_error_rate = max_error_rate
+        self._ping_interval_seconds = ping_interval_seconds
+        self._ping_timeout_seconds = ping_timeout_seconds
+        for tracker in self._trackers.values():
+            tracker.window_seconds = window_seconds
+
+    def register(
+        self,
+        name: str,
+        p99_threshold_ms: float,
+        ping: Optional[Ping] = None,
+        self_reporting: bool = False,
+    ):
+        """Declare a dependency and its optional background ping.
+
+        ``self_reporting`` is for pings that already go through the dependency's
+        own instrumentation (e.g. a statement on an instrumented engine), so their
+        outcome is not recorded twice.
+        """
+        self._tracker(name=name)
+        self._thresholds[name] = p99_threshold_ms
+        if ping is not None:
+            self._pings[name] = ping
+            if self_reporting:
+                self._self_reporting.add(name)
+
+    def _tracker(self, name: str) -> LatencyTracker:
+        tracker = self._trackers.get(name)
+        if tracker is None:
+            tracker = self._trackers[name] = LatencyTracker(
+                window_seconds=self._window_seconds
+            )
+        return tracker
+
+    def record(
+        self, name: str, latency: float, ok: bool = True, error: Optional[str] = None
+    ):
+        self._tracker(name=name).record(latency=latency, ok=ok, error=error)
+
+    @asynccontextmanager
+    async def track(
+        self, name: str, errors: Tuple[Type[BaseException], ...] = (Exception,)
+    ) -> AsyncIterator[None]:
+        """Time the wrapped call; only exceptions in ``errors`` count as failures."""
+        started = time.perf_counter()
+        try:
+            yield
+        except errors as exc:
+            self.record(
+                name=name,
+                latency=time.perf_counter() - started,
+                ok=False,
+                error=repr(exc),
+            )
+            raise
+        except BaseException:
+            self.record(name=name, latency=time.perf_counter() - started)
+            raise
+        self.record(name=name, latency=time.perf_counter() - started)
+
+    async def _ping(self, name: str, ping: Ping):
+        self_reporting = name in self._self_reporting
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(ping(), timeout=self._ping_timeout_seconds)
+        except Exception as exc:
+            logger.warning(f"Ping to {name} failed: {exc!r}")
+            # a cancelled call never reaches the dependency's own instrumentation
+            if not self_reporting or isinstance(exc, asyncio.TimeoutError):
+                self.record(
+                    name=name,
+                    latency=time.perf_counter() - started,
+                    ok=False,
+                    error=repr(exc),
+                )
+            return
+        if not self_reporting:
+            self.record(name=name, latency=time.perf_counter() - started)
+
+    async def _ping_forever(self):
+        while True:
+            await asyncio.gather(
+                *(
+                    self._ping(name=name, ping=ping)
+                    for name, ping in self._pings.items()
+                )
+            )
+            await asyncio.sleep(self._ping_interval_seconds)
+
+    def start(self):
+        if self._ping_task is None and self._pings:
+            self._ping_task = asyncio.create_task(self._ping_forever())
+
+    async def stop(self):
+        if self._ping_task is None:
+            return
+        self._ping_task.cancel()
+        try:
+            await self._ping_task
+        except asyncio.CancelledError:
+            pass
+        self._ping_task = None
+
+    def report(self) -> Tuple[DependencyStatus, Dict[str, dict]]:
+        overall = DependencyStatus.OK
+        dependencies = {}
+        for name, tracker in self._trackers.items():
+            stats = tracker.snapshot()
+            threshold = self._thresholds.get(name)
+            status = DependencyStatus.OK
+            if stats["count"] < self._min_samples:
+                status = DependencyStatus.UNKNOWN
+            elif stats["error_rate"] > self._max_error_rate or (
+                threshold is not None and stats["p99_ms"] > threshold
+            ):
+                status = DependencyStatus.DEGRADED
+                overall = DependencyStatus.DEGRADED
+            dependencies[name] = {
+                **stats,
+                "p99_threshold_ms": threshold,
+                "status": status.value,
+            }
+        return overall, dependencies
+
+
+_dependency_monitor = DependencyMonitor()
+
+
+def get_dependency_monitor() -> DependencyMonitor:
+    """Return the process-wide dependency monitor."""
+    return _dependency_monitor
+
+
+class EventLoopWatchdog:
+    """Measure the event loop lag and catch what blocks the loop.
+
+    A heartbeat task sleeps ``interval_seconds`` in a loop; how late it wakes
+    up is the lag every other coroutine suffered too, exported as
+    ``event_loop_lag_seconds``. A watchdog thread checks the heartbeat, and once
+    it is late by ``stall_threshold_seconds`` logs the loop thread's stack,
+    i.e. the synchronous code holding the loop, once per stall.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 0.1,
+        stall_threshold_seconds: float = 0.25,
+        max_stack_depth: int = 30,
+        window_seconds: float = 60.0,
+    ):
+        self._interval_seconds = interval_seconds
+        self._stall_threshold_seconds = stall_threshold_seconds
+        self._max_stack_depth = max_stack_depth
+        self._lags = LatencyTracker(window_seconds=window_seconds)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def configure(
+        self,
+        interval_seconds: float,
+        stall_threshold_seconds: float,
+        max_stack_depth: int,
+    ):
+        self._interval_seconds = interval_seconds
+        self._stall_threshold_seconds = stall_threshold_seconds
+        self._max_stack_depth = max_stack_depth
+
+    async def _heartbeat(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self._interval_seconds)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(0.0, now - started - self._interval_seconds)
+            _EVENT_LOOP_LAG.observe(lag)
+            self._lags.record(latency=lag)
+
+    def _loop_stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "<unavailable>"
+        return "".join(traceback.format_stack(frame, limit=self._max_stack_depth))
+
+    def _watch(self):
+        reported_beat = None
+        # checking twice per threshold catches every stall close to its start
+        check_interval = max(self._stall_threshold_seconds / 2, 0.01)
+        while not self._stopping.wait(timeout=check_interval):
+            last_beat = self._last_beat
+            overdue = time.monotonic() - last_beat - self._interval_seconds
+            if overdue < self._stall_threshold_seconds or last_beat == reported_beat:
+                continue
+            reported_beat = last_beat
+            logger.warning(
+                f"Event loop blocked for more than {overdue * 1000:.0f} ms, "
+                f"loop thread stack:\n{self._loop_stack()}"
+            )
+
+    def start(self):
+        """Start watching the running loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def report(self) -> Dict[str, float]:
+        stats = self._lags.snapshot()
+        return {"lag_p50_ms": stats["p50_ms"], "lag_p99_ms": stats["p99_ms"]}
+
+
+_event_loop_watchdog = EventLoopWatchdog()
+
+
+def get_event_loop_watchdog() -> EventLoopWatchdog:
+    """Return the process-wide event loop watchdog."""
+    return _event_loop_watchdog
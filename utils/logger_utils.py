@@ -1,10 +1,21 @@
+import asyncio
+import atexit
 import json
 import logging
+import random
+import select
 import sys
+import threading
+import time
 import warnings
+from collections import deque
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
+from enum import Enum
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import ecs_logging
+import orjson
 from loguru import logger
 
 # Import app_config after patching loguru
@@ -12,20 +23,158 @@ from loguru import logger
 # We'll import it later in the configure_logger function
 
 
+class _LoggerRule:
+    """Sampling and per-second rate limit for the records of one logger tree."""
+
+    def __init__(self, sample_rate: float = 1.0, rate_limit: Optional[int] = None):
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self._second = 0
+        self._count = 0
+        self._suppressed = 0
+
+    def allow(self) -> Tuple[bool, int]:
+        """Whether to keep the record, and how many were suppressed last second."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False, 0
+        if self.rate_limit is None:
+            return True, 0
+
+        suppressed = 0
+        second = int(time.monotonic())
+        if second != self._second:
+            suppressed, self._suppressed = self._suppressed, 0
+            self._second, self._count = second, 0
+        if self._count >= self.rate_limit:
+            self._suppressed += 1
+            return False, suppressed
+        self._count += 1
+        return True, suppressed
+
+
+def parse_logger_rules(value: Optional[str]) -> Dict[str, str]:
+    """Parse ``"sqlalchemy.engine=0.1,uvicorn.access=0.5"`` into a dict."""
+    rules = {}
+    for item in (value or "").split(","):
+        name, sep, rule = item.partition("=")
+        if sep and name.strip() and rule.strip():
+            rules[name.strip()] = rule.strip()
+    return rules
+
+
+_intercepted = threading.local()
+
+
+def _from_stdlib_record(record: dict):
+    # origin of the stdlib record, instead of the frame of InterceptHandler.emit
+    origin: Optional[logging.LogRecord] = getattr(_intercepted, "record", None)
+    if origin is None:
+        return
+    record["name"] = origin.name
+    record["module"] = origin.module
+    record["function"] = origin.funcName
+    record["line"] = origin.lineno
+    record["file"] = type(record["file"])(origin.filename, origin.pathname)
+
+
+_intercept_logger = logger.patch(_from_stdlib_record)
+
+
 # Create a class to intercept standard library logs
 class InterceptHandler(logging.Handler):
-    """Intercepts standard library logs and redirects them to loguru."""
+    """Intercepts standard library logs and redirects them to loguru.
+
+    In ``fast`` mode the origin (logger name, function, line) is copied from the
+    stdlib record instead of walking the Python frames, and level names are
+    resolved once. Records below WARNING from the loggers listed in
+    ``sample_rates``/``rate_limits`` (a logger and its children) are sampled
+    and/or capped per second before their message is even formatted.
+    """
+
+    def __init__(
+        self,
+        fast: bool = True,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, int]] = None,
+    ):
+        super().__init__()
+        self._fast = fast
+        self._levels: Dict[str, Union[str, int]] = {}
+        self._rules: Dict[str, _LoggerRule] = {}
+        for name in set(sample_rates or {}) | set(rate_limits or {}):
+            self._rules[name] = _LoggerRule(
+                sample_rate=float((sample_rates or {}).get(name, 1.0)),
+                rate_limit=(
+                    int(rate_limits[name]) if name in (rate_limits or {}) else None
+                ),
+            )
+        self._rule_by_logger: Dict[str, Optional[_LoggerRule]] = {}
+
+    def _level(self, record: logging.LogRecord) -> Union[str, int]:
+        level = self._levels.get(record.levelname)
+        if level is None:
+            # Get the corresponding Loguru level if it exists
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelname] = level
+        return level
+
+    def _rule(self, name: str) -> Optional[_LoggerRule]:
+        try:
+            return self._rule_by_logger[name]
+        except KeyError:
+            pass
+        rule = None
+        prefix = name
+        while prefix:
+            rule = self._rules.get(prefix)
+            if rule is not None:
+                break
+            prefix = prefix.rpartition(".")[0]
+        self._rule_by_logger[name] = rule
+        return rule
 
     def emit(self, record):
+        if self._rules and record.levelno < logging.WARNING:
+            rule = self._rule(name=record.name)
+            if rule is not None:
+                allowed, suppressed = rule.allow()
+                if suppressed:
+                    logger.warning(
+                        f"Suppressed {suppressed} records from {record.name} "
+                        f"over the rate limit"
+                    )
+                if not allowed:
+                    return
+
+        if not self._fast:
+            self._emit_with_frames(record=record)
+            return
+
+        _intercepted.record = record
+        try:
+            if record.exc_info:
+                _intercept_logger.opt(exception=record.exc_info).log(
+                    self._level(record=record), record.getMessage()
+                )
+            else:
+                _intercept_logger.log(self._level(record=record), record.getMessage())
+        finally:
+            _intercepted.record = None
+
+    def _emit_with_frames(self, record: logging.LogRecord):
         # Get the corresponding Loguru level if it exists
         try:
             level = logger.level(record.levelname).name
         except ValueError:
             level = record.levelno
 
-        # Find the caller from where the logged message originated
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
+        # Find the caller from where the logged message originated, skipping
+        # the frames of this handler and of the logging module
+        frame, depth = sys._getframe(0), 0
+        while frame and frame.f_code.co_filename in (__file__, logging.__file__):
             frame = frame.f_back
             depth += 1
 
@@ -41,10 +190,17 @@ class ECSLogSink:
         self.sink = sink
         self.ecs_formatter = ecs_logging.StdlibFormatter()
 
-    def __call__(self, message):
-        # Extract record data from the message
-        record = message.record
+    @staticmethod
+    def format_timestamp(dt: datetime) -> str:
+        # Use UTC time and format with exactly 3 digits for milliseconds
+        return (
+            datetime.fromtimestamp(dt.timestamp(), tz=timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%S.%f"
+            )[:-3]
+            + "Z"
+        )
 
+    def format_record(self, record: dict) -> dict:
         # Create a standard LogRecord for ECS formatting
         log_record = logging.LogRecord(
             name=record["name"],
@@ -56,6 +212,11 @@ class ECSLogSink:
             exc_info=record["exception"],
             func=record["function"],
         )
+        # the record may be formatted on another thread than the one that logged it
+        log_record.thread = record["thread"].id
+        log_record.threadName = record["thread"].name
+        log_record.process = record["process"].id
+        log_record.processName = record["process"].name
 
         # Add extra fields from the loguru record to the log record
         for key, value in record["extra"].items():
@@ -65,20 +226,316 @@ class ECSLogSink:
         ecs_dict = self.ecs_formatter.format_to_ecs(log_record)
 
         # Add additional fields that might be missing
-        # Use UTC time and format with exactly 3 digits for milliseconds
-        ecs_dict["@timestamp"] = (
-            datetime.fromtimestamp(
-                record["time"].timestamp(), tz=timezone.utc
-            ).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
-            + "Z"
-        )
+        ecs_dict["@timestamp"] = self.format_timestamp(record["time"])
+        return ecs_dict
 
+    def __call__(self, message):
         # Convert to JSON and write to sink
-        json_line = json.dumps(ecs_dict) + "\n"
+        json_line = json.dumps(self.format_record(record=message.record)) + "\n"
         self.sink.write(json_line)
         self.sink.flush()
 
 
+ERROR_LEVEL_NO = logging.ERROR
+
+PIPE_BUF = getattr(select, "PIPE_BUF", 512)
+
+
+class LogOverflowPolicy(str, Enum):
+    DROP_NEW = "drop_new"  # discard the incoming record
+    DROP_OLD = "drop_old"  # discard the oldest buffered record
+    # wait for room, up to ``block_timeout``, then drop. Only threads without a
+    # running event loop wait, records emitted on a loop are dropped instead
+    BLOCK = "block"
+
+
+class AsyncECSLogSink(ECSLogSink):
+    """Non-blocking ECS sink.
+
+    The calling thread (usually the event loop) only appends the loguru record to
+    a bounded buffer. A background thread formats the records to ECS, serializes
+    them with orjson and writes each batch with a single ``write``/``flush``.
+    When the buffer is full, ``overflow`` decides what is lost; the number of
+    dropped records is reported in the log stream itself. Records at ERROR and
+    above may use an extra 10% of ``queue_size`` before they are dropped.
+
+    A batch that fails to write (EPIPE, full disk, closed fd) is counted as
+    dropped as a whole, and the first failure of an outage is noted on the
+    interpreter's original stderr.
+    """
+
+    def __init__(
+        self,
+        sink=sys.stdout,
+        queue_size: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 0.2,
+        overflow: LogOverflowPolicy = LogOverflowPolicy.DROP_NEW,
+        block_timeout: float = 0.1,
+    ):
+        super().__init__(sink=sink)
+        self._stream = getattr(sink, "buffer", None)
+        self._queue_size = queue_size
+        self._error_reserve = max(1, queue_size // 10)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow = LogOverflowPolicy(overflow)
+        self._block_timeout = block_timeout
+        self._buffer: Deque = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._dropped = 0
+        self._write_failures = 0
+        self._failing = False
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="ecs-log-sink", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def __call__(self, message):
+        record = message.record
+        # errors get some headroom on top of the queue size, so an info/debug
+        # burst does not push out the records explaining it
+        limit = self._queue_size
+        if record["level"].no >= ERROR_LEVEL_NO:
+            limit += self._error_reserve
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._buffer) >= limit:
+                if self._overflow == LogOverflowPolicy.DROP_OLD:
+                    self._buffer.popleft()
+                    self._dropped += 1
+                elif (
+                    self._overflow == LogOverflowPolicy.BLOCK
+                    and not self._on_event_loop()
+                ):
+                    self._condition.wait_for(
+                        lambda: len(self._buffer) < limit or self._closed,
+                        timeout=self._block_timeout,
+                    )
+                    if len(self._buffer) >= limit or self._closed:
+                        self._dropped += 1
+                        return
+                else:
+                    self._dropped += 1
+                    return
+            self._buffer.append(record)
+            if len(self._buffer) >= self._batch_size:
+                self._condition.notify_all()
+
+    @staticmethod
+    def _on_event_loop() -> bool:
+        # waiting on the loop thread would stall every request it serves
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def _take_batch(self) -> Tuple[List[dict], int]:
+        with self._condition:
+            if not self._buffer and not self._closed:
+                self._condition.wait(timeout=self._flush_interval)
+            count = min(len(self._buffer), self._batch_size)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            dropped, self._dropped = self._dropped, 0
+            # wake up producers blocked on a full buffer
+            self._condition.notify_all()
+        return batch, dropped
+
+    def _serialize(self, record: dict) -> bytes:
+        try:
+            return orjson.dumps(
+                self.format_record(record=record),
+                default=str,
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+        except Exception as exc:
+            return orjson.dumps(
+                {"message": f"Failed to format log record: {exc!r}"},
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+
+    def _chunks(self, lines: List[bytes]) -> Iterator[bytes]:
+        # pipe writes up to PIPE_BUF are atomic, so lines from several worker
+        # processes sharing stdout never interleave
+        chunk: List[bytes] = []
+        size = 0
+        for line in lines:
+            if chunk and size + len(line) > PIPE_BUF:
+                yield b"".join(chunk)
+                chunk, size = [], 0
+            chunk.append(line)
+            size += len(line)
+        if chunk:
+            yield b"".join(chunk)
+
+    def _write(self, lines: List[bytes]) -> Optional[Exception]:
+        try:
+            for chunk in self._chunks(lines=lines):
+                if self._stream is not None:
+                    self._stream.write(chunk)
+                else:
+                    self.sink.write(chunk.decode())
+            (self._stream or self.sink).flush()
+        except Exception as exc:
+            return exc
+        return None
+
+    def _write_failed(self, exc: Exception, lost: int):
+        # the lost records go out with the next overflow notice, once the
+        # output works again
+        self._write_failures += 1
+        with self._condition:
+            self._dropped += lost
+        if self._failing:
+            return
+        self._failing = True
+        stderr = sys.__stderr__
+        if stderr is None:
+            return
+        try:
+            stderr.write(f"ECS log sink write failed, dropping records: {exc!r}\n")
+            stderr.flush()
+        except Exception:
+            pass
+
+    def _run(self):
+        while True:
+            batch, dropped = self._take_batch()
+            lines = [self._serialize(record=record) for record in batch]
+            if dropped:
+                lines.append(
+                    orjson.dumps(
+                        {
+                            "@timestamp": self.format_timestamp(
+                                datetime.now(timezone.utc)
+                            ),
+                            "log": {"level": "warning", "logger": __name__},
+                            "message": f"Log sink dropped {dropped} records",
+                        },
+                        option=orjson.OPT_APPEND_NEWLINE,
+                    )
+                )
+            if lines:
+                exc = self._write(lines=lines)
+                if exc is not None:
+                    self._write_failed(exc=exc, lost=len(batch) + dropped)
+                else:
+                    self._failing = False
+            with self._condition:
+                if self._closed and not self._buffer:
+                    return
+
+    def stop(self, timeout: float = 5.0):
+        """Flush what is buffered and stop the writer thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout)
+
+
+class RequestLogContext:
+    """What the logs of one request share, kept in a contextvar for its lifetime.
+
+    ``sampled`` is decided once, when the request starts (head-based sampling):
+    when False, the INFO/DEBUG records of the request are dropped while WARNING
+    and above are always kept. ``seen`` holds the ERROR messages already logged,
+    so the same exception logged again by each layer it bubbles through is
+    written only once.
+    """
+
+    __slots__ = (
+        "request_id",
+        "method",
+        "path",
+        "user_id",
+        "trace_id",
+        "started",
+        "sampled",
+        "seen",
+    )
+
+    def __init__(self, request_id: str, method: str, path: str, sampled: bool = True):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.user_id: Optional[str] = None
+        self.trace_id: Optional[str] = None
+        self.started = time.perf_counter()
+        self.sampled = sampled
+        self.seen: Set[str] = set()
+
+
+_request_log_context: ContextVar[Optional[RequestLogContext]] = ContextVar(
+    "request_log_context", default=None
+)
+
+# bounds the per-request memory of already logged errors
+MAX_SEEN_ERRORS = 64
+
+_request_sample_rate = 1.0
+_dedup_errors = True
+
+
+def start_request_log_context(
+    request_id: str, method: str, path: str
+) -> Tuple[RequestLogContext, Token]:
+    context = RequestLogContext(
+        request_id=request_id,
+        method=method,
+        path=path,
+        sampled=_request_sample_rate >= 1.0 or random.random() < _request_sample_rate,
+    )
+    return context, _request_log_context.set(context)
+
+
+def end_request_log_context(token: Token):
+    _request_log_context.reset(token)
+
+
+def get_request_log_context() -> Optional[RequestLogContext]:
+    return _request_log_context.get()
+
+
+def _attach_request_context(record: dict):
+    context = _request_log_context.get()
+    if context is None:
+        return
+    extra = record["extra"]
+    extra["http.request.id"] = context.request_id
+    extra["http.request.method"] = context.method
+    extra["url.path"] = context.path
+    extra["event.duration"] = int((time.perf_counter() - context.started) * 1e9)
+    if context.user_id is not None:
+        extra["user.id"] = context.user_id
+    if context.trace_id is not None:
+        extra["trace.id"] = context.trace_id
+
+
+def _request_log_filter(record: dict) -> bool:
+    context = _request_log_context.get()
+    if context is None:
+        return True
+    level_no = record["level"].no
+    if level_no < logging.WARNING:
+        return context.sampled
+    if _dedup_errors and level_no >= logging.ERROR:
+        message = record["message"]
+        if message in context.seen:
+            return False
+        if len(context.seen) < MAX_SEEN_ERRORS:
+            context.seen.add(message)
+    return True
+
+
+_active_sink = None
+
+
 def configure_logger():
     """Configure loguru logger with ECS format."""
     # Import app_config here to avoid circular imports
@@ -91,19 +548,47 @@ def configure_logger():
     log_level = app_config.log_level
 
     # Add handler with ECS sink
+    global _active_sink
+    if isinstance(_active_sink, AsyncECSLogSink):
+        _active_sink.stop()
+    log_config = app_config.log
+    if log_config.async_sink:
+        _active_sink = AsyncECSLogSink(
+            queue_size=log_config.queue_size,
+            batch_size=log_config.batch_size,
+            flush_interval=log_config.flush_interval_ms / 1000,
+            overflow=log_config.overflow,
+            block_timeout=log_config.block_timeout_ms / 1000,
+        )
+    else:
+        _active_sink = ECSLogSink()
+    global _request_sample_rate, _dedup_errors
+    _request_sample_rate = log_config.request_sample_rate
+    _dedup_errors = log_config.dedup_errors
+    logger.configure(patcher=_attach_request_context)
     logger.add(
-        ECSLogSink(),
+        _active_sink,
         level=log_level,
+        filter=_request_log_filter,
         format="{message}",  # This is needed but will be ignored by our sink
-        backtrace=True,
-        diagnose=True,
+        # the ECS formatter renders the stack trace itself; loguru's annotated
+        # traceback would only be built, on the calling thread, to be thrown away
+        backtrace=False,
+        diagnose=False,
         catch=True,
     )
 
+    # One handler shared by every intercepted logger, so rate limits are global
+    intercept_handler = InterceptHandler(
+        fast=log_config.intercept_fast,
+        sample_rates=parse_logger_rules(log_config.intercept_sample_rates),
+        rate_limits=parse_logger_rules(log_config.intercept_rate_limits),
+    )
+
     # Configure the root logger to use our InterceptHandler
     # This ensures all standard library loggers are intercepted
     root_logger = logging.getLogger()
-    root_logger.handlers = [InterceptHandler()]
+    root_logger.handlers = [intercept_handler]
     root_logger.setLevel(logging.getLevelName(log_level))
     root_logger.propagate = False
 
@@ -116,7 +601,7 @@ def configure_logger():
         "urllib3",
     ]:
         lib_logger = logging.getLogger(logger_name)
-        lib_logger.handlers = [InterceptHandler()]
+        lib_logger.handlers = [intercept_handler]
         lib_logger.propagate = False
         lib_logger.level = logging.getLevelName(log_level)
 
@@ -124,7 +609,7 @@ def configure_logger():
     # This ensures warnings are also formatted in ECS format
     logging.captureWarnings(True)
     warnings_logger = logging.getLogger("py.warnings")
-    warnings_logger.handlers = [InterceptHandler()]
+    warnings_logger.handlers = [intercept_handler]
 
     # Optionally, you can also use a custom showwarning function
     original_showwarning = warnings.showwarning
@@ -0,0 +1,340 @@
+import asyncio
+import functools
+import glob
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from utils.logger_utils import get_shared_logger
+
+logger = get_shared_logger()
+
+# seconds, from a cached lookup to a slow external call
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (suffix, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class HistogramChild:
+    """One labelled series. ``observe`` only bumps counters, it allocates nothing."""
+
+    __slots__ = ("_bounds", "_counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self._bounds = bounds
+        # the last slot counts the observations above the highest bound
+        self._counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        total, counts = 0, []
+        for count in self._counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class Histogram:
+    """Prometheus histogram with a fixed set of label names.
+
+    Children are created once per label values and cached, hot paths should bind
+    them up front with ``labels`` and only call ``observe`` afterwards. Metrics
+    are per process and are only updated from the event loop thread.
+    """
+
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[Tuple[str, ...], HistogramChild] = {}
+
+    def labels(self, *values: str) -> HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            child = self._children[values] = HistogramChild(bounds=self.buckets)
+        return child
+
+    def samples(self) -> Iterable[Sample]:
+        bounds = [_format_value(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            for bound, count in zip(bounds, child.cumulative_counts()):
+                yield "_bucket", {**labels, "le": bound}, count
+            yield "_sum", labels, child.sum
+            yield "_count", labels, child.count
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Histogram] = {}
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(
+                name=name,
+                documentation=documentation,
+                labelnames=labelnames,
+                buckets=buckets,
+            )
+        return metric
+
+    def collect(self, const_labels: Optional[Dict[str, str]] = None) -> List[dict]:
+        """Families as plain data, so other processes can merge them."""
+        const_labels = const_labels or {}
+        return [
+            {
+                "name": metric.name,
+                "type": metric.type_,
+                "help": metric.documentation,
+                "samples": [
+                    (suffix, {**const_labels, **labels}, value)
+                    for suffix, labels, value in metric.samples()
+                ],
+            }
+            for metric in self._metrics.values()
+        ]
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(families: Iterable[dict]) -> str:
+    """Render families in the Prometheus text format, merging same-name ones."""
+    merged: Dict[str, dict] = {}
+    for family in families:
+        target = merged.setdefault(family["name"], {**family, "samples": []})
+        target["samples"].extend(family["samples"])
+
+    lines = []
+    for name, family in merged.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for suffix, labels, value in family["samples"]:
+            label_str = ",".join(
+                f'{key}="{_escape(str(val))}"' for key, val in labels.items()
+            )
+            lines.append(
+                f"{name}{suffix}{{{label_str}}} {_format_value(value)}"
+                if label_str
+                else f"{name}{suffix} {_format_value(value)}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def timed(child_ok: HistogramChild, child_error: HistogramChild) -> Callable:
+    """Decorate a coroutine function to observe its duration by outcome."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException:
+                child_error.observe(time.perf_counter() - started)
+                raise
+            child_ok.observe(time.perf_counter() - started)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_methods(
+    histogram: Histogram, component: str, methods: Optional[Sequence[str]] = None
+) -> Callable[[type], type]:
+    """Class decorator timing the public coroutine methods of the class.
+
+    Only ``methods`` are timed when given. The histogram must be labelled
+    ``(component, method, outcome)``; the children are bound when the class is
+    decorated.
+    """
+
+    def decorator(cls: type) -> type:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not asyncio.iscoroutinefunction(value):
+                continue
+            if methods is not None and attr not in methods:
+                continue
+            setattr(
+                cls,
+                attr,
+                timed(
+                    child_ok=histogram.labels(component, attr, "ok"),
+                    child_error=histogram.labels(component, attr, "error"),
+                )(value),
+            )
+        return cls
+
+    return decorator
+
+
+class MultiProcessMetrics:
+    """Share the registries of pre-forked workers through a directory.
+
+    Every worker periodically dumps its own families, labelled with its worker id,
+    to ``<directory>/worker-<id>.json``. Whichever worker serves the scrape
+    renders its live registry merged with the dumps of the others, so a scrape
+    landing on any worker sees the whole pod.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: Optional[str],
+        worker_id: Optional[str],
+        interval_seconds: float = 5.0,
+    ):
+        self._registry = registry
+        self._directory = directory
+        self._worker_id = worker_id
+        self._interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def _const_labels(self) -> Dict[str, str]:
+        return {"worker": self._worker_id} if self._worker_id is not None else {}
+
+    def _own_path(self) -> str:
+        return os.path.join(self._directory, f"worker-{self._worker_id}.json")
+
+    def dump(self):
+        path = self._own_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(orjson.dumps(self._registry.collect(self._const_labels)))
+        os.replace(tmp_path, path)
+
+    async def _dump_forever(self):
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                self.dump()
+            except Exception as exc:
+                logger.warning(f"Failed to dump metrics: {exc!r}")
+
+    def start(self):
+        if self._directory and self._worker_id is not None and self._task is None:
+            self._task = asyncio.create_task(self._dump_forever())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def render(self) -> str:
+        families = self._registry.collect(self._const_labels)
+        if self._directory and self._worker_id is not None:
+            own_path = self._own_path()
+            for path in glob.glob(os.path.join(self._directory, "worker-*.json")):
+                if path == own_path:
+                    continue
+                try:
+                    with open(path, "rb") as file:
+                        families.extend(orjson.loads(file.read()))
+                except (OSError, ValueError):
+                    # a worker may be replacing its dump right now
+                    continue
+        return render(families=families)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+# === Application metrics ===
+HTTP_REQUEST_DURATION = _registry.histogram(
+    name="http_request_duration_seconds",
+    documentation="Time to serve an HTTP request, by route template and status.",
+    labelnames=("method", "route", "status"),
+)
+AUTH_DURATION = _registry.histogram(
+    name="auth_duration_seconds",
+    documentation="Time spent authenticating a request in JWTAuthMiddleware.",
+    labelnames=("outcome",),
+)
+UOW_DURATION = _registry.histogram(
+    name="uow_duration_seconds",
+    documentation="Lifetime of a relational DB unit of work, by how it ended.",
+    labelnames=("outcome",),
+)
+REPOSITORY_CALL_DURATION = _registry.histogram(
+    name="repository_call_duration_seconds",
+    documentation="Time spent in a repository method, queries included.",
+    labelnames=("repository", "method", "outcome"),
+)
+EXTERNAL_CALL_DURATION = _registry.histogram(
+    name="external_call_duration_seconds",
+    documentation="Latency of calls to external services (Keycloak, OpenFGA).",
+    labelnames=("service", "method", "outcome"),
+)
+EVENT_LOOP_LAG = _registry.histogram(
+    name="event_loop_lag_seconds",
+    documentation="How late the event loop heartbeat woke up, blocking work included.",
+)
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from enum import Enum
+from types import FrameType
+from typing import Dict, List, Optional
+
+# never sample for longer, whatever the caller asks for
+MAX_PROFILE_SECONDS = 60.0
+MIN_SAMPLE_INTERVAL_SECONDS = 0.001
+
+# one profile at a time per process, whatever its mode
+_profile_lock = threading.Lock()
+
+
+class ProfileMode(str, Enum):
+    # sampling thread: samples the loop thread on the wall clock, idle included;
+    # biased towards where the loop releases the GIL, mostly in ``select``
+    WALL = "wall"
+    # SIGPROF driven: samples the main thread while the process burns CPU, opt-in
+    # only, see ``_profile_cpu``
+    CPU = "cpu"
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+def _collapse(frame: Optional[FrameType], max_depth: int = 128) -> str:
+    labels: List[str] = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame=frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def render_collapsed(stacks: Counter) -> str:
+    """Collapsed stacks (``frame;frame;frame count``), the input format of
+    flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def cpu_profile_supported() -> bool:
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+async def _profile_cpu(seconds: float, interval_seconds: float) -> Counter:
+    """Sample the main thread on SIGPROF.
+
+    The handler runs on the main thread between two bytecodes, so every sample
+    is exactly where the interpreter was, without the GIL bias of a sampling
+    thread (which mostly catches the loop where it releases the GIL, in
+    ``select``). ITIMER_PROF only ticks while the process is on CPU.
+
+    The timer is process-wide: CPU burned by other threads (the log sink, the
+    watchdog, the default executor) is charged to whatever the main thread is
+    doing, and the signal interrupts blocking syscalls and C extensions with
+    EINTR. Use it deliberately, not as the production default.
+    """
+    stacks: Counter = Counter()
+
+    def on_sample(signum, frame):
+        stacks[_collapse(frame=frame)] += 1
+
+    previous = signal.signal(signal.SIGPROF, on_sample)
+    signal.setitimer(signal.ITIMER_PROF, interval_seconds, interval_seconds)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, previous)
+    return stacks
+
+
+def _sample_thread(thread_id: int, seconds: float, interval_seconds: float) -> Counter:
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        stacks[_collapse(frame=frame)] += 1
+        del frame
+        time.sleep(interval_seconds)
+    return stacks
+
+
+async def profile_event_loop(
+    seconds: float,
+    interval_seconds: float = 0.005,
+    mode: ProfileMode = ProfileMode.WALL,
+) -> str:
+    """Time-boxed sampling profile of the running event loop, as collapsed stacks.
+
+    Nothing is traced and the profiled code runs untouched; the cost is one
+    stack walk per sample. ``ProfileMode.CPU`` is opt-in and falls back to
+    ``WALL`` where SIGPROF is not available (non-Unix, loop off the main thread).
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        seconds = min(seconds, MAX_PROFILE_SECONDS)
+        interval_seconds = max(interval_seconds, MIN_SAMPLE_INTERVAL_SECONDS)
+        if ProfileMode(mode) == ProfileMode.CPU and cpu_profile_supported():
+            stacks = await _profile_cpu(
+                seconds=seconds, interval_seconds=interval_seconds
+            )
+        else:
+            stacks = await asyncio.get_running_loop().run_in_executor(
+                None,
+                _sample_thread,
+                threading.get_ident(),
+                seconds,
+                interval_seconds,
+            )
+        return render_collapsed(stacks=stacks)
+    finally:
+        _profile_lock.release()
+
+
+def dump_tasks(limit: int = 1000, stack_limit: int = 32) -> List[Dict[str, object]]:
+    """Pending tasks of the running loop and where each one is awaiting.
+
+    The stack of a suspended task follows its chain of awaited coroutines, from
+    the task's coroutine down to the innermost ``await``.
+    """
+    tasks = []
+    current = asyncio.current_task()
+    for task in list(asyncio.all_tasks())[:limit]:
+        coro = task.get_coro()
+        tasks.append(
+            {
+                "name": task.get_name(),
+                "coro": getattr(coro, "__qualname__", repr(coro)),
+                "current": task is current,
+                "cancelling": task.cancelling(),
+                "stack": [
+                    f"{frame.f_code.co_filename}:{frame.f_lineno} "
+                    f"in {frame.f_code.co_name}"
+                    for frame in task.get_stack(limit=stack_limit)
+                ],
+            }
+        )
+    return tasks
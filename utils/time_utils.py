@@ -1,4 +1,6 @@
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Tuple
 
 
 class ParseDateTimeException(Exception):
@@ -8,18 +10,76 @@ class ParseDateTimeException(Exception):
 DATETIME_DEFAULT_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
 BIRTH_DATE_FORMAT = "%Y%m%d"
 
+# strptime formats that are also ISO 8601 -> (length, date/time separator,
+# isoformat timespec), served by fromisoformat/isoformat instead of
+# strptime/strftime
+_ISO_FORMATS = {
+    "%Y-%m-%dT%H:%M:%S.%f": (26, "T", "microseconds"),
+    "%Y-%m-%d %H:%M:%S.%f": (26, " ", "microseconds"),
+    "%Y-%m-%dT%H:%M:%S": (19, "T", "seconds"),
+    "%Y-%m-%d %H:%M:%S": (19, " ", "seconds"),
+}
+
+Codec = Tuple[Callable[[str], datetime], Callable[[datetime], str]]
+
+
+@lru_cache(maxsize=64)
+def _compile(format_: str) -> Codec:
+    """Parser and formatter of ``format_``, built once per format."""
+    spec = _ISO_FORMATS.get(format_)
+    if spec is None:
+
+        def parse(str_time: str) -> datetime:
+            return datetime.strptime(str_time, format_)
+
+        def format_dt(dt: datetime) -> str:
+            return dt.strftime(format_)
+
+        return parse, format_dt
+
+    length, sep, timespec = spec
+
+    def parse_iso(str_time: str) -> datetime:
+        # only the canonical shape (zero padded, all six fraction digits, no
+        # offset) takes the fast path, strptime keeps ruling on anything else
+        if (
+            type(str_time) is str
+            and len(str_time) == length
+            and str_time[4] == "-"
+            and str_time[7] == "-"
+            and str_time[10] == sep
+            and str_time[13] == ":"
+            and str_time[16] == ":"
+            and (length == 19 or str_time[19] == ".")
+        ):
+            try:
+                dt = datetime.fromisoformat(str_time)
+            except ValueError:
+                pass
+            else:
+                if dt.tzinfo is None:
+                    return dt
+        return datetime.strptime(str_time, format_)
+
+    def format_iso(dt: datetime) -> str:
+        # strftime drops the offset and does not zero pad years before 1000
+        if isinstance(dt, datetime) and dt.year >= 1000:
+            return dt.isoformat(sep, timespec)[:length]
+        return dt.strftime(format_)
+
+    return parse_iso, format_iso
+
 
 def from_str_to_dt(str_time: str, format_: str) -> datetime:
     try:
-        dt = datetime.strptime(str_time, format_)
-        return dt
+        return _compile(format_)[0](str_time)
     except Exception as exc:
         raise ParseDateTimeException(exc)
 
 
 def from_dt_to_str(dt: datetime, format_: str) -> str:
     try:
-        return dt.strftime(format_)
+        return _compile(format_)[1](dt)
     except Exception as exc:
         raise ParseDateTimeException(exc)
 
@@ -0,0 +1,559 @@
+import asyncio
+import atexit
+import functools
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from enum import Enum
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import orjson
+
+from utils.logger_utils import get_shared_logger
+
+logger = get_shared_logger()
+
+# OTLP enum values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+INSTRUMENTATION_SCOPE = "python-clean-architecture-project"
+
+Attributes = Dict[str, object]
+
+
+class Span:
+    """One timed operation of a trace, exported in the OTLP/JSON shape."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "events",
+        "status",
+        "status_message",
+    )
+
+    recording = True
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Attributes] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = dict(attributes) if attributes else {}
+        self.events: List[Tuple[int, str, Attributes]] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: object):
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Attributes] = None):
+        self.events.append((time.time_ns(), name, attributes or {}))
+
+    def set_status(self, status: int, message: str = ""):
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException):
+        self.add_event(
+            name="exception",
+            attributes={
+                "exception.type": type(exc).__qualname__,
+                "exception.message": str(exc),
+            },
+        )
+        self.set_status(status=STATUS_ERROR, message=repr(exc))
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        _tracer.export(span=self)
+
+
+class _NonRecordingSpan(Span):
+    """Stands for an unsampled trace, so its descendants are not sampled either."""
+
+    __slots__ = ()
+
+    recording = False
+
+    def __init__(self):
+        pass
+
+    def set_attribute(self, key: str, value: object):
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Attributes] = None):
+        pass
+
+    def set_status(self, status: int, message: str = ""):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Parse a W3C ``traceparent`` header into (trace id, parent id, sampled)."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_id, flags = parts[1].lower(), parts[2].lower(), parts[3]
+    try:
+        if int(trace_id, 16) == 0 or int(parent_id, 16) == 0:
+            return None
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    return trace_id, parent_id, sampled
+
+
+def _encode_value(value: object) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _encode_attributes(attributes: Attributes) -> List[dict]:
+    return [
+        {"key": key, "value": _encode_value(value)} for key, value in attributes.items()
+    ]
+
+
+def encode_span(span: Span) -> dict:
+    """OTLP/JSON encoding of a span (ids are hex, as the JSON mapping requires)."""
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _encode_attributes(span.attributes),
+        "status": {"code": span.status},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    if span.status_message:
+        encoded["status"]["message"] = span.status_message
+    if span.events:
+        encoded["events"] = [
+            {
+                "timeUnixNano": str(time_ns),
+                "name": name,
+                "attributes": _encode_attributes(attributes),
+            }
+            for time_ns, name, attributes in span.events
+        ]
+    return encoded
+
+
+def encode_spans(spans: Sequence[Span], resource: Attributes) -> dict:
+    """An OTLP ``ExportTraceServiceRequest`` holding ``spans``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _encode_attributes(resource)},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": INSTRUMENTATION_SCOPE},
+                        "spans": [encode_span(span=span) for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter:
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class InMemorySpanCollector(SpanExporter):
+    """Keep the latest ``max_spans`` finished spans, for the traces endpoint."""
+
+    def __init__(self, max_spans: int = 4096):
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self._spans.append(span)
+
+    def traces(self, limit: int = 20) -> List[dict]:
+        """Most recent traces first, each with its spans in start order."""
+        by_trace: Dict[str, List[Span]] = {}
+        for span in reversed(self._spans):
+            spans = by_trace.get(span.trace_id)
+            if spans is None:
+                if len(by_trace) >= limit:
+                    continue
+                spans = by_trace[span.trace_id] = []
+            spans.append(span)
+        traces = []
+        for trace_id, spans in by_trace.items():
+            spans.sort(key=lambda span: span.start_ns)
+            root = next((span for span in spans if span.parent_id is None), spans[0])
+            traces.append(
+                {
+                    "trace_id": trace_id,
+                    "root": root.name,
+                    "duration_ms": (
+                        max(span.end_ns for span in spans) - spans[0].start_ns
+                    )
+                    / 1e6,
+                    "spans": [encode_span(span=span) for span in spans],
+                }
+            )
+        return traces
+
+
+class OTLPFileSpanExporter(SpanExporter):
+    """Append finished spans to a file as OTLP/JSON lines.
+
+    The format is the one of the OpenTelemetry Collector file exporter, one
+    ``ExportTraceServiceRequest`` per line, so the file can be replayed into any
+    OTLP backend. Spans are buffered and written by a background thread; when
+    the buffer is full new spans are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resource: Attributes,
+        queue_size: int = 8192,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+    ):
+        self._path = path
+        self._resource = resource
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer: Deque[Span] = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._dropped = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="otlp-file-exporter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, span: Span):
+        with self._condition:
+            if self._closed or len(self._buffer) >= self._queue_size:
+                self._dropped += 1
+                return
+            self._buffer.append(span)
+            if len(self._buffer) >= self._batch_size:
+                self._condition.notify()
+
+    def _take_batch(self) -> Tuple[List[Span], int]:
+        with self._condition:
+            if len(self._buffer) < self._batch_size and not self._closed:
+                self._condition.wait(timeout=self._flush_interval)
+            count = min(len(self._buffer), self._batch_size)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            dropped, self._dropped = self._dropped, 0
+        return batch, dropped
+
+    def _write(self, spans: List[Span]):
+        line = orjson.dumps(
+            encode_spans(spans=spans, resource=self._resource),
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+        # one write per batch on an O_APPEND file, so the lines of several
+        # worker processes sharing the file do not interleave
+        fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def _run(self):
+        while True:
+            batch, dropped = self._take_batch()
+            if dropped:
+                logger.warning(f"Span exporter overflow, dropped {dropped} spans")
+            if batch:
+                try:
+                    self._write(spans=batch)
+                except Exception as exc:
+                    logger.warning(f"Failed to export {len(batch)} spans: {exc!r}")
+            with self._condition:
+                if self._closed and not self._buffer:
+                    return
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush what is buffered and stop the writer thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout)
+
+
+class SpanExporterType(str, Enum):
+    MEMORY = "memory"  # latest spans kept in process, served on /traces
+    OTLP_FILE = "otlp_file"  # OTLP/JSON lines appended to a file
+
+
+def build_span_exporter(
+    exporter_type: SpanExporterType,
+    resource: Attributes,
+    otlp_file_path: str = "./traces.jsonl",
+    max_spans: int = 4096,
+) -> SpanExporter:
+    exporter_type = SpanExporterType(exporter_type)
+    if exporter_type == SpanExporterType.OTLP_FILE:
+        return OTLPFileSpanExporter(
+            path=otlp_file_path, resource=resource, queue_size=max_spans
+        )
+    return InMemorySpanCollector(max_spans=max_spans)
+
+
+class Tracer:
+    """Head-sampling tracer with a W3C trace context.
+
+    Sampling is decided once per trace, on the root span: an incoming
+    ``traceparent`` keeps its sampled flag, otherwise ``sample_rate`` of the
+    traces are kept (by trace id, like OpenTelemetry's TraceIdRatioBased
+    sampler). Spans of an unsampled trace cost a context lookup and nothing else.
+    When tracing is disabled the instrumented calls only check ``enabled``.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._sample_bound = 1 << 64
+        self._exporter: Optional[SpanExporter] = None
+
+    def configure(self, exporter: Optional[SpanExporter], sample_rate: float = 1.0):
+        if self._exporter is not None and self._exporter is not exporter:
+            self._exporter.shutdown()
+        self._exporter = exporter
+        self._sample_bound = int(max(0.0, min(1.0, sample_rate)) * (1 << 64))
+        self.enabled = exporter is not None
+
+    @property
+    def exporter(self) -> Optional[SpanExporter]:
+        return self._exporter
+
+    def shutdown(self):
+        self.enabled = False
+        if self._exporter is not None:
+            self._exporter.shutdown()
+
+    def export(self, span: Span):
+        if self._exporter is not None:
+            self._exporter.export(span=span)
+
+    def start_root_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_SERVER,
+        attributes: Optional[Attributes] = None,
+        traceparent: Optional[str] = None,
+    ) -> Span:
+        """Start the first local span of a trace, continuing a remote parent."""
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+        else:
+            trace_id = f"{random.getrandbits(128):032x}"
+            parent_id = None
+            sampled = int(trace_id[16:], 16) < self._sample_bound
+        if not sampled:
+            return NON_RECORDING_SPAN
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            parent_id=parent_id,
+            kind=kind,
+            attributes=attributes,
+        )
+
+    def start_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Attributes] = None,
+    ) -> Optional[Span]:
+        """Start a child of the current span, None outside of any trace."""
+        parent = _current_span.get()
+        if parent is None or not parent.recording:
+            return parent
+        return Span(
+            name=name,
+            trace_id=parent.trace_id,
+            parent_id=parent.span_id,
+            kind=kind,
+            attributes=attributes,
+        )
+
+
+def activate_span(span: Span) -> Token:
+    return _current_span.set(span)
+
+
+def deactivate_span(token: Token):
+    _current_span.reset(token)
+
+
+@contextmanager
+def start_as_current_span(
+    name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Attributes] = None
+) -> Iterator[Optional[Span]]:
+    """Run the block in a child span of the current one, if tracing is on."""
+    span = _tracer.start_span(name=name, kind=kind, attributes=attributes)
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc=exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def traced(
+    name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Attributes] = None
+) -> Callable:
+    """Decorate a coroutine function to run it in a child span of the current one.
+
+    Spans are only created inside a trace, so background jobs (e.g. the readiness
+    pings) do not start traces of their own.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return await fn(*args, **kwargs)
+            span = _tracer.start_span(name=name, kind=kind, attributes=attributes)
+            if span is None or not span.recording:
+                return await fn(*args, **kwargs)
+            token = _current_span.set(span)
+            try:
+                return await fn(*args, **kwargs)
+            except BaseException as exc:
+                span.record_exception(exc=exc)
+                raise
+            finally:
+                _current_span.reset(token)
+                span.end()
+
+        return wrapper
+
+    return decorator
+
+
+def _tracing_enabled_in_config() -> bool:
+    # Import app_config here to avoid circular imports
+    from config import app_config
+
+    return bool(app_config.tracing.enable)
+
+
+def trace_methods(
+    component: str,
+    methods: Optional[Sequence[str]] = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: Optional[Attributes] = None,
+) -> Callable[[type], type]:
+    """Class decorator tracing the public coroutine methods of the class.
+
+    Spans are named ``<component>.<method>``. Only ``methods`` are traced when
+    given. When tracing is disabled in the config the class is left untouched,
+    so its calls do not even pay for the wrapper.
+    """
+
+    def decorator(cls: type) -> type:
+        if not _tracing_enabled_in_config():
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not asyncio.iscoroutinefunction(value):
+                continue
+            if methods is not None and attr not in methods:
+                continue
+            setattr(
+                cls,
+                attr,
+                traced(name=f"{component}.{attr}", kind=kind, attributes=attributes)(
+                    value
+                ),
+            )
+        return cls
+
+    return decorator
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return _tracer